@@ -1,143 +1,483 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
 import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+from ETL_pipeline.page_cache import PageNotCached
+from ETL_pipeline.review_buffer import ReviewBuffer
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+# The pure-Python fallback still benefits from lxml's tree builder when present
+BS4_TREE_BUILDER = 'lxml' if lxml_html is not None else 'html.parser'
+
+BASE_URL = 'https://www.airlinequality.com/airline-reviews/'
+DEFAULT_AIRLINE = 'ethiopian-airlines'
+
+# HTTP client settings; change them with configure_http()
+REQUEST_TIMEOUT = (5, 30)  # (connect, read) seconds
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 1.0
+POOL_SIZE = 10
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+# url -> {'etag': ..., 'last_modified': ..., 'text': ...} for conditional GETs
+_validator_cache = {}
+_validator_lock = threading.Lock()
+
+# Optional on-disk raw page cache; set with configure_cache()
+_page_cache = None
+_replay = False
+
+
+def configure_cache(page_cache=None, replay=False):
+    """Keep raw pages in ``page_cache`` and, with ``replay``, read them from it instead of the network."""
+    global _page_cache, _replay
+    if replay and page_cache is None:
+        raise ValueError("Replay mode needs a page cache")
+    _page_cache = page_cache
+    _replay = replay
+
+
+def is_replay() -> bool:
+    """Return True when pages are served from the page cache only."""
+    return _replay
+
+
+def configure_http(timeout=None, retries=None, backoff_factor=None, pool_size=None):
+    """Override HTTP client settings. The shared session is rebuilt on next use."""
+    global REQUEST_TIMEOUT, MAX_RETRIES, BACKOFF_FACTOR, POOL_SIZE, _session
+    with _session_lock:
+        if timeout is not None:
+            REQUEST_TIMEOUT = timeout
+        if retries is not None:
+            MAX_RETRIES = retries
+        if backoff_factor is not None:
+            BACKOFF_FACTOR = backoff_factor
+        if pool_size is not None:
+            POOL_SIZE = pool_size
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_session() -> requests.Session:
+    """Return the shared, pooled session with keep-alive and retry/backoff."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=MAX_RETRIES,
+                backoff_factor=BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset(['HEAD', 'GET']),
+                respect_retry_after_header=True
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def http_get(url) -> str:
+    """GET a page through the shared session and return its text.
+
+    Pages fetched before are revalidated with If-None-Match/If-Modified-Since,
+    so an unchanged page costs a 304 and is served from the validator cache.
+    When a page cache is configured, every page is also stored there and its
+    validators carry over between runs; in replay mode the network is not used.
+    """
+    if _replay:
+        cached_page = _page_cache.get(url)
+        if cached_page is None:
+            raise PageNotCached(url)
+        return cached_page['text']
+
+    with _validator_lock:
+        cached = _validator_cache.get(url)
+    if cached is None and _page_cache is not None:
+        cached = _page_cache.get(url)
+
+    headers = {}
+    if cached:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    response = get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304 and cached:
+        if _page_cache is not None:
+            _page_cache.put(url, cached['text'], cached['etag'], cached['last_modified'])
+        return cached['text']
+    response.raise_for_status()
+
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if _page_cache is not None:
+        _page_cache.put(url, response.text, etag, last_modified)
+    if etag or last_modified:
+        with _validator_lock:
+            _validator_cache[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'text': response.text
+            }
+    return response.text
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to rate-limit requests to the source site."""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
 
 def check_connection(url):
     """Check connection to the specified URL."""
     try:
-        response = requests.head(url)
+        response = get_session().head(url, timeout=REQUEST_TIMEOUT)
         return response.status_code == 200
-    except requests.ConnectionError:
+    except requests.RequestException:
         return False
 
-def fetch_reviews(page_number, offset):
-    """Fetch reviews from airline quality website."""
-    url = f"https://www.airlinequality.com/airline-reviews/ethiopian-airlines/page/{page_number}/?sortby=post_date%3ADesc&pagesize={offset}"
+# Header label -> DW column for the star-rated review-stats rows, in match order
+_STAR_FIELDS = {
+    'seat comfort': 'SeatComfort',
+    'cabin staff service': 'CabinStaffService',
+    'food & beverages': 'FoodBeverages',
+    'inflight entertainment': 'InflightEntertainment',
+    'ground service': 'GroundService',
+    'value for money': 'ValueForMoney'
+}
+
+def _classes(value):
+    """Normalise a class attribute (string or list) to a list of class tokens."""
+    if not value:
+        return []
+    return value.split() if isinstance(value, str) else list(value)
+
+def _build_review(found, stats_rows):
+    """Build a review's values, in REVIEW_COLUMNS order, from those collected by a parser backend.
+
+    ``found`` holds the first match of each single-valued element and
+    ``stats_rows`` holds ``(header_text, value_text, star_count)`` tuples from
+    the review-stats table, with ``None`` for a missing value/stars cell.
+    """
+    rating = found.get('rating', "0")
+    location_text = found.get('location')
+    if location_text is None:
+        location_text = "Unknown"
+    else:
+        location_text = location_text.strip().replace('(', '').replace(')', '').strip()
+
+    # Initialize additional review details
+    type_traveller = "Unknown"
+    date_flown = None
+    seat_type = "Unknown"
+    route = "Unknown"
+    recommended = "No"
+
+    # Initialize rating fields
+    star_ratings = dict.fromkeys(_STAR_FIELDS.values(), 0)
+
+    for header_text, value, star_count in stats_rows:
+        # Handle text-based review attributes
+        if "type of traveller" in header_text:
+            type_traveller = value if value is not None else "Unknown"
+        elif "seat type" in header_text:
+            seat_type = value if value is not None else "Unknown"
+        elif "route" in header_text:
+            route = value if value is not None else "Unknown"
+        elif "recommended" in header_text:
+            recommended = value if value is not None else "No"
+        elif "date flown" in header_text:
+            date_flown = value
+
+        # Handle star ratings
+        if star_count is not None:
+            for label, field in _STAR_FIELDS.items():
+                if label in header_text:
+                    star_ratings[field] = star_count
+                    break
+
+    return (
+        found.get('author', "Anonymous"),
+        location_text,
+        found.get('date'),
+        found.get('title', "No Title"),
+        found.get('body', "No Content"),
+        type_traveller,
+        seat_type,
+        route,
+        date_flown,
+        float(rating) if rating.replace('.', '', 1).isdigit() else 0.0,
+        *star_ratings.values(),
+        'YES' if recommended.lower() == 'yes' else 'NO'
+    )
+
+def _parse_reviews_lxml(html):
+    """Parse reviews with lxml, walking each article's subtree once."""
+    root = lxml_html.fromstring(html)
+    data = ReviewBuffer()
+    for review in root.iterfind(".//article[@itemprop='review']"):
+        found = {}
+        stats = None
+        stats_rows = []
+        for el in review.iter():
+            tag = el.tag
+            if not isinstance(tag, str):
+                continue  # comments and processing instructions
+            itemprop = el.get('itemprop')
+            if tag == 'span':
+                if itemprop == 'ratingValue' and 'rating' not in found:
+                    found['rating'] = el.text_content().strip()
+                elif itemprop == 'name' and 'author' not in found:
+                    found['author'] = el.text_content().strip()
+                elif itemprop == 'author' and 'location' not in found:
+                    found['location'] = el.tail if el.tail else None
+            elif tag == 'h2' and 'title' not in found and 'text_header' in _classes(el.get('class')):
+                found['title'] = el.text_content().strip()
+            elif tag == 'time' and itemprop == 'datePublished' and 'date' not in found:
+                found['date'] = el.get('datetime')
+            elif tag == 'div':
+                classes = _classes(el.get('class'))
+                if itemprop == 'reviewBody' and 'text_content' in classes and 'body' not in found:
+                    found['body'] = el.text_content().strip()
+                elif stats is None and 'review-stats' in classes:
+                    stats = el
+            elif tag == 'tr' and stats is not None and _is_descendant(el, stats):
+                row = _stats_row_lxml(el)
+                if row is not None:
+                    stats_rows.append(row)
+        data.append(_build_review(found, stats_rows))
+    return data
+
+def _is_descendant(el, ancestor):
+    return any(parent is ancestor for parent in el.iterancestors())
+
+def _stats_row_lxml(row):
+    header = value = stars = None
+    for cell in row.iterdescendants('td'):
+        classes = _classes(cell.get('class'))
+        if header is None and 'review-rating-header' in classes:
+            header = cell
+        elif value is None and 'review-value' in classes:
+            value = cell
+        elif stars is None and 'review-rating-stars' in classes:
+            stars = cell
+    if header is None:
+        return None
+    star_count = None
+    if stars is not None:
+        star_count = sum(1 for span in stars.iterdescendants('span') if span.get('class') == 'star fill')
+    return (
+        header.text_content().strip().lower(),
+        value.text_content().strip() if value is not None else None,
+        star_count
+    )
+
+def _parse_reviews_bs4(html):
+    """Parse reviews with BeautifulSoup, building only the review articles."""
+    strainer = SoupStrainer('article', attrs={'itemprop': 'review'})
+    soup = BeautifulSoup(html, BS4_TREE_BUILDER, parse_only=strainer)
+    data = ReviewBuffer()
+    for review in soup.find_all('article', itemprop='review'):
+        found = {}
+        stats = None
+        stats_rows = []
+        for el in review.descendants:
+            if not isinstance(el, Tag):
+                continue
+            tag = el.name
+            itemprop = el.get('itemprop')
+            if tag == 'span':
+                if itemprop == 'ratingValue' and 'rating' not in found:
+                    found['rating'] = el.text.strip()
+                elif itemprop == 'name' and 'author' not in found:
+                    found['author'] = el.text.strip()
+                elif itemprop == 'author' and 'location' not in found:
+                    sibling = el.next_sibling
+                    found['location'] = str(sibling) if isinstance(sibling, NavigableString) and sibling else None
+            elif tag == 'h2' and 'title' not in found and 'text_header' in _classes(el.get('class')):
+                found['title'] = el.text.strip()
+            elif tag == 'time' and itemprop == 'datePublished' and 'date' not in found:
+                found['date'] = el.get('datetime')
+            elif tag == 'div':
+                classes = _classes(el.get('class'))
+                if itemprop == 'reviewBody' and 'text_content' in classes and 'body' not in found:
+                    found['body'] = el.text.strip()
+                elif stats is None and 'review-stats' in classes:
+                    stats = el
+            elif tag == 'tr' and stats is not None and stats in el.parents:
+                row = _stats_row_bs4(el)
+                if row is not None:
+                    stats_rows.append(row)
+        data.append(_build_review(found, stats_rows))
+    return data
+
+def _stats_row_bs4(row):
+    header = value = stars = None
+    for cell in row.find_all('td'):
+        classes = _classes(cell.get('class'))
+        if header is None and 'review-rating-header' in classes:
+            header = cell
+        elif value is None and 'review-value' in classes:
+            value = cell
+        elif stars is None and 'review-rating-stars' in classes:
+            stars = cell
+    if header is None:
+        return None
+    star_count = None
+    if stars is not None:
+        star_count = len(stars.find_all('span', class_='star fill'))
+    return (
+        header.text.strip().lower(),
+        value.text.strip() if value is not None else None,
+        star_count
+    )
+
+PARSER_BACKENDS = {
+    'bs4': _parse_reviews_bs4
+}
+if lxml_html is not None:
+    PARSER_BACKENDS['lxml'] = _parse_reviews_lxml
+
+def parse_reviews(html, backend=None):
+    """Parse review articles from a page into a ReviewBuffer.
+
+    ``backend`` is 'lxml' or 'bs4'; by default lxml is used when installed,
+    with the pure-Python BeautifulSoup parser as the fallback.
+    """
+    if backend is None:
+        backend = 'lxml' if 'lxml' in PARSER_BACKENDS else 'bs4'
+    try:
+        parser = PARSER_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown or unavailable parser backend: {backend}")
+    return parser(html)
+
+def airline_url(airline=DEFAULT_AIRLINE):
+    """Landing page of an airline's reviews."""
+    return f"{BASE_URL}{airline}/"
+
+def fetch_reviews(page_number, offset, backend=None, airline=DEFAULT_AIRLINE):
+    """Fetch one page of reviews from airline quality website as a ReviewBuffer.
+
+    Returns None if the page could not be fetched, so a failed page is not
+    mistaken for one without reviews.
+    """
+    url = f"{airline_url(airline)}page/{page_number}/?sortby=post_date%3ADesc&pagesize={offset}"
     
-    print(f"Fetching reviews from page {page_number} with offset: {offset}.")
+    print(f"Fetching {airline} reviews from page {page_number} with offset: {offset}.")
     
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        reviews = soup.find_all('article', itemprop='review')
+        data = parse_reviews(http_get(url), backend)
 
-        if not reviews:
+        if not data:
             print("No reviews found on this page.")
-            return []
-
-        data = []
-        for review in reviews:
-            # Extract review rating
-            rating = review.find('span', itemprop='ratingValue')
-            rating = rating.text.strip() if rating else "0"
-            
-            # Extract author information
-            author = review.find('span', itemprop='name')
-            author = author.text.strip() if author else "Anonymous"
-            
-            # Extract review heading
-            heading_service = review.find('h2', class_='text_header')
-            heading_service = heading_service.text.strip() if heading_service else "No Title"
-            
-            # Extract author location
-            author_span = review.find('span', itemprop='author')
-            if author_span and author_span.next_sibling:
-                location_text = author_span.next_sibling.strip()
-                location_text = location_text.replace('(', '').replace(')', '').strip()
-            else:
-                location_text = "Unknown"
-            
-            # Extract review date
-            date = review.find('time', itemprop='datePublished')
-            date = date['datetime'] if date else None
-            
-            # Extract review text
-            review_body = review.find('div', class_='text_content', itemprop='reviewBody')
-            review_body = review_body.text.strip() if review_body else "No Content"
-            
-            # Initialize additional review details
-            type_traveller = "Unknown"
-            date_flown = None
-            seat_type = "Unknown"
-            route = "Unknown"
-            recommended = "No"
-            
-            # Initialize rating fields
-            seat_comfort = 0
-            cabin_staff_service = 0
-            food_rating = 0
-            entertainment_rating = 0
-            ground_service_rating = 0
-            value_for_money = 0
-
-            # Extract review statistics
-            stats = review.find('div', class_='review-stats')
-            if stats:
-                rows = stats.find_all('tr')
-                for row in rows:
-                    header = row.find('td', class_='review-rating-header')
-                    value = row.find('td', class_='review-value')
-                    stars = row.find('td', class_='review-rating-stars')
-                    
-                    if header:
-                        header_text = header.text.strip().lower()
-                        
-                        # Handle text-based review attributes
-                        if "type of traveller" in header_text:
-                            type_traveller = value.text.strip() if value else "Unknown"
-                        elif "seat type" in header_text:
-                            seat_type = value.text.strip() if value else "Unknown"
-                        elif "route" in header_text:
-                            route = value.text.strip() if value else "Unknown"
-                        elif "recommended" in header_text:
-                            recommended = value.text.strip() if value else "No"
-                        elif "date flown" in header_text:
-                            date_flown = value.text.strip() if value else None
-                        
-                        # Handle star ratings
-                        if stars:
-                            star_count = len(stars.find_all('span', class_='star fill'))
-                            if "seat comfort" in header_text:
-                                seat_comfort = star_count
-                            elif "cabin staff service" in header_text:
-                                cabin_staff_service = star_count
-                            elif "food & beverages" in header_text:
-                                food_rating = star_count
-                            elif "inflight entertainment" in header_text:
-                                entertainment_rating = star_count
-                            elif "ground service" in header_text:
-                                ground_service_rating = star_count
-                            elif "value for money" in header_text:
-                                value_for_money = star_count
-
-            # Append the extracted data with DW field names
-            data.append({
-                'AuthorName': author,
-                'AuthorLocation': location_text,
-                'ReviewDate': date,
-                'ReviewTitle': heading_service,
-                'ReviewText': review_body,
-                'TypeOfTraveller': type_traveller,
-                'SeatType': seat_type,
-                'Route': route,
-                'DateFlown': date_flown,
-                'Rating': float(rating) if rating.replace('.', '', 1).isdigit() else 0.0,
-                'SeatComfort': seat_comfort,
-                'CabinStaffService': cabin_staff_service,
-                'FoodBeverages': food_rating,
-                'InflightEntertainment': entertainment_rating,
-                'GroundService': ground_service_rating,
-                'ValueForMoney': value_for_money,
-                'RecommendedService': 'YES' if recommended.lower() == 'yes' else 'NO'
-            })
+            return ReviewBuffer()
 
         return data
 
     except requests.exceptions.RequestException as e:
         print(f"Error fetching page {page_number}: {e}")
-        return []
+        return None
+    except PageNotCached:
+        print(f"Page {page_number} is not in the page cache.")
+        return None
     except Exception as e:
         print(f"Unexpected error processing page {page_number}: {e}")
-        return []
\ No newline at end of file
+        return None
+
+def iter_pages(pages, offset, max_workers=4, rate=1.0, burst=2, watermark=None, airline=DEFAULT_AIRLINE,
+               failed_pages=None):
+    """Yield each page's ReviewBuffer in page order, keeping up to max_workers pages in flight.
+
+    Further pages are only requested as the consumer takes results, so a
+    slow consumer holds fetching back. Request starts are throttled by a
+    token bucket of ``rate`` requests per second.
+
+    With a ``watermark`` only reviews newer than it are yielded, and
+    pagination stops at the first page that reaches it. Page 1 is fetched on
+    its own first, so a run with few new reviews touches a single page.
+
+    A page that cannot be fetched yields no reviews and its number is
+    appended to ``failed_pages``; callers must then not advance the
+    watermark, or the page's reviews would never be fetched again.
+    """
+    bucket = TokenBucket(rate, burst)
+
+    def _fetch(page_number):
+        bucket.acquire()
+        return fetch_reviews(page_number, offset, airline=airline)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = deque()
+        next_page = 1
+        window = 1 if watermark is not None else max_workers
+        while True:
+            while next_page <= pages and len(in_flight) < window:
+                in_flight.append((next_page, executor.submit(_fetch, next_page)))
+                next_page += 1
+            if not in_flight:
+                return
+            window = max_workers
+
+            page_number, future = in_flight.popleft()
+            reviews_data = future.result()
+            if reviews_data is None:
+                if failed_pages is not None:
+                    failed_pages.append(page_number)
+                yield ReviewBuffer()
+                continue
+            if watermark is None:
+                yield reviews_data
+                continue
+
+            new_reviews, reached = watermark.filter(reviews_data)
+            yield new_reviews
+            if reached:
+                print(f"Reached watermark {watermark.review_date} on page {page_number}.")
+                for _, pending in in_flight:
+                    pending.cancel()
+                return
+
+def fetch_pages(pages, offset, max_workers=4, rate=1.0, burst=2, watermark=None, airline=DEFAULT_AIRLINE,
+                failed_pages=None):
+    """Fetch pages 1..pages concurrently and return their reviews, in page order, in one ReviewBuffer.
+
+    See iter_pages for the concurrency, rate limit, watermark and ``failed_pages`` behaviour.
+    """
+    all_reviews = ReviewBuffer()
+    for reviews_data in iter_pages(pages, offset, max_workers, rate, burst, watermark, airline, failed_pages):
+        all_reviews.extend(reviews_data)
+    return all_reviews
@@ -1,42 +1,149 @@
-import pyodbc
 import pandas as pd
-from typing import Dict, Optional, Tuple
+from typing import List, Optional, Tuple
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from datetime import datetime
+from ETL_pipeline.Transform import review_hashes, split_verification
+from ETL_pipeline.review_text import compress_texts, decompress_texts, text_hashes
+from ETL_pipeline.date_dimension import DateKeyResolver, date_key
+from ETL_pipeline.dw_backends import DWBackend, create_backend
+from ETL_pipeline.schema import migrate
+from ETL_pipeline.dimension_cache import DIMENSION_KEYS, get_dimension_cache, normalize_key
+
+FLIGHT_KEY_COLUMNS = DIMENSION_KEYS['FlightDetails'][1]
+
+STAR_RATING_COLUMNS = [
+    'SeatComfort', 'CabinStaffService', 'FoodBeverages',
+    'InflightEntertainment', 'GroundService', 'ValueForMoney'
+]
+
+FACT_INSERT_COLUMNS = [
+    'AuthorID', 'FlightDetailID', 'ReviewDateKey', 'DateFlownKey',
+    'Rating', 'ReviewTitle', 'TextID', 'IsVerified', *STAR_RATING_COLUMNS,
+    'RecommendedService', 'LoadDate', 'SourceSystem', 'BatchID', 'ReviewHash'
+]
+
+TEXT_INSERT_COLUMNS = ['TextHash', 'TextLength', 'CompressedText']
+
+SENTIMENT_INSERT_COLUMNS = [
+    'ReviewID', 'PositiveScore', 'NegativeScore', 'NeutralScore', 'CompoundScore',
+    'KeyPhrases', 'Entities', 'AnalysisDate', 'ModelVersion'
+]
+
+class ConnectionPool:
+    """Fixed-size pool of warehouse connections for concurrent loads.
+
+    Connections are opened on first use and kept for reuse. A connection
+    whose work failed is rolled back before it goes back to the pool.
+    """
+
+    def __init__(self, backend: DWBackend, size: int = 4):
+        self.backend = backend
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.logger = logging.getLogger('ConnectionPool')
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, waiting while all ``size`` are in use."""
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self.backend.connect()
+            try:
+                yield connection
+            except Exception:
+                try:
+                    connection.rollback()
+                except self.backend.errors:
+                    connection.close()
+                    raise
+                self._idle.put(connection)
+                raise
+            self._idle.put(connection)
+
+    def close(self):
+        """Close the idle connections."""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                connection.close()
+            except self.backend.errors as e:
+                self.logger.error(f"Error closing pooled connection: {e}")
+
+def partition_facts(facts: pd.DataFrame, partitions: int, by: str = 'hash') -> List[pd.DataFrame]:
+    """Split resolved facts into up to ``partitions`` non-empty frames.
+
+    ``by='hash'`` spreads rows by a hash of AuthorID and ReviewDateKey;
+    ``by='date'`` cuts contiguous, equally sized ReviewDateKey ranges.
+    """
+    if by == 'hash':
+        buckets = pd.util.hash_pandas_object(facts[['AuthorID', 'ReviewDateKey']], index=False) % partitions
+    elif by == 'date':
+        buckets = pd.qcut(facts['ReviewDateKey'].rank(method='first'), partitions, labels=False)
+    else:
+        raise ValueError(f"Unknown partitioning: {by}")
+    return [part for _, part in facts.groupby(buckets.to_numpy(), sort=True) if not part.empty]
 
 class DWConnection:
-    """Data Warehouse connection handler with transaction support."""
+    """Data Warehouse connection handler with transaction support.
+
+    Engine-specific SQL and bulk inserts go through ``backend``, by default
+    the one selected with ``dw_backends.configure_backend`` (SQL Server
+    unless configured otherwise).
+    """
     
-    def __init__(self, server: str, database: str):
+    def __init__(self, server: str, database: str, backend: Optional[DWBackend] = None):
         self.server = server
         self.database = database
-        self.connection_string = (
-            f'DRIVER={{SQL Server}};SERVER={self.server};'
-            f'DATABASE={self.database};Trusted_Connection=yes;'
-        )
+        self.backend = backend or create_backend(server, database)
         self.connection = None
+        self.pool: Optional[ConnectionPool] = None
+        self._stage_tables: List[str] = []
+        self.rejected_facts = pd.DataFrame()
+        self._date_resolver = None
+        self.dimension_cache = get_dimension_cache(server, database)
         self.logger = logging.getLogger('DWConnection')
 
     def connect(self):
         """Establish connection to the data warehouse."""
         try:
-            self.connection = pyodbc.connect(self.connection_string)
-            self.connection.autocommit = False
-            self.logger.info("Successfully connected to the data warehouse")
+            self.connection = self.backend.connect()
+            self.logger.info(f"Successfully connected to the data warehouse ({self.backend.name})")
             return True
-        except pyodbc.Error as e:
+        except self.backend.errors as e:
             self.logger.error(f"Connection error: {e}")
             return False
 
+    def migrate_schema(self, target: Optional[int] = None) -> Tuple[int, bool]:
+        """Apply pending schema migrations, up to ``target``; return (schema version, success)."""
+        try:
+            version = migrate(self.connection, self.backend, target)
+            self.logger.info(f"Warehouse schema is at version {version}")
+            return (version, True)
+        except self.backend.errors as e:
+            self.logger.error(f"Error migrating the warehouse schema: {e}")
+            return (0, False)
+
     def close(self):
         """Close the data warehouse connection."""
+        if self.pool is not None:
+            self.pool.close()
         if self.connection:
             try:
-                if self.connection.autocommit is False:
-                    self.connection.rollback()
+                # Autocommit is off, so discard anything not committed
+                self.connection.rollback()
                 self.connection.close()
                 self.logger.info("Closed data warehouse connection")
-            except pyodbc.Error as e:
+            except self.backend.errors as e:
                 self.logger.error(f"Error closing connection: {e}")
 
     @contextmanager
@@ -45,194 +152,546 @@ class DWConnection:
         try:
             yield
             self.connection.commit()
+            self.dimension_cache.commit()
             self.logger.info("Transaction committed successfully")
         except Exception as e:
             self.connection.rollback()
+            # Cached keys and dim.Date coverage may include rows that were just rolled back
+            self.dimension_cache.rollback()
+            self._date_resolver = None
             self.logger.error(f"Transaction rolled back due to error: {e}")
             raise
+        finally:
+            self._drop_stage_tables()
 
-    def _get_dimension_map(self, table_name: str, key_col: str, value_cols):
-        """Get mapping of dimension values to keys with proper NULL handling."""
+    def _drop_stage_tables(self):
+        """Drop the fact staging tables of partitioned loads once their transaction has ended."""
+        if not self._stage_tables:
+            return
         cursor = self.connection.cursor()
-        
-        if isinstance(value_cols, str):
-            query = f"SELECT {value_cols}, {key_col} FROM dim.{table_name}"
-            cursor.execute(query)
-            return {
-                (str(row[0]) if row[0] is not None else 'NULL'): row[1] 
-                for row in cursor.fetchall()
-            }
-        else:
-            cols_str = ', '.join(value_cols)
-            query = f"SELECT {cols_str}, {key_col} FROM dim.{table_name}"
-            cursor.execute(query)
-            
-            mapping = {}
-            for row in cursor.fetchall():
-                key_parts = []
-                for i in range(len(value_cols)):
-                    val = row[i]
-                    key_parts.append(str(val) if val is not None else 'NULL')
-                mapping[tuple(key_parts)] = row[-1]
-            
-            return mapping
+        try:
+            for stage_table in self._stage_tables:
+                cursor.execute(self.backend.drop_table_sql(stage_table))
+            self.connection.commit()
+        except self.backend.errors as e:
+            self.logger.warning(f"Could not drop staging tables {self._stage_tables}: {e}")
+        self._stage_tables = []
 
-    def _get_date_map(self):
-        """Get date mapping with robust string-to-date conversion."""
-        cursor = self.connection.cursor()
-        cursor.execute("SELECT FullDate, DateKey FROM dim.Date")
-        
-        date_map = {}
-        for row in cursor.fetchall():
-            if isinstance(row[0], str):
-                # Handle string dates (from CSV)
-                date_obj = pd.to_datetime(row[0]).date()
-            else:
-                # Handle date/datetime objects (from database)
-                date_obj = row[0].date()
-            date_map[date_obj] = row[1]
-        
-        return date_map
+    def _get_dimension_map(self, table_name: str) -> dict:
+        """Get mapping of dimension business keys to surrogate keys from the shared key cache."""
+        with self.dimension_cache.lock:
+            cache = self.dimension_cache[table_name]
+            cache.refresh(self.connection.cursor())
+            return cache.mapping()
 
-    def load_dimension(self, table_name: str, data: pd.DataFrame, key_column: str) -> Tuple[int, bool]:
-        """Load data into a dimension table."""
+    @property
+    def date_keys(self) -> DateKeyResolver:
+        """DateKey resolver whose dim.Date coverage is cached for this connection."""
+        if self._date_resolver is None:
+            self._date_resolver = DateKeyResolver(self.connection, self.backend)
+        return self._date_resolver
+
+    def populate_date_dimension(self, start, end) -> int:
+        """Fill dim.Date for the inclusive range, adding only the missing days."""
+        try:
+            return self.date_keys.ensure(pd.Series(pd.date_range(start, end, freq='D')))
+        except self.backend.errors as e:
+            self.logger.error(f"Error populating date dimension: {e}")
+            return 0
+
+    def load_dimension(self, table_name: str, data: pd.DataFrame, key_columns) -> Tuple[int, int, bool]:
+        """Load data into a dimension table with one set-based pass.
+
+        Rows are bulk-staged into a temp table with the backend's bulk path, then
+        changed attributes are updated and new business keys inserted by two
+        set-based statements. New surrogate keys are fed into the shared
+        dimension key cache. Returns (inserted, updated, success).
+        """
+        if isinstance(key_columns, str):
+            key_columns = [key_columns]
         cursor = self.connection.cursor()
-        insert_count = 0
         
         try:
-            cursor.execute(f"SELECT {key_column} FROM dim.{table_name}")
-            existing_keys = {row[0] for row in cursor.fetchall()}
-            
+            data = data.drop_duplicates(subset=key_columns).copy()
             data['CreatedDate'] = pd.to_datetime('now')
+            columns = list(data.columns)
+            cols_str = ', '.join(columns)
+            # Attributes that can change for an existing business key
+            update_columns = [
+                col for col in columns
+                if col not in key_columns and col not in ('CreatedDate', 'ModifiedDate', 'IsActive', 'IsCurrent')
+            ]
+
+            key_cache = self.dimension_cache[table_name] if table_name in DIMENSION_KEYS else None
+            if key_cache is not None and key_cache.loaded and not update_columns:
+                # Nothing can change for known keys, so only stage unseen ones
+                known = [
+                    normalize_key(key) in key_cache.keys
+                    for key in data[key_cache.key_columns].astype(object).where(
+                        data[key_cache.key_columns].notna(), None
+                    ).itertuples(index=False, name=None)
+                ]
+                data = data[[not is_known for is_known in known]]
+
+            stage_table = self.backend.create_stage_table(cursor, f"dim.{table_name}", cols_str)
+            self.backend.bulk_insert(self.connection, stage_table, columns, data)
+
+            update_count = 0
+            if update_columns:
+                cursor.execute(
+                    self.backend.update_from_stage_sql(table_name, stage_table, key_columns, update_columns)
+                )
+                update_count = max(cursor.rowcount, 0)
+
+            output_columns = None
+            if key_cache is not None:
+                output_columns = key_cache.key_columns + [key_cache.id_column, 'CreatedDate']
+            cursor.execute(
+                self.backend.insert_from_stage_sql(table_name, stage_table, columns, key_columns, output_columns)
+            )
+            if key_cache is not None:
+                inserted_rows = cursor.fetchall()
+                insert_count = len(inserted_rows)
+                if key_cache.loaded:
+                    with self.dimension_cache.lock:
+                        key_cache.add(inserted_rows)
+            else:
+                insert_count = max(cursor.rowcount, 0)
+            cursor.execute(f"DROP TABLE {stage_table}")
             
-            for _, row in data.iterrows():
-                if row[key_column] not in existing_keys:
-                    columns = ', '.join(row.index)
-                    placeholders = ', '.join(['?'] * len(row))
-                    query = f"INSERT INTO dim.{table_name} ({columns}) VALUES ({placeholders})"
-                    cursor.execute(query, tuple(row))
-                    insert_count += 1
-            
-            self.logger.info(f"Inserted {insert_count} new records into dim.{table_name}")
-            return (insert_count, True)
+            self.logger.info(
+                f"Inserted {insert_count} new and updated {update_count} records in dim.{table_name}"
+            )
+            return (insert_count, update_count, True)
             
-        except pyodbc.Error as e:
+        except self.backend.errors as e:
             self.logger.error(f"Error loading dimension {table_name}: {e}")
+            return (0, 0, False)
+
+    def load_route_dimensions(self, route_dim: pd.DataFrame) -> Tuple[int, bool]:
+        """Load parsed routes into dim.Airport, dim.Route and dim.RouteSegment, then link dim.FlightDetails.
+
+        ``route_dim`` has one row per stop of each route, as built by
+        routes.route_stops. Flight details without a RouteID, including rows
+        loaded before routes were parsed, get the RouteID of their Route
+        text. Returns (new routes, success).
+        """
+        cursor = self.connection.cursor()
+        try:
+            airports = route_dim[['AirportName', 'AirportCode', 'City']].drop_duplicates(subset='AirportName')
+            _, _, success = self.load_dimension('Airport', airports, 'AirportName')
+            if not success:
+                return (0, False)
+
+            stops = route_dim.sort_values(['RouteName', 'StopNumber'])
+            stops = stops.assign(AirportID=stops['AirportName'].map(self._get_dimension_map('Airport')))
+            airport_ids = stops.groupby('RouteName', sort=False)['AirportID']
+            routes = pd.DataFrame({
+                'OriginAirportID': airport_ids.first(),
+                'DestinationAirportID': airport_ids.last(),
+                'StopCount': airport_ids.size() - 2
+            }).rename_axis('RouteName').reset_index()
+            inserted, _, success = self.load_dimension('Route', routes, 'RouteName')
+            if not success:
+                return (0, False)
+
+            # Leg n runs from stop n - 1 to stop n
+            segments = pd.DataFrame({
+                'RouteID': stops['RouteName'].map(self._get_dimension_map('Route')),
+                'SegmentNumber': stops['StopNumber'] + 1,
+                'FromAirportID': stops['AirportID'],
+                'ToAirportID': airport_ids.shift(-1)
+            }).dropna(subset=['ToAirportID']).astype('int64')
+            _, _, success = self.load_dimension('RouteSegment', segments, ['RouteID', 'SegmentNumber'])
+            if not success:
+                return (0, False)
+
+            cursor.execute("""
+                UPDATE dim.FlightDetails
+                SET RouteID = (SELECT r.RouteID FROM dim.Route r WHERE r.RouteName = FlightDetails.Route)
+                WHERE RouteID IS NULL
+                AND Route IN (SELECT RouteName FROM dim.Route)
+            """)
+            self.logger.info(f"Linked {max(cursor.rowcount, 0)} flight details records to dim.Route")
+            return (inserted, True)
+
+        except self.backend.errors as e:
+            self.logger.error(f"Error loading route dimensions: {e}")
             return (0, False)
 
-    def load_fact_reviews(self, fact_data: pd.DataFrame, batch_id: int) -> Tuple[int, bool]:
-        """Load review fact data with robust date handling."""
+    def _resolve_fact_keys(self, fact_data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Resolve surrogate keys for the whole fact frame at once.
+
+        Returns (resolved, rejects): ``resolved`` holds the fact columns ready
+        for insert, ``rejects`` the source rows that failed to match along
+        with a RejectReason.
+        """
+        author_map = self._get_dimension_map('Author')
+        flight_map = self._get_dimension_map('FlightDetails')
+
+        keys = pd.DataFrame(index=fact_data.index)
+        keys['AuthorID'] = fact_data['AuthorName'].astype(str).map(author_map)
+
+        # Same 'NULL' normalisation as the dimension key cache uses
+        flight_lookup = pd.DataFrame(
+            [(*key, flight_id) for key, flight_id in flight_map.items()],
+            columns=FLIGHT_KEY_COLUMNS + ['FlightDetailID']
+        )
+        flight_keys = fact_data[FLIGHT_KEY_COLUMNS].astype(object).where(
+            fact_data[FLIGHT_KEY_COLUMNS].notna(), 'NULL'
+        ).astype(str)
+        keys['FlightDetailID'] = flight_keys.merge(
+            flight_lookup, how='left', on=FLIGHT_KEY_COLUMNS
+        )['FlightDetailID'].to_numpy()
+
+        # Missing calendar days are added to dim.Date rather than rejecting rows
+        review_dates = pd.to_datetime(fact_data['ReviewDate'], errors='coerce')
+        flown_dates = pd.to_datetime(fact_data['DateFlown'], errors='coerce')
+        self.date_keys.ensure(pd.concat([review_dates, flown_dates]))
+        keys['ReviewDateKey'] = date_key(review_dates)
+        keys['DateFlownKey'] = date_key(flown_dates)
+
+        reasons = pd.Series(None, index=fact_data.index, dtype=object)
+        reasons = reasons.mask(keys['ReviewDateKey'].isna(), 'ReviewDate missing')
+        reasons = reasons.mask(keys['FlightDetailID'].isna(), 'FlightDetails not found')
+        reasons = reasons.mask(keys['AuthorID'].isna(), 'Author not found')
+        matched = reasons.isna()
+
+        rejects = fact_data[~matched].assign(RejectReason=reasons[~matched])
+        resolved = keys[matched].astype({
+            'AuthorID': 'int64', 'FlightDetailID': 'int64',
+            'ReviewDateKey': 'int64', 'DateFlownKey': 'Int64'
+        })
+        facts = fact_data[matched]
+        if 'IsVerified' not in facts:
+            # Artifacts saved before the marker was parsed; their hashes cover the marker too
+            is_verified, texts = split_verification(facts['ReviewText'])
+            facts = facts.drop(columns='ReviewHash', errors='ignore').assign(IsVerified=is_verified, ReviewText=texts)
+        resolved['Rating'] = facts['Rating'].astype(float)
+        resolved['ReviewTitle'] = facts['ReviewTitle'].astype(str)
+        resolved['ReviewText'] = facts['ReviewText'].astype(str)
+        resolved['IsVerified'] = facts['IsVerified'].astype('boolean')
+        for col in STAR_RATING_COLUMNS:
+            resolved[col] = pd.to_numeric(facts[col], errors='coerce').astype('Int64')
+        resolved['RecommendedService'] = facts['RecommendedService'].astype(str)
+        # Artifacts saved before the hash existed get it computed here
+        resolved['ReviewHash'] = facts['ReviewHash'] if 'ReviewHash' in facts else review_hashes(facts)
+        return resolved, rejects
+
+    def _store_review_texts(self, texts: pd.Series) -> pd.Series:
+        """Add the texts not yet in fact.ReviewText; return the TextID of each text.
+
+        Texts are matched on their hash, so a text shared by several reviews
+        or stored by an earlier load is kept once, and only new texts are
+        compressed and sent to the warehouse.
+        """
+        hashes = text_hashes(texts)
+        unique = pd.DataFrame({'TextHash': hashes, 'ReviewText': texts}).drop_duplicates(subset='TextHash')
+
         cursor = self.connection.cursor()
-        insert_count = 0
-        missing_matches = 0
-        
+        stage_table = self.backend.create_stage_table(cursor, 'fact.ReviewText', 'TextHash')
+        self.backend.bulk_insert(self.connection, stage_table, ['TextHash'], unique)
+
+        def stored_ids() -> dict:
+            cursor.execute(f"""
+                SELECT t.TextHash, t.TextID
+                FROM fact.ReviewText t
+                JOIN {stage_table} s ON s.TextHash = t.TextHash
+            """)
+            return {text_hash: text_id for text_hash, text_id in cursor.fetchall()}
+
+        text_ids = stored_ids()
+        new_texts = unique[~unique['TextHash'].isin(text_ids)]
+        if not new_texts.empty:
+            new_texts = new_texts.assign(
+                TextLength=new_texts['ReviewText'].str.len(),
+                CompressedText=compress_texts(new_texts['ReviewText'])
+            )
+            self.backend.bulk_insert(self.connection, 'fact.ReviewText', TEXT_INSERT_COLUMNS, new_texts)
+            text_ids = stored_ids()
+        cursor.execute(f"DROP TABLE {stage_table}")
+
+        self.logger.info(f"Stored {len(new_texts)} new review texts, {len(unique) - len(new_texts)} already stored")
+        return hashes.map(text_ids)
+
+    def _stage_facts(self, connection, stage_table: str, facts: pd.DataFrame, batch_id: int,
+                     batch_size: int, source_system: str) -> int:
+        """Bulk-insert facts into a staging table in chunks, each with its own LoadDate."""
+        staged = 0
+        for start in range(0, len(facts), batch_size):
+            batch = facts.iloc[start:start + batch_size].assign(
+                LoadDate=datetime.now(),
+                SourceSystem=source_system,
+                BatchID=batch_id
+            )
+            staged += self.backend.bulk_insert(connection, stage_table, FACT_INSERT_COLUMNS, batch)
+        return staged
+
+    def _stage_fact_partition(self, stage_table: str, partition: pd.DataFrame, batch_id: int,
+                              batch_size: int, source_system: str) -> int:
+        """Bulk-insert one partition into its own staging table on a pooled connection."""
+        with self.pool.connection() as connection:
+            self.backend.create_table_like(connection.cursor(), stage_table, 'fact.Reviews', FACT_INSERT_COLUMNS)
+            staged = self._stage_facts(connection, stage_table, partition, batch_id, batch_size, source_system)
+            connection.commit()
+        return staged
+
+    def _merge_fact_stage(self, stage_table: str) -> int:
+        """Insert the staged reviews whose ReviewHash is not yet in fact.Reviews; return the count."""
+        cursor = self.connection.cursor()
+        cursor.execute(f"""
+            INSERT INTO fact.Reviews ({', '.join(FACT_INSERT_COLUMNS)})
+            SELECT {', '.join(f's.{col}' for col in FACT_INSERT_COLUMNS)}
+            FROM {stage_table} s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM fact.Reviews t WHERE t.ReviewHash = s.ReviewHash
+            )
+        """)
+        return max(cursor.rowcount, 0)
+
+    def _load_fact_partitions(self, resolved: pd.DataFrame, batch_id: int, batch_size: int,
+                              source_system: str, partitions: int, partition_by: str) -> int:
+        """Stage partitions concurrently, then merge them into fact.Reviews on this connection.
+
+        Only the merge runs in the caller's transaction, so the load stays all
+        or nothing. The staging tables are dropped when that transaction ends.
+        Returns the number of new reviews.
+        """
+        if self.pool is None or self.pool.size < partitions:
+            if self.pool is not None:
+                self.pool.close()
+            self.pool = ConnectionPool(self.backend, partitions)
+
+        parts = partition_facts(resolved, partitions, partition_by)
+        stage_tables = [
+            f"{self.backend.STAGE_SCHEMA}.ReviewsStage_{batch_id}_{number}" for number in range(len(parts))
+        ]
+        self._stage_tables.extend(stage_tables)
+        self.logger.info(f"Staging {len(resolved)} facts in {len(parts)} partitions by {partition_by}")
+
+        with ThreadPoolExecutor(max_workers=len(parts)) as executor:
+            list(executor.map(
+                lambda job: self._stage_fact_partition(*job, batch_id, batch_size, source_system),
+                zip(stage_tables, parts)
+            ))
+
+        return sum(self._merge_fact_stage(stage_table) for stage_table in stage_tables)
+
+    def load_fact_reviews(self, fact_data: pd.DataFrame, batch_id: int,
+                          batch_size: int = 1000, source_system: str = 'WebScraper',
+                          partitions: int = 1, partition_by: str = 'hash') -> Tuple[int, bool]:
+        """Load review fact data with vectorized key resolution and batched inserts.
+
+        Review texts go to fact.ReviewText, gzip-compressed and deduplicated
+        on their hash. Facts are bulk-staged, then merged with an anti-join on
+        ReviewHash so reviews already in fact.Reviews are skipped; reloads
+        only write new reviews. With ``partitions`` > 1 and a backend that supports it, the
+        facts are split by ``partition_by`` ('hash' or 'date') and staged
+        concurrently over pooled connections. Rows whose keys cannot be
+        resolved are kept in ``self.rejected_facts``. Returns (new reviews
+        inserted, success); success is False when no row could be resolved.
+        """
         try:
-            # Get dimension mappings
-            author_map = self._get_dimension_map('Author', 'AuthorID', 'AuthorName')
-            flight_map = self._get_dimension_map('FlightDetails', 'FlightDetailID', 
-                                            ['SeatType', 'Route', 'TypeOfTraveller'])
-            date_map = self._get_date_map()
-            
-            # Process all records
-            for _, row in fact_data.iterrows():
-                # Author matching
-                author_id = author_map.get(str(row['AuthorName']))
-                if not author_id:
-                    missing_matches += 1
-                    continue
-                
-                # Flight details matching
-                flight_key = (
-                    str(row['SeatType']) if pd.notna(row['SeatType']) else 'NULL',
-                    str(row['Route']) if pd.notna(row['Route']) else 'NULL',
-                    str(row['TypeOfTraveller']) if pd.notna(row['TypeOfTraveller']) else 'NULL'
+            resolved, rejects = self._resolve_fact_keys(fact_data)
+            self.rejected_facts = rejects
+            if not rejects.empty:
+                reasons = rejects['RejectReason'].value_counts().to_dict()
+                self.logger.warning(f"Rejected {len(rejects)} records due to matching issues: {reasons}")
+
+            resolved = resolved.drop_duplicates(subset='ReviewHash')
+            resolved['TextID'] = self._store_review_texts(resolved.pop('ReviewText')).astype('Int64')
+
+            parallel = partitions > 1 and len(resolved) > batch_size
+            if parallel and not self.backend.supports_parallel_load:
+                self.logger.info(f"The {self.backend.name} backend loads facts serially")
+                parallel = False
+
+            if parallel:
+                insert_count = self._load_fact_partitions(
+                    resolved, batch_id, batch_size, source_system, partitions, partition_by
                 )
-                flight_id = flight_map.get(flight_key)
-                if not flight_id:
-                    missing_matches += 1
-                    continue
-                
-                # Date handling with robust conversion
-                try:
-                    review_date = pd.to_datetime(row['ReviewDate']).date() if pd.notna(row['ReviewDate']) else None
-                    review_date_key = date_map.get(review_date) if review_date else None
-                    
-                    flown_date = pd.to_datetime(row['DateFlown']).date() if pd.notna(row['DateFlown']) else None
-                    flown_date_key = date_map.get(flown_date) if flown_date else None
-                    
-                    if not review_date_key:
-                        missing_matches += 1
-                        continue
-                    
-                    # Insert fact record
-                    query = """
-                    INSERT INTO fact.Reviews (
-                        AuthorID, FlightDetailID, ReviewDateKey, DateFlownKey,
-                        Rating, ReviewTitle, ReviewText, SeatComfort, 
-                        CabinStaffService, FoodBeverages, InflightEntertainment,
-                        GroundService, ValueForMoney, RecommendedService,
-                        LoadDate, SourceSystem, BatchID
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """
-                    params = (
-                        author_id, flight_id, review_date_key, flown_date_key,
-                        float(row['Rating']), str(row['ReviewTitle']), str(row['ReviewText']), 
-                        int(row['SeatComfort']) if pd.notna(row['SeatComfort']) else None, 
-                        int(row['CabinStaffService']) if pd.notna(row['CabinStaffService']) else None,
-                        int(row['FoodBeverages']) if pd.notna(row['FoodBeverages']) else None,
-                        int(row['InflightEntertainment']) if pd.notna(row['InflightEntertainment']) else None,
-                        int(row['GroundService']) if pd.notna(row['GroundService']) else None,
-                        int(row['ValueForMoney']) if pd.notna(row['ValueForMoney']) else None,
-                        str(row['RecommendedService']), 
-                        pd.to_datetime('now'),
-                        'WebScraper', 
-                        batch_id
-                    )
-                    cursor.execute(query, params)
-                    insert_count += 1
-                    
-                except Exception as e:
-                    self.logger.warning(f"Skipping record due to date conversion error: {e}")
-                    missing_matches += 1
-                    continue
-                
-            if missing_matches > 0:
-                self.logger.warning(f"Skipped {missing_matches} records due to matching issues")
+            else:
+                self.logger.info(f"Starting fact load for {len(resolved)} records in batches of {batch_size}")
+                cursor = self.connection.cursor()
+                stage_table = self.backend.create_stage_table(
+                    cursor, 'fact.Reviews', ', '.join(FACT_INSERT_COLUMNS)
+                )
+                self._stage_facts(self.connection, stage_table, resolved, batch_id, batch_size, source_system)
+                insert_count = self._merge_fact_stage(stage_table)
+                cursor.execute(f"DROP TABLE {stage_table}")
             
-            self.logger.info(f"Inserted {insert_count} fact records")
-            return (insert_count, insert_count > 0)
+            self.logger.info(
+                f"Inserted {insert_count} fact records, skipped {len(resolved) - insert_count} already loaded"
+            )
+            return (insert_count, not resolved.empty)
             
-        except pyodbc.Error as e:
+        except self.backend.errors as e:
             self.logger.error(f"Error loading fact data: {e}")
             return (0, False)
 
+    def backfill_review_hashes(self) -> int:
+        """Compute ReviewHash for facts loaded before it existed; return the count.
+
+        Where several old rows share a hash only the first ReviewID gets it,
+        since the hash is unique; the others are left NULL.
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT r.ReviewID, a.AuthorName, r.ReviewDateKey, r.ReviewTitle, t.CompressedText
+                FROM fact.Reviews r
+                JOIN dim.Author a ON a.AuthorID = r.AuthorID
+                JOIN fact.ReviewText t ON t.TextID = r.TextID
+                WHERE r.ReviewHash IS NULL
+                ORDER BY r.ReviewID
+            """)
+            facts = pd.DataFrame(
+                [tuple(row) for row in cursor.fetchall()],
+                columns=['ReviewID', 'AuthorName', 'ReviewDateKey', 'ReviewTitle', 'CompressedText']
+            )
+            if facts.empty:
+                self.logger.info("All facts already have a ReviewHash")
+                return 0
+
+            facts['ReviewText'] = decompress_texts(facts.pop('CompressedText'))
+
+            facts['ReviewDate'] = pd.to_datetime(facts['ReviewDateKey'].astype(str), format='%Y%m%d', errors='coerce')
+            facts['ReviewHash'] = review_hashes(facts)
+            cursor.execute("SELECT ReviewHash FROM fact.Reviews WHERE ReviewHash IS NOT NULL")
+            existing = {row[0] for row in cursor.fetchall()}
+            facts = facts[~facts['ReviewHash'].isin(existing)].drop_duplicates(subset='ReviewHash')
+
+            cursor.executemany(
+                "UPDATE fact.Reviews SET ReviewHash = ? WHERE ReviewID = ?",
+                list(zip(facts['ReviewHash'], facts['ReviewID'].astype(int).tolist()))
+            )
+            self.connection.commit()
+            self.logger.info(f"Backfilled ReviewHash for {len(facts)} facts")
+            return len(facts)
+        except self.backend.errors as e:
+            self.connection.rollback()
+            self.logger.error(f"Error backfilling review hashes: {e}")
+            return 0
+
+    def reviews_without_sentiment(self, model_version: str) -> Optional[pd.DataFrame]:
+        """ReviewID, ReviewHash and ReviewText of the facts with no ``model_version`` sentiment row."""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT r.ReviewID, r.ReviewHash, t.CompressedText
+                FROM fact.Reviews r
+                JOIN fact.ReviewText t ON t.TextID = r.TextID
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM fact.ReviewSentiment s
+                    WHERE s.ReviewID = r.ReviewID AND s.ModelVersion = ?
+                )
+            """, (model_version,))
+            reviews = pd.DataFrame(
+                [tuple(row) for row in cursor.fetchall()], columns=['ReviewID', 'ReviewHash', 'CompressedText']
+            )
+            reviews['ReviewText'] = decompress_texts(reviews.pop('CompressedText'))
+            return reviews
+        except self.backend.errors as e:
+            self.logger.error(f"Error reading reviews to enrich: {e}")
+            return None
+
+    def load_review_sentiment(self, scores: pd.DataFrame, model_version: str,
+                              batch_size: int = 1000) -> Tuple[int, bool]:
+        """Bulk-insert sentiment scores (ReviewID plus the score columns) into fact.ReviewSentiment."""
+        insert_count = 0
+        try:
+            for start in range(0, len(scores), batch_size):
+                batch = scores.iloc[start:start + batch_size].assign(
+                    AnalysisDate=datetime.now(),
+                    ModelVersion=model_version
+                )
+                insert_count += self.backend.bulk_insert(
+                    self.connection, 'fact.ReviewSentiment', SENTIMENT_INSERT_COLUMNS, batch
+                )
+            self.logger.info(f"Inserted {insert_count} review sentiment records ({model_version})")
+            return (insert_count, True)
+        except self.backend.errors as e:
+            self.logger.error(f"Error loading review sentiment: {e}")
+            return (0, False)
+
+    def get_latest_review_date(self) -> Optional[str]:
+        """Return the latest loaded ReviewDate as 'YYYY-MM-DD', or None if no facts exist."""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT MAX(ReviewDateKey) FROM fact.Reviews")
+            date_key = cursor.fetchone()[0]
+            if date_key is None:
+                return None
+            date_key = str(date_key)
+            return f"{date_key[:4]}-{date_key[4:6]}-{date_key[6:]}"
+        except self.backend.errors as e:
+            self.logger.error(f"Error reading review watermark: {e}")
+            return None
+
+    def log_data_loads(self, batch_id: int, records) -> bool:
+        """Write pipeline stage metrics to audit.DataLoadLog."""
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany("""
+                INSERT INTO audit.DataLoadLog (
+                    BatchID, TableName, LoadType, StartTime, EndTime,
+                    RowsInserted, RowsUpdated, RowsDeleted, Status, ErrorMessage
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    batch_id, record['table'], record['load_type'], record['start_time'], record['end_time'],
+                    record['rows_inserted'] if record['rows_inserted'] is not None else record['rows'],
+                    record['rows_updated'], None, record['status'], record['error']
+                )
+                for record in records
+            ])
+            self.connection.commit()
+            return True
+        except self.backend.errors as e:
+            self.logger.error(f"Error writing data load log: {e}")
+            return False
+
     def start_etl_batch(self, source_system: str) -> Optional[int]:
         """Start a new ETL batch."""
         cursor = self.connection.cursor()
         try:
-            cursor.execute("""
-                INSERT INTO audit.ETLBatch (SourceSystem) 
-                OUTPUT INSERTED.BatchID
-                VALUES (?)
-            """, source_system)
+            cursor.execute(self.backend.start_batch_sql(), source_system)
             batch_id = cursor.fetchone()[0]
             self.connection.commit()
             return batch_id
-        except pyodbc.Error as e:
+        except self.backend.errors as e:
             self.logger.error(f"Error starting ETL batch: {e}")
             return None
 
+    def resume_etl_batch(self, batch_id: int) -> bool:
+        """Set a failed ETL batch back to Running so a resumed run can finish it."""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                UPDATE audit.ETLBatch
+                SET Status = 'Running', BatchEndTime = NULL
+                WHERE BatchID = ? AND Status <> 'Completed'
+            """, batch_id)
+            resumed = cursor.rowcount != 0
+            self.connection.commit()
+            if not resumed:
+                self.logger.error(f"ETL batch {batch_id} does not exist or has already completed")
+            return resumed
+        except self.backend.errors as e:
+            self.logger.error(f"Error resuming ETL batch: {e}")
+            return False
+
     def complete_etl_batch(self, batch_id: int, status: str, records_loaded: int):
         """Complete an ETL batch with status."""
         cursor = self.connection.cursor()
         try:
-            cursor.execute("""
+            cursor.execute(f"""
                 UPDATE audit.ETLBatch 
-                SET BatchEndTime = GETDATE(), 
+                SET BatchEndTime = {self.backend.NOW_SQL}, 
                     Status = ?,
                     RecordsLoaded = ?
                 WHERE BatchID = ?
             """, (status, records_loaded, batch_id))
             self.connection.commit()
-        except pyodbc.Error as e:
+        except self.backend.errors as e:
             self.logger.error(f"Error completing ETL batch: {e}")
\ No newline at end of file
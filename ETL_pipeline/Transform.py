@@ -1,8 +1,11 @@
 import pandas as pd
+import hashlib
 import os
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional, Tuple
 import logging
+from ETL_pipeline.intermediate_store import write_parquet
+from ETL_pipeline.routes import canonical_routes, route_stops
 
 # Configure logging
 logging.basicConfig(
@@ -11,82 +14,110 @@ logging.basicConfig(
 )
 logger = logging.getLogger('DataProcessing')
 
+RATING_COLUMN = 'Rating'
+
+STAR_RATING_COLUMNS = [
+    'SeatComfort', 'CabinStaffService', 'FoodBeverages',
+    'InflightEntertainment', 'GroundService', 'ValueForMoney'
+]
+
+# Marker the site puts before review text, e.g. "✅ Trip Verified |" or "Not Verified |"
+VERIFICATION_PATTERN = r'(?i)^\W{0,3}\w?\W{0,3}(Trip Verified|Verified Review|Not Verified|Unverified)\s*\|[\s\xa0]*'
+VERIFIED_MARKERS = ['trip verified', 'verified review']
+
+def parse_date_flown(date_flown: pd.Series) -> pd.Series:
+    """Parse DateFlown values, which are mostly "Month Year" but can be full dates.
+
+    Each format is parsed by one vectorized to_datetime call over its mask;
+    anything neither format understands falls back to per-value inference.
+    """
+    values = date_flown.astype(object).where(date_flown.notna(), None)
+    is_text = values.map(lambda value: isinstance(value, str), na_action='ignore').fillna(False).astype(bool)
+    text = values[is_text].astype(str)
+    month_year = pd.Series(False, index=values.index)
+    month_year[is_text] = text.str.split().str.len() == 2
+
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    parsed[month_year] = pd.to_datetime(values[month_year], format='%B %Y', errors='coerce')
+
+    other = values.notna() & ~month_year
+    parsed[other] = pd.to_datetime(values[other], format='ISO8601', errors='coerce')
+
+    leftover = other & parsed.isna()
+    if leftover.any():
+        parsed[leftover] = pd.to_datetime(values[leftover], format='mixed', errors='coerce')
+    return parsed
+
+def split_verification(texts: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Split the verification marker off review texts.
+
+    Returns (IsVerified, texts without the marker); IsVerified is a nullable
+    boolean, NA where a text has no marker.
+    """
+    texts = texts.astype(str)
+    marker = texts.str.extract(VERIFICATION_PATTERN, expand=False)
+    is_verified = marker.str.lower().isin(VERIFIED_MARKERS).astype('boolean').mask(marker.isna())
+    return is_verified, texts.str.replace(VERIFICATION_PATTERN, '', regex=True)
+
+def review_hashes(reviews_df: pd.DataFrame) -> pd.Series:
+    """Stable content hash of each cleaned review: SHA-1 hex of author, review date, title and text."""
+    review_dates = pd.to_datetime(reviews_df['ReviewDate'], errors='coerce').dt.strftime('%Y-%m-%d').fillna('')
+    contents = zip(
+        reviews_df['AuthorName'].astype(str), review_dates,
+        reviews_df['ReviewTitle'].astype(str), reviews_df['ReviewText'].astype(str)
+    )
+    return pd.Series(
+        [hashlib.sha1('\x1f'.join(content).encode('utf-8')).hexdigest() for content in contents],
+        index=reviews_df.index, dtype=object
+    )
+
 def clean_review_data(reviews_df: pd.DataFrame) -> pd.DataFrame:
-    """Clean and transform review data for DW loading."""
+    """Clean and transform review data for DW loading.
+
+    Ratings become compact numeric dtypes (int8 stars, float32 overall
+    rating) and RecommendedService a categorical. The verification marker
+    is split off ReviewText into IsVerified, and Route is rewritten to its
+    canonical text. The input frame is not modified.
+    """
     logger.info("Starting data cleaning process")
-    
+    reviews_df = reviews_df.copy(deep=False)
+
     # Convert ratings to numeric
-    rating_columns = [
-        'Rating', 'SeatComfort', 'CabinStaffService', 
-        'FoodBeverages', 'InflightEntertainment', 
-        'GroundService', 'ValueForMoney'
-    ]
-    
-    for column in rating_columns:
-        reviews_df[column] = pd.to_numeric(reviews_df[column], errors='coerce')
-        reviews_df[column] = reviews_df[column].fillna(0)
-        logger.debug(f"Processed ratings for {column}")
+    reviews_df[RATING_COLUMN] = pd.to_numeric(reviews_df[RATING_COLUMN], errors='coerce').fillna(0).astype('float32')
+    for column in STAR_RATING_COLUMNS:
+        reviews_df[column] = pd.to_numeric(reviews_df[column], errors='coerce').fillna(0).astype('int8')
 
     # Convert dates to datetime with error handling
     reviews_df['ReviewDate'] = pd.to_datetime(reviews_df['ReviewDate'], errors='coerce')
+    reviews_df['DateFlown'] = parse_date_flown(reviews_df['DateFlown'])
     
-    # Special handling for DateFlown which might be in "Month Year" format
-    def parse_date_flown(date_str):
-        try:
-            if pd.isna(date_str):
-                return pd.NaT
-            if isinstance(date_str, str):
-                if len(date_str.split()) == 2:  #"Month Year" format
-                    return pd.to_datetime(date_str, format='%B %Y', errors='coerce')
-            return pd.to_datetime(date_str, errors='coerce')
-        except Exception:
-            return pd.NaT
-    
-    reviews_df['DateFlown'] = reviews_df['DateFlown'].apply(parse_date_flown)
-    
-    logger.debug("Completed date conversions")
+    logger.debug("Completed rating and date conversions")
 
     # Clean text fields
-    text_columns = ['ReviewTitle', 'AuthorLocation', 'ReviewText']
-    for col in text_columns:
-        reviews_df[col] = reviews_df[col].astype(str)
-    
-    reviews_df['ReviewTitle'] = reviews_df['ReviewTitle'].str.replace('["“”]', '', regex=True)
-    reviews_df['AuthorLocation'] = reviews_df['AuthorLocation'].str.replace(r'[()]', '', regex=True)
+    reviews_df['ReviewTitle'] = reviews_df['ReviewTitle'].astype(str).str.replace('["“”]', '', regex=True)
+    reviews_df['AuthorLocation'] = reviews_df['AuthorLocation'].astype(str).str.replace(r'[()]', '', regex=True)
+    reviews_df['IsVerified'], reviews_df['ReviewText'] = split_verification(reviews_df['ReviewText'])
+    reviews_df['Route'] = canonical_routes(reviews_df['Route'])
     
     # Handle recommended field
-    reviews_df['RecommendedService'] = reviews_df['RecommendedService'].str.upper()
-    reviews_df['RecommendedService'] = reviews_df['RecommendedService'].replace({
-        'YES': 'YES',
-        'NO': 'NO',
-        'Y': 'YES',
-        'N': 'NO'
-    }).fillna('NO')
+    recommended = reviews_df['RecommendedService'].str.upper()
+    reviews_df['RecommendedService'] = recommended.replace({'Y': 'YES', 'N': 'NO'}).fillna('NO').astype('category')
     
     logger.debug("Completed text cleaning")
 
-    # Drop duplicates and invalid dates
+    # Drop duplicates, invalid dates and dates outside a reasonable range in one filter
     initial_count = len(reviews_df)
-    reviews_df.drop_duplicates(
-        subset=['AuthorName', 'ReviewText'], 
-        keep='first', 
-        inplace=True
-    )
-    reviews_df = reviews_df.dropna(subset=['ReviewDate', 'DateFlown'])
-    final_count = len(reviews_df)
-    
-    logger.info(f"Removed {initial_count - final_count} invalid/duplicate records")
-
-    # Ensure dates are within the reasonable range
     current_year = pd.Timestamp.now().year
-    date_mask = (
-        (reviews_df['ReviewDate'].dt.year >= 2000) & 
-        (reviews_df['ReviewDate'].dt.year <= current_year + 1) &
-        (reviews_df['DateFlown'].dt.year >= 2000) & 
-        (reviews_df['DateFlown'].dt.year <= current_year + 1)
+    review_year = reviews_df['ReviewDate'].dt.year
+    flown_year = reviews_df['DateFlown'].dt.year
+    keep = (
+        ~reviews_df.duplicated(subset=['AuthorName', 'ReviewText'], keep='first') &
+        review_year.between(2000, current_year + 1) &
+        flown_year.between(2000, current_year + 1)
     )
-    reviews_df = reviews_df[date_mask]
+    reviews_df = reviews_df[keep]
     
+    logger.info(f"Removed {initial_count - len(reviews_df)} invalid/duplicate records")
     logger.info(f"Final cleaned dataset contains {len(reviews_df)} records")
     return reviews_df
 
@@ -110,18 +141,37 @@ def prepare_dw_load_data(cleaned_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
     
     logger.info(f"Prepared {len(flight_dim)} flight details dimension records")
 
-    # Prepare fact data with references
+    # Stops of each parsed route for the airport, route and route segment dimensions
+    route_dim = route_stops(flight_dim['Route'])
+
+    logger.info(f"Prepared {route_dim['RouteName'].nunique()} route dimension records")
+    unresolved = sorted(route_dim.loc[route_dim['AirportCode'].isna(), 'AirportName'].unique())
+    if unresolved:
+        logger.warning(f"{len(unresolved)} route places are not in the airport lookup: {', '.join(unresolved)}")
+
+    # Prepare fact data with references and the content hash reloads are matched on
     fact_data = cleaned_df.copy()
+    fact_data['ReviewHash'] = review_hashes(fact_data)
     
     return {
         'author_dim': author_dim,
         'flight_dim': flight_dim,
+        'route_dim': route_dim,
         'review_fact': fact_data
     }
 
-def save_intermediate_data(data_dict: Dict[str, pd.DataFrame], output_folder: str = 'output'):
-    """Save intermediate data to CSV files."""
-    logger.info(f"Saving intermediate data to {output_folder}")
+def save_intermediate_data(data_dict: Dict[str, pd.DataFrame], output_folder: str = 'output',
+                           file_format: str = 'csv', run_date: Optional[str] = None) -> str:
+    """Save intermediate data as CSV files or as Parquet partitioned by run date.
+
+    Returns the folder the files were written to.
+    """
+    logger.info(f"Saving intermediate data to {output_folder} as {file_format}")
+    if file_format == 'parquet':
+        return write_parquet(data_dict, output_folder, run_date)
+    if file_format != 'csv':
+        raise ValueError(f"Unknown intermediate format: {file_format}")
+
     os.makedirs(output_folder, exist_ok=True)
     
     for key, df in data_dict.items():
@@ -131,4 +181,5 @@ def save_intermediate_data(data_dict: Dict[str, pd.DataFrame], output_folder: st
             logger.info(f"Saved {len(df)} records to {file_path}")
         except Exception as e:
             logger.error(f"Error saving {key} to CSV: {e}")
-            raise
\ No newline at end of file
+            raise
+    return output_folder
@@ -0,0 +1,169 @@
+import logging
+from datetime import datetime
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from ETL_pipeline.Load import STAR_RATING_COLUMNS
+
+logger = logging.getLogger('Aggregates')
+
+GROUP_COLUMNS = ['Route', 'TypeOfTraveller', 'MonthKey']
+
+SUMMARY_SUM_COLUMNS = ['ReviewCount', 'RecommendCount', 'RatedCount', 'RatingSum']
+ASPECT_SUM_COLUMNS = ['RatedCount', 'AspectSum', 'AspectSqSum', 'RatingSum', 'RatingSqSum', 'RatingAspectSum']
+
+def summarize_reviews(facts: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Per-group sums of a set of reviews for agg.RouteMonthSummary and agg.RouteMonthAspect.
+
+    ``facts`` has Route, TypeOfTraveller, ReviewDateKey, Rating,
+    RecommendedService and the star rating columns. Ratings and aspect
+    scores of 0 are unrated and left out of the sums.
+    """
+    facts = facts.assign(
+        MonthKey=facts['ReviewDateKey'].astype(int) // 100,
+        Rating=facts['Rating'].astype(float),
+        Recommended=(facts['RecommendedService'] == 'YES').astype(int)
+    )
+    facts['RatedRating'] = facts['Rating'].where(facts['Rating'] > 0)
+
+    summary = facts.groupby(GROUP_COLUMNS, dropna=False, sort=False).agg(
+        ReviewCount=('Rating', 'size'),
+        RecommendCount=('Recommended', 'sum'),
+        RatedCount=('RatedRating', 'count'),
+        RatingSum=('RatedRating', 'sum')
+    ).reset_index()
+
+    scores = facts.melt(
+        id_vars=[*GROUP_COLUMNS, 'RatedRating'], value_vars=STAR_RATING_COLUMNS,
+        var_name='Aspect', value_name='Score'
+    )
+    scores['Score'] = pd.to_numeric(scores['Score'], errors='coerce').astype(float)
+    scores = scores[(scores['Score'] > 0) & scores['RatedRating'].notna()]
+    scores = scores.assign(
+        ScoreSq=scores['Score'] ** 2,
+        RatingSq=scores['RatedRating'] ** 2,
+        RatingScore=scores['RatedRating'] * scores['Score']
+    )
+    aspects = scores.groupby([*GROUP_COLUMNS, 'Aspect'], dropna=False, sort=False).agg(
+        RatedCount=('Score', 'size'),
+        AspectSum=('Score', 'sum'),
+        AspectSqSum=('ScoreSq', 'sum'),
+        RatingSum=('RatedRating', 'sum'),
+        RatingSqSum=('RatingSq', 'sum'),
+        RatingAspectSum=('RatingScore', 'sum')
+    ).reset_index()
+    return summary, aspects
+
+def _ratio(numerator: pd.Series, denominator: pd.Series, decimals: int) -> pd.Series:
+    return (numerator / denominator.where(denominator > 0)).round(decimals)
+
+def derive_summary(summary: pd.DataFrame) -> pd.DataFrame:
+    """Add AvgRating and RecommendRate from the summary sums."""
+    return summary.assign(
+        AvgRating=_ratio(summary['RatingSum'], summary['RatedCount'], 2),
+        RecommendRate=_ratio(summary['RecommendCount'], summary['ReviewCount'], 4)
+    )
+
+def derive_aspect(aspects: pd.DataFrame) -> pd.DataFrame:
+    """Add AvgAspect, AvgRating and the Pearson correlation of Rating with the aspect score."""
+    n = aspects['RatedCount']
+    covariance = n * aspects['RatingAspectSum'] - aspects['RatingSum'] * aspects['AspectSum']
+    rating_variance = n * aspects['RatingSqSum'] - aspects['RatingSum'] ** 2
+    aspect_variance = n * aspects['AspectSqSum'] - aspects['AspectSum'] ** 2
+    denominator = np.sqrt((rating_variance * aspect_variance).clip(lower=0))
+    return aspects.assign(
+        AvgAspect=_ratio(aspects['AspectSum'], n, 2),
+        AvgRating=_ratio(aspects['RatingSum'], n, 2),
+        # Undefined for single reviews and constant ratings or scores
+        RatingCorrelation=(covariance / denominator.where(denominator > 1e-9)).clip(-1, 1).round(4)
+    )
+
+# Summary table -> (key columns, additive columns, derivation of the other columns)
+SUMMARY_TABLES = {
+    'agg.RouteMonthSummary': (GROUP_COLUMNS, SUMMARY_SUM_COLUMNS, derive_summary),
+    'agg.RouteMonthAspect': ([*GROUP_COLUMNS, 'Aspect'], ASPECT_SUM_COLUMNS, derive_aspect)
+}
+
+def merge_summary(dw, table: str, delta: pd.DataFrame, batch_id: int) -> int:
+    """Add ``delta``'s sums to the matching rows of ``table``; return the number of rows written.
+
+    The delta is staged, the touched rows are read back, summed with it in
+    pandas and rewritten, so only the groups of the new reviews are touched.
+    """
+    key_columns, sum_columns, derive = SUMMARY_TABLES[table]
+    columns = [*key_columns, *sum_columns]
+    if delta.empty:
+        return 0
+
+    cursor = dw.connection.cursor()
+    stage_table = dw.backend.create_stage_table(cursor, table, ', '.join(columns))
+    dw.backend.bulk_insert(dw.connection, stage_table, columns, delta[columns])
+
+    cursor.execute(f"""
+        SELECT {', '.join(f't.{col}' for col in columns)}
+        FROM {table} t
+        JOIN {stage_table} s ON {dw.backend.match_columns(key_columns)}
+    """)
+    existing = pd.DataFrame([tuple(row) for row in cursor.fetchall()], columns=columns)
+
+    combined = pd.concat([existing, delta[columns]], ignore_index=True)
+    combined[sum_columns] = combined[sum_columns].astype(float)
+    combined = combined.groupby(key_columns, dropna=False, sort=False)[sum_columns].sum().reset_index()
+    count_columns = [col for col in sum_columns if col.endswith('Count')]
+    combined[count_columns] = combined[count_columns].astype(int)
+    combined = derive(combined).assign(LastBatchID=batch_id, RefreshedDate=datetime.now())
+
+    cursor.execute(dw.backend.delete_from_stage_sql(table, stage_table, key_columns))
+    written = dw.backend.bulk_insert(dw.connection, table, list(combined.columns), combined)
+    cursor.execute(f"DROP TABLE {stage_table}")
+    return written
+
+def refresh_summaries(dw, batch_id: int) -> Tuple[int, bool]:
+    """Add the reviews of batches not yet aggregated, up to ``batch_id``, to the agg summary tables.
+
+    agg.RefreshLog holds every batch already added, so a batch that
+    finishes after a later one (a resumed run) is still added, and the
+    first refresh aggregates every loaded review. Runs on the caller's
+    connection and transaction. Returns (reviews aggregated, success).
+    """
+    cursor = dw.connection.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT r.BatchID, f.Route, f.TypeOfTraveller, r.ReviewDateKey, r.Rating, r.RecommendedService,
+                   {', '.join(f'r.{col}' for col in STAR_RATING_COLUMNS)}
+            FROM fact.Reviews r
+            JOIN dim.FlightDetails f ON f.FlightDetailID = r.FlightDetailID
+            WHERE r.BatchID <= ? AND r.BatchID NOT IN (SELECT BatchID FROM agg.RefreshLog)
+        """, (batch_id,))
+        facts = pd.DataFrame(
+            [tuple(row) for row in cursor.fetchall()],
+            columns=['BatchID', 'Route', 'TypeOfTraveller', 'ReviewDateKey', 'Rating', 'RecommendedService',
+                     *STAR_RATING_COLUMNS]
+        )
+
+        if not facts.empty:
+            summary, aspects = summarize_reviews(facts)
+            for table, delta in (('agg.RouteMonthSummary', summary), ('agg.RouteMonthAspect', aspects)):
+                written = merge_summary(dw, table, delta, batch_id)
+                logger.info(f"Refreshed {written} rows of {table}")
+
+        # Log the batch even without reviews, unless an earlier refresh already did
+        refreshed = {int(batch): int(count) for batch, count in facts['BatchID'].value_counts().items()}
+        cursor.execute("SELECT COUNT(*) FROM agg.RefreshLog WHERE BatchID = ?", (batch_id,))
+        if batch_id not in refreshed and cursor.fetchone()[0] == 0:
+            refreshed[batch_id] = 0
+        if not refreshed:
+            logger.info(f"Summaries already include batch {batch_id}")
+            return (0, True)
+        dw.backend.bulk_insert(dw.connection, 'agg.RefreshLog', ['BatchID', 'ReviewsAggregated'], pd.DataFrame({
+            'BatchID': list(refreshed), 'ReviewsAggregated': list(refreshed.values())
+        }))
+
+        batches = ', '.join(str(batch) for batch in sorted(refreshed))
+        logger.info(f"Aggregated {len(facts)} reviews of batch{'es' if len(refreshed) > 1 else ''} {batches}")
+        return (len(facts), True)
+    except dw.backend.errors as e:
+        logger.error(f"Error refreshing summary tables: {e}")
+        return (0, False)
@@ -0,0 +1,145 @@
+import json
+import os
+import pickle
+import logging
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger('Checkpoint')
+
+RUNS_DIR = os.path.join('output', 'runs')
+
+class RunManifest:
+    """Checkpoints of one pipeline run, so a failed run can resume where it stopped.
+
+    Each run has a folder under ``runs_dir`` with a ``manifest.json`` that
+    records the audit.ETLBatch BatchID once loading starts and the status of
+    every stage. Frame-producing stages pickle their output next to it;
+    load stages record their row count. A resumed run skips the completed
+    stages, reading their checkpoints instead, and redoes the failed one.
+    """
+
+    def __init__(self, run_dir: str, state: dict):
+        self.run_dir = run_dir
+        self.state = state
+
+    @classmethod
+    def create(cls, runs_dir: str = RUNS_DIR, **options) -> 'RunManifest':
+        """Start the manifest of a new run; ``options`` identify the warehouse a resume must target."""
+        run_id = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        run = cls(os.path.join(runs_dir, run_id), {
+            'run_id': run_id,
+            'batch_id': None,
+            'status': 'Running',
+            'options': options,
+            'stages': {}
+        })
+        run.save()
+        return run
+
+    @classmethod
+    def load(cls, run_dir: str) -> 'RunManifest':
+        with open(os.path.join(run_dir, 'manifest.json'), encoding='utf-8') as f:
+            return cls(run_dir, json.load(f))
+
+    @classmethod
+    def find(cls, runs_dir: str = RUNS_DIR, batch_id: Optional[int] = None, **options) -> Optional['RunManifest']:
+        """The run of ``batch_id``, or else the latest unfinished run, among those started with ``options``.
+
+        Returns None if there is no such run.
+        """
+        if not os.path.isdir(runs_dir):
+            return None
+        for name in sorted(os.listdir(runs_dir), reverse=True):
+            if not os.path.exists(os.path.join(runs_dir, name, 'manifest.json')):
+                continue
+            run = cls.load(os.path.join(runs_dir, name))
+            if run.state['options'] != options:
+                continue
+            if batch_id is not None:
+                if run.batch_id == batch_id:
+                    return run
+            elif run.state['status'] != 'Completed':
+                return run
+        return None
+
+    @property
+    def run_id(self) -> str:
+        return self.state['run_id']
+
+    @property
+    def batch_id(self) -> Optional[int]:
+        return self.state['batch_id']
+
+    @batch_id.setter
+    def batch_id(self, batch_id: int):
+        self.state['batch_id'] = batch_id
+        self.save()
+
+    def save(self):
+        """Write the manifest atomically."""
+        os.makedirs(self.run_dir, exist_ok=True)
+        path = os.path.join(self.run_dir, 'manifest.json')
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2, default=str)
+        os.replace(f'{path}.tmp', path)
+
+    def _artifact_path(self, stage: str) -> str:
+        return os.path.join(self.run_dir, f'{stage}.pkl')
+
+    def completed(self, stage: str) -> bool:
+        return self.state['stages'].get(stage, {}).get('status') == 'Completed'
+
+    def result(self, stage: str) -> Any:
+        """The recorded result of a completed stage, reading its checkpoint artifact if it has one."""
+        record = self.state['stages'][stage]
+        if record.get('artifact'):
+            with open(os.path.join(self.run_dir, record['artifact']), 'rb') as f:
+                return pickle.load(f)
+        return record.get('result')
+
+    def start(self, stage: str):
+        self.state['stages'][stage] = {'status': 'Running', 'started': datetime.now().isoformat()}
+        self.save()
+
+    def complete(self, stage: str, result: Any = None, artifact: Any = None):
+        """Mark a stage completed with a JSON ``result`` or a pickled ``artifact``."""
+        record = self.state['stages'].setdefault(stage, {})
+        if artifact is not None:
+            path = self._artifact_path(stage)
+            with open(f'{path}.tmp', 'wb') as f:
+                pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f'{path}.tmp', path)
+            record['artifact'] = os.path.basename(path)
+        record.update(status='Completed', result=result, completed=datetime.now().isoformat(), error=None)
+        self.save()
+
+    def fail(self, stage: str, error: Exception):
+        self.state['stages'].setdefault(stage, {}).update(status='Failed', error=str(error))
+        self.state['status'] = 'Failed'
+        self.save()
+
+    def run_stage(self, stage: str, produce: Callable[[], Any]) -> Any:
+        """Return the stage's checkpoint if it completed earlier, else run ``produce`` and checkpoint its output."""
+        if self.completed(stage):
+            logger.info(f"Skipping {stage}, completed in run {self.run_id}")
+            return self.result(stage)
+        self.start(stage)
+        try:
+            artifact = produce()
+        except Exception as e:
+            self.fail(stage, e)
+            raise
+        self.complete(stage, artifact=artifact)
+        return artifact
+
+    def finish(self, status: str = 'Completed'):
+        """Record the run's final status; a completed run's checkpoint artifacts are removed."""
+        self.state['status'] = status
+        if status == 'Completed':
+            for record in self.state['stages'].values():
+                artifact = record.pop('artifact', None)
+                if artifact and os.path.exists(os.path.join(self.run_dir, artifact)):
+                    os.remove(os.path.join(self.run_dir, artifact))
+        self.save()
+        logger.info(f"Run {self.run_id} finished as {status}")
@@ -0,0 +1,124 @@
+import pandas as pd
+import logging
+from datetime import date, timedelta
+from typing import Optional
+
+logger = logging.getLogger('DateDimension')
+
+DATE_DIM_COLUMNS = [
+    'DateKey', 'FullDate', 'DayOfWeek', 'DayName', 'DayOfMonth', 'DayOfYear',
+    'WeekOfYear', 'MonthName', 'MonthOfYear', 'Quarter', 'Year',
+    'IsWeekend', 'IsHoliday', 'HolidayName'
+]
+
+def date_key(dates: pd.Series) -> pd.Series:
+    """Compute yyyymmdd DateKeys for a datetime Series (NaT stays missing)."""
+    dates = pd.to_datetime(dates, errors='coerce')
+    keys = dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day
+    return keys.astype('Int64')
+
+def build_date_dimension(start, end) -> pd.DataFrame:
+    """Build dim.Date rows with all derived columns for the inclusive range.
+
+    DayOfWeek and WeekOfYear follow SQL Server's default DATEPART semantics
+    (Sunday = 1; week 1 is the week containing 1 January).
+    """
+    dates = pd.Series(pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq='D'))
+    day_of_week = (dates.dt.dayofweek + 1) % 7 + 1
+    jan1_offset = (pd.to_datetime(dates.dt.year.astype(str) + '-01-01').dt.dayofweek + 1) % 7
+
+    return pd.DataFrame({
+        'DateKey': date_key(dates).astype('int64'),
+        'FullDate': dates.dt.date,
+        'DayOfWeek': day_of_week,
+        'DayName': dates.dt.day_name(),
+        'DayOfMonth': dates.dt.day,
+        'DayOfYear': dates.dt.dayofyear,
+        'WeekOfYear': (dates.dt.dayofyear + jan1_offset - 1) // 7 + 1,
+        'MonthName': dates.dt.month_name(),
+        'MonthOfYear': dates.dt.month,
+        'Quarter': dates.dt.quarter,
+        'Year': dates.dt.year,
+        'IsWeekend': day_of_week.isin([1, 7]),
+        'IsHoliday': False,
+        'HolidayName': None
+    }, columns=DATE_DIM_COLUMNS)
+
+class DateKeyResolver:
+    """Resolve DateKeys arithmetically against a cached coverage range of dim.Date.
+
+    Only MIN/MAX/COUNT of dim.Date are read. When the table has gaps the set
+    of existing keys is read once instead. Dates outside the coverage are
+    added in bulk by ``ensure`` so that rows are never dropped for a missing
+    calendar day.
+    """
+
+    def __init__(self, connection, backend):
+        self.connection = connection
+        self.backend = backend
+        self.min_date: Optional[date] = None
+        self.max_date: Optional[date] = None
+        self._existing_keys: Optional[set] = None
+        self._loaded = False
+
+    def _load_coverage(self):
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT MIN(DateKey), MAX(DateKey), COUNT(*) FROM dim.Date")
+        min_key, max_key, count = cursor.fetchone()
+        self._loaded = True
+        if not count:
+            return
+        self.min_date = pd.to_datetime(str(min_key), format='%Y%m%d').date()
+        self.max_date = pd.to_datetime(str(max_key), format='%Y%m%d').date()
+        if count != (self.max_date - self.min_date).days + 1:
+            cursor.execute("SELECT DateKey FROM dim.Date")
+            self._existing_keys = {row[0] for row in cursor.fetchall()}
+
+    def ensure(self, dates: pd.Series) -> int:
+        """Make sure every date in the Series exists in dim.Date; return rows added."""
+        if not self._loaded:
+            self._load_coverage()
+
+        dates = pd.to_datetime(dates, errors='coerce').dropna()
+        if dates.empty:
+            return 0
+        wanted_min = dates.min().date()
+        wanted_max = dates.max().date()
+
+        if self.min_date is None:
+            missing = build_date_dimension(wanted_min, wanted_max)
+        else:
+            ranges = []
+            if wanted_min < self.min_date:
+                ranges.append(build_date_dimension(wanted_min, self.min_date - timedelta(days=1)))
+            if wanted_max > self.max_date:
+                ranges.append(build_date_dimension(self.max_date + timedelta(days=1), wanted_max))
+            if self._existing_keys is not None:
+                # Fill gaps inside the covered range that these dates fall into
+                inside = dates[(dates.dt.date >= self.min_date) & (dates.dt.date <= self.max_date)]
+                gap_keys = set(date_key(inside).dropna().astype('int64')) - self._existing_keys
+                if gap_keys:
+                    covered = build_date_dimension(self.min_date, self.max_date)
+                    ranges.append(covered[covered['DateKey'].isin(gap_keys)])
+            if not ranges:
+                return 0
+            missing = pd.concat(ranges, ignore_index=True)
+
+        inserted = self.insert(missing)
+        self.min_date = min(wanted_min, self.min_date or wanted_min)
+        self.max_date = max(wanted_max, self.max_date or wanted_max)
+        if self._existing_keys is not None:
+            self._existing_keys.update(missing['DateKey'].tolist())
+        logger.info(f"Extended dim.Date with {inserted} dates")
+        return inserted
+
+    def insert(self, rows: pd.DataFrame) -> int:
+        """Bulk-insert prepared dim.Date rows with the backend's bulk path."""
+        if rows.empty:
+            return 0
+        return self.backend.bulk_insert(self.connection, 'dim.Date', DATE_DIM_COLUMNS, rows)
+
+    def resolve(self, dates: pd.Series) -> pd.Series:
+        """Return DateKeys for the Series, adding any missing calendar days first."""
+        self.ensure(dates)
+        return date_key(dates)
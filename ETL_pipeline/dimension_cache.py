@@ -0,0 +1,182 @@
+import os
+import re
+import pickle
+import threading
+import logging
+from typing import Dict, Iterable
+
+logger = logging.getLogger('DimensionCache')
+
+SNAPSHOT_DIR = 'cache'
+
+# Dimension table -> (surrogate key column, business key columns)
+DIMENSION_KEYS = {
+    'Author': ('AuthorID', ['AuthorName']),
+    'FlightDetails': ('FlightDetailID', ['SeatType', 'Route', 'TypeOfTraveller']),
+    'Airport': ('AirportID', ['AirportName']),
+    'Route': ('RouteID', ['RouteName'])
+}
+
+def normalize_key(values) -> tuple:
+    """Business key as a tuple of strings, with NULLs as 'NULL'."""
+    return tuple(str(value) if value is not None else 'NULL' for value in values)
+
+class DimensionKeyCache:
+    """Business key -> surrogate key cache for one dimension table.
+
+    The first ``refresh`` reads the table once. Later refreshes only read
+    rows whose CreatedDate/ModifiedDate is at or after the high-water mark,
+    plus a COUNT(*) to detect deleted rows, which forces a full reload.
+    Keys added inside a transaction stay pending until it commits, so a
+    rollback can discard them.
+    """
+
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+        self.id_column, self.key_columns = DIMENSION_KEYS[table_name]
+        self.keys: Dict[tuple, int] = {}
+        self.ids = set()
+        self.high_water = None
+        self.loaded = False
+        self._pending = set()
+
+    def _select(self, where: str = '') -> str:
+        cols_str = ', '.join(self.key_columns)
+        return (
+            f"SELECT {cols_str}, {self.id_column}, "
+            f"CASE WHEN ModifiedDate > CreatedDate THEN ModifiedDate ELSE CreatedDate END "
+            f"FROM dim.{self.table_name} {where}"
+        )
+
+    def _apply(self, rows):
+        n_keys = len(self.key_columns)
+        for row in rows:
+            self.keys[normalize_key(row[:n_keys])] = row[n_keys]
+            self.ids.add(row[n_keys])
+            changed = row[n_keys + 1]
+            if changed is not None and (self.high_water is None or changed > self.high_water):
+                self.high_water = changed
+
+    def load(self, cursor):
+        """Read every key of the dimension."""
+        cursor.execute(self._select())
+        self.keys = {}
+        self.ids = set()
+        self.high_water = None
+        self._pending = set()
+        self._apply(cursor.fetchall())
+        self.loaded = True
+        logger.info(f"Loaded {len(self.keys)} keys for dim.{self.table_name}")
+
+    def refresh(self, cursor):
+        """Bring the cache up to date, incrementally when possible."""
+        if not self.loaded:
+            self.load(cursor)
+            return
+
+        if self.high_water is not None:
+            cursor.execute(
+                self._select("WHERE CreatedDate >= ? OR ModifiedDate >= ?"),
+                (self.high_water, self.high_water)
+            )
+            self._apply(cursor.fetchall())
+
+        cursor.execute(f"SELECT COUNT(*) FROM dim.{self.table_name}")
+        if cursor.fetchone()[0] != len(self.ids):
+            logger.info(f"dim.{self.table_name} changed outside the loader, reloading keys")
+            self.load(cursor)
+
+    def add(self, rows: Iterable):
+        """Add (business key..., surrogate key, CreatedDate) rows, e.g. from OUTPUT INSERTED."""
+        n_keys = len(self.key_columns)
+        rows = list(rows)
+        for row in rows:
+            self._pending.add((normalize_key(row[:n_keys]), row[n_keys]))
+        self._apply(rows)
+
+    def contains(self, values) -> bool:
+        return normalize_key(values) in self.keys
+
+    def mapping(self) -> dict:
+        """Key map in the shape the fact loader uses (plain string for single-column keys)."""
+        if len(self.key_columns) == 1:
+            return {key[0]: surrogate for key, surrogate in self.keys.items()}
+        return dict(self.keys)
+
+    def commit(self):
+        self._pending = set()
+
+    def rollback(self):
+        for key, surrogate in self._pending:
+            if self.keys.get(key) == surrogate:
+                del self.keys[key]
+            self.ids.discard(surrogate)
+        self._pending = set()
+
+def snapshot_path(backend: str, server: str, database: str) -> str:
+    """The dimension key snapshot file of one warehouse."""
+    name = re.sub(r'[^\w.-]+', '_', f'{backend}.{server}.{database}')
+    return os.path.join(SNAPSHOT_DIR, f'dimension_keys.{name}.pkl')
+
+class DimensionCacheSet:
+    """The key caches of all dimensions of one warehouse."""
+
+    def __init__(self, server: str, database: str):
+        self.warehouse = (server, database)
+        self.caches = {table_name: DimensionKeyCache(table_name) for table_name in DIMENSION_KEYS}
+        self.lock = threading.Lock()
+
+    def __getitem__(self, table_name: str) -> DimensionKeyCache:
+        return self.caches[table_name]
+
+    def commit(self):
+        for cache in self.caches.values():
+            cache.commit()
+
+    def rollback(self):
+        for cache in self.caches.values():
+            cache.rollback()
+
+    def save_snapshot(self, path: str):
+        """Persist loaded keys and high-water marks for a warm start."""
+        state = {
+            'warehouse': self.warehouse,
+            'dimensions': {
+                name: (cache.keys, cache.ids, cache.high_water)
+                for name, cache in self.caches.items() if cache.loaded
+            }
+        }
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(state, f)
+        logger.info(f"Saved dimension key snapshot to {path}")
+
+    def load_snapshot(self, path: str) -> bool:
+        """Warm-start from a snapshot; the next refresh only reads newer rows.
+
+        A snapshot saved from another warehouse is ignored, as its surrogate
+        keys do not exist in this one.
+        """
+        if not os.path.exists(path):
+            return False
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if not isinstance(state, dict) or state.get('warehouse') != self.warehouse:
+            logger.warning(f"Ignoring dimension key snapshot {path}, which was not saved from {self.warehouse}")
+            return False
+        for name, (keys, ids, high_water) in state['dimensions'].items():
+            if name in self.caches:
+                cache = self.caches[name]
+                cache.keys, cache.ids, cache.high_water, cache.loaded = keys, ids, high_water, True
+        logger.info(f"Loaded dimension key snapshot from {path}")
+        return True
+
+_caches: Dict[tuple, DimensionCacheSet] = {}
+_caches_lock = threading.Lock()
+
+def get_dimension_cache(server: str, database: str) -> DimensionCacheSet:
+    """Return the process-wide dimension key caches for a warehouse."""
+    with _caches_lock:
+        if (server, database) not in _caches:
+            _caches[(server, database)] = DimensionCacheSet(server, database)
+        return _caches[(server, database)]
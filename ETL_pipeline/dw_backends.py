@@ -0,0 +1,542 @@
+import os
+import re
+import sqlite3
+import logging
+from datetime import date, datetime
+from typing import List, Optional
+
+import pandas as pd
+
+try:
+    import pyodbc
+except ImportError:
+    pyodbc = None
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+from ETL_pipeline.schema import migrate
+
+logger = logging.getLogger('DWBackend')
+
+SCHEMAS = ['dim', 'fact', 'audit', 'agg']
+
+# sqlite3 only binds plain Python values; store timestamps as sortable ISO text
+sqlite3.register_adapter(pd.Timestamp, lambda value: value.isoformat(sep=' '))
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=' '))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+
+def to_rows(data: pd.DataFrame) -> list:
+    """Convert a frame to a list of tuples of plain Python values for a DB-API driver."""
+    data = data.astype(object).where(pd.notna(data), None)
+    return list(data.itertuples(index=False, name=None))
+
+def match_columns(columns, left: str = 't', right: str = 's',
+                  null_safe_equals: Optional[str] = None) -> str:
+    """NULL-safe equality predicate over the given columns.
+
+    ``null_safe_equals`` is the dialect's NULL-safe comparison operator, if
+    it has one; otherwise the NULL case is spelled out.
+    """
+    if null_safe_equals:
+        return ' AND '.join(f"{left}.{col} {null_safe_equals} {right}.{col}" for col in columns)
+    return ' AND '.join(
+        f"({left}.{col} = {right}.{col} OR ({left}.{col} IS NULL AND {right}.{col} IS NULL))"
+        for col in columns
+    )
+
+def script_batches(sql: str) -> List[str]:
+    """The GO-separated batches of a T-SQL script, leaving out USE and comment-only batches."""
+    batches = []
+    for batch in re.split(r'^\s*GO\s*$', sql, flags=re.M | re.I):
+        code = re.sub(r'--.*$', '', batch, flags=re.M).strip()
+        if code and not re.fullmatch(r'USE\s+\w+;?', code, flags=re.I):
+            batches.append(batch.strip())
+    return batches
+
+def schema_statements(rewrites, sql: str) -> List[str]:
+    """CREATE TABLE/INDEX and ALTER TABLE ADD statements of a T-SQL script, with ``(pattern, replacement)`` rewrites.
+
+    A replacement may be a function of the match and the table name (None
+    for indexes).
+    """
+    statements = []
+    for batch in script_batches(sql):
+        match = re.search(
+            r'(?:CREATE\s+TABLE\s+([\w.]+)|CREATE\s+(?:UNIQUE\s+)?INDEX\b'
+            r'|ALTER\s+TABLE\s+([\w.]+)\s+ADD\s+(?!CONSTRAINT\b)).*',
+            batch, flags=re.S | re.I
+        )
+        if match is None:
+            continue
+        table_name = match.group(1) or match.group(2)
+        statement = match.group(0).strip().rstrip(';')
+        for pattern, replacement in rewrites:
+            if callable(replacement):
+                statement = pattern.sub(lambda m: replacement(m, table_name), statement)
+            else:
+                statement = pattern.sub(replacement, statement)
+        statements.append(statement)
+    return statements
+
+# T-SQL rewrites shared by the local engines
+_IDENTITY = re.compile(r'\bINT\s+IDENTITY\(1,\s*1\)\s+PRIMARY KEY', re.I)
+# Local engines cannot (SQLite across attached databases) or should not (DuckDB
+# rejects updates of referenced rows) enforce the foreign keys
+_FOREIGN_KEY = re.compile(r'\s+FOREIGN KEY REFERENCES\s+[\w.]+\(\w+\)', re.I)
+_SUSER_SNAME = re.compile(r'\bSUSER_SNAME\(\)', re.I)
+_MAX_LENGTH = re.compile(r'\(MAX\)', re.I)
+_GETDATE = re.compile(r'\bGETDATE\(\)', re.I)
+_INDEX = re.compile(r'^CREATE\s+(UNIQUE\s+)?INDEX\s+(\w+)\s+ON\s+(\w+)\.(\w+)', re.I)
+
+class DWBackend:
+    """SQL dialect and bulk-load path of one warehouse engine.
+
+    The base class speaks SQL Server's T-SQL; other engines override the
+    statement builders. ``errors`` are the driver exceptions the loader
+    handles.
+    """
+
+    name = 'base'
+    errors = ()
+    # Current timestamp expression of the SQL dialect
+    NOW_SQL = 'GETDATE()'
+    # Whether other connections can stage rows that the loading transaction then reads
+    supports_parallel_load = False
+    # Schema of the tables that parallel loads stage partitions in
+    STAGE_SCHEMA = 'fact'
+    # NULL-safe equality operator that can use an index, if the dialect has one
+    NULL_SAFE_EQUALS = None
+
+    def connect(self):
+        """Open and return a DB-API connection with autocommit off."""
+        raise NotImplementedError
+
+    def match_columns(self, columns, left: str = 't', right: str = 's') -> str:
+        return match_columns(columns, left, right, self.NULL_SAFE_EQUALS)
+
+    def script_statements(self, sql: str) -> List[str]:
+        """Statements that run a T-SQL script from Scripts/ on this engine."""
+        return script_batches(sql)
+
+    def table_exists(self, cursor, table: str) -> bool:
+        cursor.execute("SELECT OBJECT_ID(?, 'U')", (table,))
+        return cursor.fetchone()[0] is not None
+
+    def column_exists(self, cursor, table: str, column: str) -> bool:
+        cursor.execute("SELECT COL_LENGTH(?, ?)", (table, column))
+        return cursor.fetchone()[0] is not None
+
+    def bulk_insert(self, connection, table: str, columns: List[str], data: pd.DataFrame) -> int:
+        """Append the given columns of ``data`` to ``table``; return the row count."""
+        rows = to_rows(data[columns])
+        if rows:
+            cursor = connection.cursor()
+            cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})",
+                rows
+            )
+        return len(rows)
+
+    def create_stage_table(self, cursor, source: str, cols_str: str) -> str:
+        """Create an empty #temp table with the given columns of ``source`` (e.g. 'dim.Author'); return its name."""
+        stage_table = f"#Stage{source.split('.')[-1]}"
+        cursor.execute(f"IF OBJECT_ID('tempdb..{stage_table}') IS NOT NULL DROP TABLE {stage_table}")
+        cursor.execute(f"SELECT TOP 0 {cols_str} INTO {stage_table} FROM {source}")
+        return stage_table
+
+    def drop_table_sql(self, table: str) -> str:
+        return f"IF OBJECT_ID('{table}') IS NOT NULL DROP TABLE {table}"
+
+    def create_table_like(self, cursor, table: str, source: str, columns: List[str]):
+        """(Re)create a permanent, empty table with the given columns of ``source``."""
+        cursor.execute(self.drop_table_sql(table))
+        cursor.execute(f"SELECT TOP 0 {', '.join(columns)} INTO {table} FROM {source}")
+
+    def update_from_stage_sql(self, table_name: str, stage_table: str, key_columns, update_columns) -> str:
+        """UPDATE of the dimension rows whose attributes differ from the staged rows.
+
+        EXCEPT compares NULLs as equal, so a change between NULL and a value
+        counts as a difference.
+        """
+        set_str = ', '.join(f"t.{col} = s.{col}" for col in update_columns)
+        return f"""
+            UPDATE t SET {set_str}, t.ModifiedDate = {self.NOW_SQL}
+            FROM dim.{table_name} t
+            JOIN {stage_table} s ON {self.match_columns(key_columns)}
+            WHERE EXISTS (
+                SELECT {', '.join(f's.{col}' for col in update_columns)}
+                EXCEPT
+                SELECT {', '.join(f't.{col}' for col in update_columns)}
+            )
+        """
+
+    def insert_from_stage_sql(self, table_name: str, stage_table: str, columns, key_columns,
+                              output_columns=None) -> str:
+        """INSERT of the staged rows with unseen business keys, optionally returning ``output_columns``."""
+        output_str = ''
+        if output_columns:
+            output_str = 'OUTPUT ' + ', '.join(f'INSERTED.{col}' for col in output_columns)
+        return f"""
+            INSERT INTO dim.{table_name} ({', '.join(columns)})
+            {output_str}
+            SELECT {', '.join(f's.{col}' for col in columns)}
+            FROM {stage_table} s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM dim.{table_name} t WHERE {self.match_columns(key_columns)}
+            )
+        """
+
+    def delete_from_stage_sql(self, table: str, stage_table: str, key_columns) -> str:
+        """DELETE of the rows of ``table`` whose keys are in the staged rows."""
+        return f"""
+            DELETE t FROM {table} t
+            JOIN {stage_table} s ON {self.match_columns(key_columns)}
+        """
+
+    def start_batch_sql(self) -> str:
+        """INSERT of a new audit.ETLBatch row that returns its BatchID."""
+        return """
+            INSERT INTO audit.ETLBatch (SourceSystem)
+            OUTPUT INSERTED.BatchID
+            VALUES (?)
+        """
+
+class MSSQLBackend(DWBackend):
+    """SQL Server through pyodbc.
+
+    Uses Windows authentication unless a username is given. ``driver`` is
+    the ODBC driver name, e.g. 'ODBC Driver 18 for SQL Server' on Linux.
+    Bulk inserts use pyodbc's ``fast_executemany`` array binding.
+    """
+
+    name = 'mssql'
+    errors = (pyodbc.Error,) if pyodbc is not None else ()
+    supports_parallel_load = True
+
+    def __init__(self, server: str, database: str, driver: str = 'SQL Server',
+                 username: Optional[str] = None, password: Optional[str] = None, options: str = ''):
+        self.server = server
+        self.database = database
+        auth = f'UID={username};PWD={password};' if username else 'Trusted_Connection=yes;'
+        self.connection_string = (
+            f'DRIVER={{{driver}}};SERVER={server};'
+            f'DATABASE={database};{auth}{options}'
+        )
+
+    def connect(self):
+        if pyodbc is None:
+            raise ImportError("pyodbc is required for the SQL Server backend")
+        connection = pyodbc.connect(self.connection_string)
+        connection.autocommit = False
+        return connection
+
+    def bulk_insert(self, connection, table: str, columns: List[str], data: pd.DataFrame) -> int:
+        rows = to_rows(data[columns])
+        if rows:
+            cursor = connection.cursor()
+            cursor.fast_executemany = True
+            cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})",
+                rows
+            )
+        return len(rows)
+
+class LocalBackend(DWBackend):
+    """Dialect shared by the embedded engines: temp stage tables, UPDATE ... FROM and RETURNING."""
+
+    REWRITES = []
+
+    def script_statements(self, sql: str) -> List[str]:
+        """The script's CREATE TABLE/INDEX and ALTER TABLE ADD statements, rewritten for the engine.
+
+        Tables and indexes that exist are skipped. Other T-SQL, such as views
+        and partitioning, is left out.
+        """
+        return [
+            statement.replace('CREATE TABLE', 'CREATE TABLE IF NOT EXISTS', 1)
+            for statement in schema_statements(self.REWRITES, sql)
+        ]
+
+    def create_stage_table(self, cursor, source: str, cols_str: str) -> str:
+        stage_table = f"Stage{source.split('.')[-1]}"
+        cursor.execute(f"DROP TABLE IF EXISTS temp.{stage_table}")
+        cursor.execute(f"CREATE TEMP TABLE {stage_table} AS SELECT {cols_str} FROM {source} WHERE 1 = 0")
+        return stage_table
+
+    def drop_table_sql(self, table: str) -> str:
+        return f"DROP TABLE IF EXISTS {table}"
+
+    def create_table_like(self, cursor, table: str, source: str, columns: List[str]):
+        cursor.execute(self.drop_table_sql(table))
+        cursor.execute(f"CREATE TABLE {table} AS SELECT {', '.join(columns)} FROM {source} WHERE 1 = 0")
+
+    def update_from_stage_sql(self, table_name: str, stage_table: str, key_columns, update_columns) -> str:
+        set_str = ', '.join(f"{col} = s.{col}" for col in update_columns)
+        return f"""
+            UPDATE dim.{table_name} AS t SET {set_str}, ModifiedDate = {self.NOW_SQL}
+            FROM {stage_table} s
+            WHERE {self.match_columns(key_columns)}
+            AND NOT ({self.match_columns(update_columns)})
+        """
+
+    def insert_from_stage_sql(self, table_name: str, stage_table: str, columns, key_columns,
+                              output_columns=None) -> str:
+        returning_str = f"RETURNING {', '.join(output_columns)}" if output_columns else ''
+        return f"""
+            INSERT INTO dim.{table_name} ({', '.join(columns)})
+            SELECT {', '.join(f's.{col}' for col in columns)}
+            FROM {stage_table} s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM dim.{table_name} t WHERE {self.match_columns(key_columns)}
+            )
+            {returning_str}
+        """
+
+    def delete_from_stage_sql(self, table: str, stage_table: str, key_columns) -> str:
+        return f"""
+            DELETE FROM {table} AS t
+            WHERE EXISTS (SELECT 1 FROM {stage_table} s WHERE {self.match_columns(key_columns)})
+        """
+
+    def start_batch_sql(self) -> str:
+        return "INSERT INTO audit.ETLBatch (SourceSystem) VALUES (?) RETURNING BatchID"
+
+class _SQLiteCursor(sqlite3.Cursor):
+    """sqlite3 cursor that accepts pyodbc's single-value parameter shorthand."""
+
+    def execute(self, sql, parameters=()):
+        if not isinstance(parameters, (tuple, list, dict)):
+            parameters = (parameters,)
+        return super().execute(sql, parameters)
+
+class _SQLiteConnection(sqlite3.Connection):
+    def cursor(self, factory=_SQLiteCursor):
+        return super().cursor(factory)
+
+class SQLiteBackend(LocalBackend):
+    """SQLite file or in-memory database with dim/fact/audit/agg (and stage) as attached databases.
+
+    ``database`` is ':memory:' or a file path; a file path gets one sibling
+    file per schema. Connecting applies pending schema migrations.
+    """
+
+    name = 'sqlite'
+    errors = (sqlite3.Error,)
+    NOW_SQL = "datetime('now', 'localtime')"
+    NULL_SAFE_EQUALS = 'IS'
+    # The loading transaction holds the fact file's write lock, so partitions
+    # are staged in a file of their own
+    STAGE_SCHEMA = 'stage'
+    REWRITES = [
+        (_IDENTITY, 'INTEGER PRIMARY KEY AUTOINCREMENT'),
+        (_FOREIGN_KEY, ''),
+        (_GETDATE, f"({NOW_SQL})"),
+        (_SUSER_SNAME, "'local'"),
+        (_MAX_LENGTH, ''),
+        # SQLite qualifies the index name, not the table, with the schema
+        (_INDEX, lambda m, table_name: (
+            f"CREATE {m.group(1) or ''}INDEX IF NOT EXISTS {m.group(3)}.{m.group(2)} ON {m.group(4)}"
+        ))
+    ]
+
+    def __init__(self, database: str = ':memory:'):
+        self.database = database
+
+    @property
+    def supports_parallel_load(self) -> bool:
+        # Every in-memory connection is a separate database. Writers to a file
+        # serialize on its lock, but the staging schema is a separate file
+        return self.database != ':memory:'
+
+    def _schema_path(self, schema: str) -> str:
+        if self.database == ':memory:':
+            return ':memory:'
+        root, ext = os.path.splitext(self.database)
+        return f'{root}.{schema}{ext or ".sqlite"}'
+
+    def connect(self):
+        # Pooled connections are used by one thread at a time, not always their creator
+        connection = sqlite3.connect(
+            self.database, timeout=30, check_same_thread=False, factory=_SQLiteConnection
+        )
+        cursor = connection.cursor()
+        for schema in [*SCHEMAS, self.STAGE_SCHEMA]:
+            cursor.execute(f"ATTACH DATABASE ? AS {schema}", (self._schema_path(schema),))
+        migrate(connection, self)
+        return connection
+
+    def table_exists(self, cursor, table: str) -> bool:
+        schema, name = table.split('.')
+        cursor.execute(f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?", (name,))
+        return cursor.fetchone() is not None
+
+    def column_exists(self, cursor, table: str, column: str) -> bool:
+        schema, name = table.split('.')
+        cursor.execute("SELECT 1 FROM pragma_table_info(?, ?) WHERE name = ?", (name, schema, column))
+        return cursor.fetchone() is not None
+
+class _DuckDBCursor:
+    """DB-API style cursor over the one DuckDB connection.
+
+    ``duckdb`` cursors are separate connections with their own transaction,
+    so every cursor here shares the parent connection instead. DML without
+    RETURNING reports its row count through ``rowcount``.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+        self.rowcount = -1
+
+    def execute(self, sql, parameters=()):
+        if not isinstance(parameters, (tuple, list, dict)):
+            parameters = (parameters,)
+        self._connection.execute(sql, parameters or None)
+        statement = sql.lstrip().upper()
+        if statement.startswith(('INSERT', 'UPDATE', 'DELETE')) and 'RETURNING' not in statement:
+            self.rowcount = self._connection.fetchone()[0]
+        else:
+            self.rowcount = -1
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._connection.executemany(sql, seq_of_parameters)
+        self.rowcount = -1
+
+    def fetchone(self):
+        return self._connection.fetchone()
+
+    def fetchall(self):
+        return self._connection.fetchall()
+
+class _DuckDBConnection:
+    """DuckDB connection with pyodbc-style implicit transactions."""
+
+    def __init__(self, connection):
+        self.raw = connection
+        self.raw.begin()
+
+    def cursor(self):
+        return _DuckDBCursor(self.raw)
+
+    def commit(self):
+        self.raw.commit()
+        self.raw.begin()
+
+    def rollback(self):
+        self.raw.rollback()
+        self.raw.begin()
+
+    def close(self):
+        self.raw.close()
+
+class DuckDBBackend(LocalBackend):
+    """DuckDB file or in-memory database with native dim/fact/audit/agg schemas.
+
+    Connecting applies pending schema migrations, with a sequence behind
+    each IDENTITY column. Bulk inserts append a registered DataFrame in one
+    statement instead of binding rows. Fact loads are not partitioned: a
+    transaction's snapshot cannot see staging tables that other connections
+    commit later, and DuckDB already parallelizes a single INSERT.
+    """
+
+    name = 'duckdb'
+    errors = (duckdb.Error,) if duckdb is not None else ()
+    NOW_SQL = 'current_localtimestamp()'
+    NULL_SAFE_EQUALS = 'IS NOT DISTINCT FROM'
+    REWRITES = [
+        (_IDENTITY, lambda m, table_name: (
+            f"INTEGER PRIMARY KEY DEFAULT nextval('{table_name.replace('.', '_')}_seq')"
+        )),
+        (_FOREIGN_KEY, ''),
+        (_GETDATE, NOW_SQL),
+        (_SUSER_SNAME, "'local'"),
+        (_MAX_LENGTH, ''),
+        # BIT is a bit string in DuckDB
+        (re.compile(r'\bBIT\b', re.I), 'BOOLEAN'),
+        # No filtered indexes; NULLs never collide in a unique index anyway
+        (_INDEX, lambda m, table_name: (
+            f"CREATE {m.group(1) or ''}INDEX IF NOT EXISTS {m.group(2)} ON {m.group(3)}.{m.group(4)}"
+        )),
+        (re.compile(r'\)\s+WHERE\s+.*$', re.S | re.I), ')')
+    ]
+
+    def __init__(self, database: str = ':memory:'):
+        self.database = database
+
+    def connect(self):
+        if duckdb is None:
+            raise ImportError("duckdb is required for the DuckDB backend")
+        raw = duckdb.connect(self.database)
+        for schema in SCHEMAS:
+            raw.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        connection = _DuckDBConnection(raw)
+        migrate(connection, self)
+        return connection
+
+    def script_statements(self, sql: str) -> List[str]:
+        statements = []
+        for statement in super().script_statements(sql):
+            sequence = re.search(r"nextval\('(\w+)'\)", statement)
+            if sequence:
+                statements.append(f"CREATE SEQUENCE IF NOT EXISTS {sequence.group(1)}")
+            statements.append(statement)
+        return statements
+
+    def table_exists(self, cursor, table: str) -> bool:
+        schema, name = table.split('.')
+        cursor.execute(
+            "SELECT 1 FROM information_schema.tables WHERE table_schema = ? AND table_name = ?", (schema, name)
+        )
+        return cursor.fetchone() is not None
+
+    def column_exists(self, cursor, table: str, column: str) -> bool:
+        schema, name = table.split('.')
+        cursor.execute(
+            "SELECT 1 FROM information_schema.columns WHERE table_schema = ? AND table_name = ? AND column_name = ?",
+            (schema, name, column)
+        )
+        return cursor.fetchone() is not None
+
+    def bulk_insert(self, connection, table: str, columns: List[str], data: pd.DataFrame) -> int:
+        if data.empty:
+            return 0
+        view = f"bulk_{re.sub(r'[^0-9A-Za-z]', '_', table)}"
+        connection.raw.register(view, data[columns])
+        try:
+            connection.raw.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) SELECT {', '.join(columns)} FROM {view}"
+            )
+        finally:
+            connection.raw.unregister(view)
+        return len(data)
+
+DW_BACKENDS = {
+    'mssql': MSSQLBackend,
+    'sqlite': SQLiteBackend,
+    'duckdb': DuckDBBackend
+}
+
+# Backend used by DWConnection when none is passed; change it with configure_backend()
+_backend_name = 'mssql'
+_backend_options = {}
+
+def configure_backend(name: str = 'mssql', **options):
+    """Select the default warehouse backend and its options (e.g. driver, username)."""
+    global _backend_name, _backend_options
+    if name not in DW_BACKENDS:
+        raise ValueError(f"Unknown DW backend: {name}")
+    _backend_name = name
+    _backend_options = options
+
+def create_backend(server: str, database: str, name: Optional[str] = None, **options) -> DWBackend:
+    """Build a backend; local engines take ``database`` as their file path."""
+    name = name or _backend_name
+    options = options or _backend_options
+    if name == 'mssql':
+        return MSSQLBackend(server, database, **options)
+    if name not in DW_BACKENDS:
+        raise ValueError(f"Unknown DW backend: {name}")
+    return DW_BACKENDS[name](database, **options)
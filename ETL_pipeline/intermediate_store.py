@@ -0,0 +1,118 @@
+import os
+import logging
+from datetime import date
+from typing import Dict, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+from ETL_pipeline.routes import canonical_routes, route_stops
+
+logger = logging.getLogger('IntermediateStore')
+
+# Low-cardinality text columns stored dictionary-encoded
+DICTIONARY_COLUMNS = [
+    'Route', 'SeatType', 'TypeOfTraveller', 'RecommendedService', 'AuthorLocation',
+    'RouteName', 'AirportName', 'AirportCode', 'City'
+]
+
+DATE_COLUMNS = ['ReviewDate', 'DateFlown', 'CreatedDate']
+
+STAR_RATING_COLUMNS = [
+    'SeatComfort', 'CabinStaffService', 'FoodBeverages',
+    'InflightEntertainment', 'GroundService', 'ValueForMoney'
+]
+
+def partition_path(output_folder: str, run_date: Optional[str] = None) -> str:
+    """Folder of one run's artifacts, partitioned by run date."""
+    return os.path.join(output_folder, f"run_date={run_date or date.today().isoformat()}")
+
+def latest_run_date(output_folder: str) -> Optional[str]:
+    """Most recent run date that has saved artifacts, or None."""
+    if not os.path.isdir(output_folder):
+        return None
+    run_dates = sorted(
+        name.split('=', 1)[1] for name in os.listdir(output_folder)
+        if name.startswith('run_date=') and os.path.isdir(os.path.join(output_folder, name))
+    )
+    return run_dates[-1] if run_dates else None
+
+def write_parquet(data_dict: Dict[str, pd.DataFrame], output_folder: str = 'output',
+                  run_date: Optional[str] = None) -> str:
+    """Write each frame as a zstd-compressed Parquet file in the run's partition."""
+    if pq is None:
+        raise ImportError("pyarrow is required for the Parquet intermediate format")
+
+    folder = partition_path(output_folder, run_date)
+    os.makedirs(folder, exist_ok=True)
+    for key, df in data_dict.items():
+        file_path = os.path.join(folder, f'{key}.parquet')
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(
+            table, file_path,
+            compression='zstd',
+            use_dictionary=[col for col in DICTIONARY_COLUMNS if col in df.columns]
+        )
+        logger.info(f"Saved {len(df)} records to {file_path}")
+    return folder
+
+def _restore_csv_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Re-apply the cleaned dtypes that a CSV round trip loses."""
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    for col in STAR_RATING_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('int8')
+    if 'Rating' in df.columns:
+        df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce').fillna(0).astype('float32')
+    if 'RecommendedService' in df.columns:
+        df['RecommendedService'] = df['RecommendedService'].astype('category')
+    if 'IsVerified' in df.columns:
+        df['IsVerified'] = df['IsVerified'].astype('boolean')
+    return df
+
+def read_intermediate_data(output_folder: str = 'output', run_date: Optional[str] = None,
+                           file_format: str = 'parquet') -> Dict[str, pd.DataFrame]:
+    """Read saved artifacts back into the dict that prepare_dw_load_data returns.
+
+    Parquet artifacts are read from the given (default: latest) run-date
+    partition. CSV artifacts are read from ``output_folder`` itself.
+    """
+    if file_format == 'parquet':
+        if pq is None:
+            raise ImportError("pyarrow is required for the Parquet intermediate format")
+        run_date = run_date or latest_run_date(output_folder)
+        if run_date is None:
+            raise FileNotFoundError(f"No saved runs found in {output_folder}")
+        folder = partition_path(output_folder, run_date)
+    elif file_format == 'csv':
+        folder = output_folder
+    else:
+        raise ValueError(f"Unknown intermediate format: {file_format}")
+
+    data_dict = {}
+    for key in ('author_dim', 'flight_dim', 'route_dim', 'review_fact'):
+        file_path = os.path.join(folder, f'{key}.{file_format}')
+        if key == 'route_dim' and not os.path.exists(file_path):
+            continue
+        if file_format == 'parquet':
+            data_dict[key] = pq.read_table(file_path).to_pandas()
+        else:
+            data_dict[key] = _restore_csv_dtypes(pd.read_csv(file_path))
+        logger.info(f"Read {len(data_dict[key])} records from {file_path}")
+
+    if 'route_dim' not in data_dict:
+        # Artifacts saved before routes were parsed still hold the scraped route text
+        for key in ('flight_dim', 'review_fact'):
+            data_dict[key]['Route'] = canonical_routes(data_dict[key]['Route'])
+        data_dict['flight_dim'] = data_dict['flight_dim'].drop_duplicates(
+            subset=['SeatType', 'Route', 'TypeOfTraveller']
+        )
+        data_dict['route_dim'] = route_stops(data_dict['flight_dim']['Route'])
+    return data_dict
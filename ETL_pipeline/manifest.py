@@ -0,0 +1,132 @@
+import json
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from ETL_pipeline.Extract import configure_cache, fetch_pages
+from ETL_pipeline.Transform import clean_review_data, prepare_dw_load_data
+from ETL_pipeline.page_cache import PageCache
+from ETL_pipeline.watermark import Watermark
+
+logger = logging.getLogger('Manifest')
+
+WATERMARK_DIR = os.path.join('output', 'watermarks')
+
+# Defaults for manifest keys that may be omitted; for sqlite and duckdb
+# ``database`` is the file name without its .sqlite/.duckdb extension
+MANIFEST_DEFAULTS = {
+    'server': 'localhost',
+    'database': 'BritishAirwaysDW',
+    'reviews_per_page': 100,
+    'pages': 7,
+    'max_processes': None,
+    'threads_per_airline': 2,
+    'requests_per_second': 2.0,
+    'incremental': False,
+    'cache_dir': None,
+    'replay': False
+}
+
+def load_manifest(path: str) -> dict:
+    """Read a JSON job manifest and fill in defaults.
+
+    Example::
+
+        {
+            "database": "AirlineReviewsDW",
+            "requests_per_second": 2.0,
+            "airlines": [
+                {"slug": "ethiopian-airlines", "pages": 7},
+                {"slug": "british-airways", "pages": 3}
+            ]
+        }
+    """
+    with open(path, encoding='utf-8') as f:
+        manifest = {**MANIFEST_DEFAULTS, **json.load(f)}
+    if not manifest.get('airlines'):
+        raise ValueError(f"Manifest {path} lists no airlines")
+    for airline in manifest['airlines']:
+        airline.setdefault('pages', manifest['pages'])
+    return manifest
+
+def watermark_path(slug: str) -> str:
+    return os.path.join(WATERMARK_DIR, f'{slug}.json')
+
+def extract_and_clean(job: dict) -> Tuple[str, pd.DataFrame, Optional[Watermark]]:
+    """Scrape and clean one airline. Runs in a worker process.
+
+    Returns the slug, the cleaned reviews tagged with an Airline column, and
+    the watermark to save once the airline's facts are loaded (or None).
+    """
+    # A forked worker inherits the parent's cache settings; the job's replace them
+    configure_cache(PageCache(job['cache_dir']) if job['cache_dir'] else None, replay=job['replay'])
+
+    # Replays re-process the cached pages in full rather than only new reviews
+    incremental = job['incremental'] and not job['replay']
+    watermark = Watermark.load(watermark_path(job['slug'])) if incremental else None
+    failed_pages = []
+    reviews = fetch_pages(
+        job['pages'], job['reviews_per_page'],
+        max_workers=job['threads'], rate=job['rate'],
+        watermark=watermark, airline=job['slug'], failed_pages=failed_pages
+    )
+    if failed_pages:
+        logger.warning(f"{job['slug']}: pages {failed_pages} could not be fetched; "
+                       "its watermark is left as it was so the next run fetches them again")
+    if not reviews:
+        return job['slug'], pd.DataFrame(), None
+
+    next_watermark = None
+    if watermark is not None and not failed_pages:
+        next_watermark = Watermark(watermark.review_date, watermark.identities)
+        next_watermark.advance(reviews)
+
+    cleaned = clean_review_data(reviews.to_frame())
+    cleaned['Airline'] = job['slug']
+    return job['slug'], cleaned, next_watermark
+
+def run_manifest(manifest: dict, load: Callable[[str, Dict[str, pd.DataFrame]], bool]) -> Dict[str, bool]:
+    """Scrape and clean all airlines in parallel, then load them one by one.
+
+    Extraction and cleaning fan out over a process pool. The site-wide
+    ``requests_per_second`` budget is split across the worker processes.
+    Each airline's prepared frames are passed to ``load(slug, dw_data)``,
+    which runs the same load stages as a single-airline run and returns
+    its success; an airline's watermark is only saved once it loaded.
+    Returns the success of each airline's load.
+    """
+    airlines = manifest['airlines']
+    max_processes = manifest['max_processes'] or min(len(airlines), os.cpu_count() or 1)
+    rate_per_process = manifest['requests_per_second'] / max_processes
+    jobs = [{
+        'slug': airline['slug'],
+        'pages': airline['pages'],
+        'reviews_per_page': manifest['reviews_per_page'],
+        'threads': manifest['threads_per_airline'],
+        'rate': rate_per_process,
+        'incremental': manifest['incremental'],
+        'cache_dir': manifest['cache_dir'],
+        'replay': manifest['replay']
+    } for airline in airlines]
+
+    logger.info(f"Extracting {len(jobs)} airlines with {max_processes} processes")
+    results = {airline['slug']: False for airline in airlines}
+    with ProcessPoolExecutor(max_workers=max_processes) as executor:
+        extracted = list(executor.map(extract_and_clean, jobs))
+
+    if all(cleaned.empty for _, cleaned, _ in extracted):
+        logger.error("No reviews were scraped for any airline")
+        return results
+
+    for slug, cleaned, next_watermark in extracted:
+        logger.info(f"Extracted {len(cleaned)} cleaned reviews for {slug}")
+        if cleaned.empty:
+            continue
+        results[slug] = load(slug, prepare_dw_load_data(cleaned))
+        if results[slug] and next_watermark is not None:
+            next_watermark.save(watermark_path(slug))
+
+    return results
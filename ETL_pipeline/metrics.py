@@ -0,0 +1,95 @@
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional
+
+logger = logging.getLogger('Metrics')
+
+class PipelineMetrics:
+    """Per-stage timings, row counts and throughput for one pipeline run.
+
+    Every stage is a ``with metrics.stage(...) as record`` block. The block
+    fills in ``record['rows_inserted']`` / ``record['rows_updated']`` (or just
+    ``record['rows']`` for non-load stages). With ``trace_memory`` each stage
+    also records its tracemalloc peak. With ``profile`` each stage is run under
+    cProfile and its stats are dumped next to the JSON report.
+    """
+
+    def __init__(self, report_dir: str = os.path.join('output', 'metrics'),
+                 profile: bool = False, trace_memory: bool = False):
+        self.run_id = datetime.now().strftime('%Y%m%dT%H%M%S')
+        self.report_dir = report_dir
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.records: List[dict] = []
+
+    @contextmanager
+    def stage(self, name: str, table: Optional[str] = None, load_type: str = 'Full'):
+        """Time a pipeline stage; failures are recorded and re-raised."""
+        record = {
+            'stage': name,
+            'table': table or f'pipeline.{name}',
+            'load_type': load_type,
+            'start_time': datetime.now(),
+            'end_time': None,
+            'duration_s': None,
+            'rows': 0,
+            'rows_inserted': None,
+            'rows_updated': None,
+            'rows_per_s': None,
+            'peak_memory_mb': None,
+            'status': 'Running',
+            'error': None
+        }
+        self.records.append(record)
+
+        profiler = cProfile.Profile() if self.profile else None
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+            record['status'] = 'Completed'
+        except Exception as e:
+            record['status'] = 'Failed'
+            record['error'] = str(e)
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                os.makedirs(self.report_dir, exist_ok=True)
+                profiler.dump_stats(os.path.join(self.report_dir, f'{self.run_id}_{name}.prof'))
+            duration = time.perf_counter() - started
+            record['end_time'] = datetime.now()
+            record['duration_s'] = round(duration, 4)
+            rows = record['rows_inserted'] if record['rows_inserted'] is not None else record['rows']
+            record['rows'] = rows
+            record['rows_per_s'] = round(rows / duration, 1) if duration > 0 else None
+            if self.trace_memory:
+                record['peak_memory_mb'] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+            logger.info(
+                f"Stage {name} {record['status'].lower()} in {duration:.2f}s "
+                f"({rows} rows, {record['rows_per_s']} rows/s)"
+            )
+
+    def write_json(self, path: Optional[str] = None) -> str:
+        """Write the run's stage records as a JSON report."""
+        path = path or os.path.join(self.report_dir, f'run_{self.run_id}.json')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'run_id': self.run_id, 'stages': self.records}, f, indent=2, default=str)
+        logger.info(f"Wrote metrics report to {path}")
+        return path
+
+    def write_to_dw(self, dw, batch_id: int):
+        """Write the stage records to audit.DataLoadLog under the given batch."""
+        dw.log_data_loads(batch_id, self.records)
@@ -0,0 +1,112 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import logging
+from datetime import date
+from typing import Optional
+
+logger = logging.getLogger('PageCache')
+
+CACHE_DIR = os.path.join('cache', 'pages')
+
+class PageNotCached(KeyError):
+    """Raised in replay mode when a page was never fetched into the cache."""
+
+class PageCache:
+    """On-disk cache of raw HTML pages, keyed by URL and fetch date.
+
+    Each URL gets a directory named after its SHA-256 hash holding one
+    gzip-compressed snapshot per fetch date plus a small JSON sidecar with the
+    URL and HTTP validators (ETag/Last-Modified). Snapshots older than
+    ``ttl_days`` are evicted first, then the oldest ones until the cache fits
+    in ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl_days: int = 30, max_bytes: int = 500 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl_days = ttl_days
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _url_dir(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+    def put(self, url: str, text: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, fetch_date: Optional[str] = None):
+        """Store a fetched page under today's (or the given) fetch date."""
+        fetch_date = fetch_date or date.today().isoformat()
+        url_dir = self._url_dir(url)
+        meta = {'url': url, 'fetch_date': fetch_date, 'etag': etag, 'last_modified': last_modified}
+        with self._lock:
+            os.makedirs(url_dir, exist_ok=True)
+            with gzip.open(os.path.join(url_dir, f'{fetch_date}.html.gz'), 'wt', encoding='utf-8') as f:
+                f.write(text)
+            with open(os.path.join(url_dir, f'{fetch_date}.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+
+    def get(self, url: str, fetch_date: Optional[str] = None) -> Optional[dict]:
+        """Return the latest (or given date's) snapshot of a page, or None.
+
+        The result holds the page ``text`` plus its ``url``, ``fetch_date``,
+        ``etag`` and ``last_modified``.
+        """
+        url_dir = self._url_dir(url)
+        with self._lock:
+            if fetch_date is None:
+                if not os.path.isdir(url_dir):
+                    return None
+                dates = sorted(name[:-len('.html.gz')] for name in os.listdir(url_dir) if name.endswith('.html.gz'))
+                if not dates:
+                    return None
+                fetch_date = dates[-1]
+            page_path = os.path.join(url_dir, f'{fetch_date}.html.gz')
+            if not os.path.exists(page_path):
+                return None
+            with gzip.open(page_path, 'rt', encoding='utf-8') as f:
+                text = f.read()
+            meta_path = os.path.join(url_dir, f'{fetch_date}.json')
+            meta = {'url': url, 'fetch_date': fetch_date, 'etag': None, 'last_modified': None}
+            if os.path.exists(meta_path):
+                with open(meta_path, encoding='utf-8') as f:
+                    meta.update(json.load(f))
+        meta['text'] = text
+        return meta
+
+    def evict(self) -> int:
+        """Remove expired snapshots, then the oldest ones until under max_bytes."""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+
+        with self._lock:
+            snapshots = []
+            for url_hash in os.listdir(self.cache_dir):
+                url_dir = os.path.join(self.cache_dir, url_hash)
+                for name in os.listdir(url_dir):
+                    if name.endswith('.html.gz'):
+                        path = os.path.join(url_dir, name)
+                        stat = os.stat(path)
+                        snapshots.append((stat.st_mtime, stat.st_size, path))
+            snapshots.sort()
+
+            cutoff = time.time() - self.ttl_days * 86400
+            total_bytes = sum(size for _, size, _ in snapshots)
+            removed = 0
+            for mtime, size, path in snapshots:
+                if mtime >= cutoff and total_bytes <= self.max_bytes:
+                    break
+                os.remove(path)
+                meta_path = path[:-len('.html.gz')] + '.json'
+                if os.path.exists(meta_path):
+                    os.remove(meta_path)
+                url_dir = os.path.dirname(path)
+                if not os.listdir(url_dir):
+                    os.rmdir(url_dir)
+                total_bytes -= size
+                removed += 1
+
+        if removed:
+            logger.info(f"Evicted {removed} cached pages from {self.cache_dir}")
+        return removed
@@ -0,0 +1,152 @@
+from array import array
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+STAR_RATING_COLUMNS = [
+    'SeatComfort', 'CabinStaffService', 'FoodBeverages',
+    'InflightEntertainment', 'GroundService', 'ValueForMoney'
+]
+
+# Scraped review fields, in the order parsers pass them to ReviewBuffer.append
+REVIEW_COLUMNS = [
+    'AuthorName', 'AuthorLocation', 'ReviewDate', 'ReviewTitle', 'ReviewText',
+    'TypeOfTraveller', 'SeatType', 'Route', 'DateFlown', 'Rating',
+    *STAR_RATING_COLUMNS, 'RecommendedService'
+]
+
+# Low-cardinality text columns kept as codes into a table of distinct values
+CATEGORY_COLUMNS = ['AuthorLocation', 'TypeOfTraveller', 'SeatType', 'Route', 'RecommendedService']
+
+# Column -> array typecode of the numeric columns
+NUMERIC_COLUMNS = {'Rating': 'f', **dict.fromkeys(STAR_RATING_COLUMNS, 'b')}
+
+class ReviewBuffer:
+    """Columnar store of scraped reviews.
+
+    Free-text fields are kept in one list per column, ratings in typed
+    arrays (int8 stars, float32 rating) and the category columns as int32
+    codes into a table of their distinct values, so each location, route or
+    seat type string is held once however many reviews share it. ``to_frame`` and
+    ``to_arrow`` build their columns from these directly.
+
+    Iterating yields one dict per review, for callers that work on records.
+    """
+
+    __slots__ = ('_columns', '_categories', '_codes')
+
+    def __init__(self):
+        self._columns = {
+            col: array(NUMERIC_COLUMNS[col]) if col in NUMERIC_COLUMNS else
+            array('i') if col in CATEGORY_COLUMNS else []
+            for col in REVIEW_COLUMNS
+        }
+        self._categories = {col: [] for col in CATEGORY_COLUMNS}
+        self._codes = {col: {} for col in CATEGORY_COLUMNS}
+
+    def _code(self, col: str, value) -> int:
+        if value is None:
+            return -1
+        codes = self._codes[col]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._categories[col])
+            self._categories[col].append(value)
+        return code
+
+    def append(self, review: Sequence):
+        """Add one review given as a sequence of values in REVIEW_COLUMNS order."""
+        for col, value in zip(REVIEW_COLUMNS, review):
+            if col in self._codes:
+                value = self._code(col, value)
+            self._columns[col].append(value)
+
+    def extend(self, other: 'ReviewBuffer'):
+        """Append all reviews of another buffer, re-coding its category columns."""
+        for col in REVIEW_COLUMNS:
+            values = other._columns[col]
+            if col in self._codes:
+                mapping = [self._code(col, value) for value in other._categories[col]]
+                values = array('i', (mapping[code] if code >= 0 else -1 for code in values))
+            self._columns[col].extend(values)
+
+    def select(self, keep: Iterable[bool]) -> 'ReviewBuffer':
+        """New buffer with the reviews whose ``keep`` flag is true."""
+        return self._take([i for i, flag in enumerate(keep) if flag])
+
+    def __getitem__(self, index: slice) -> 'ReviewBuffer':
+        """New buffer with a slice of the reviews."""
+        return self._take(range(len(self))[index])
+
+    def _take(self, positions: Sequence[int]) -> 'ReviewBuffer':
+        taken = ReviewBuffer()
+        for col in REVIEW_COLUMNS:
+            values = self._columns[col]
+            if col in self._codes:
+                taken._columns[col].extend(
+                    taken._code(col, self._categories[col][values[i]]) if values[i] >= 0 else -1
+                    for i in positions
+                )
+            else:
+                taken._columns[col].extend(values[i] for i in positions)
+        return taken
+
+    def __len__(self) -> int:
+        return len(self._columns['AuthorName'])
+
+    def __iter__(self) -> Iterator[dict]:
+        decoded = {
+            col: [self._categories[col][code] if code >= 0 else None for code in self._columns[col]]
+            if col in self._codes else self._columns[col]
+            for col in REVIEW_COLUMNS
+        }
+        for values in zip(*decoded.values()):
+            yield dict(zip(REVIEW_COLUMNS, values))
+
+    def _category_codes(self, col: str) -> np.ndarray:
+        return np.frombuffer(self._columns[col], dtype=np.int32).copy()
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame of the reviews, with categorical dtypes for the category columns."""
+        data = {}
+        for col in REVIEW_COLUMNS:
+            values = self._columns[col]
+            if col in self._codes:
+                data[col] = pd.Categorical.from_codes(self._category_codes(col), categories=self._categories[col])
+            elif col in NUMERIC_COLUMNS:
+                data[col] = np.frombuffer(values, dtype=np.dtype(values.typecode)).copy()
+            else:
+                data[col] = values
+        return pd.DataFrame(data, columns=REVIEW_COLUMNS)
+
+    def to_arrow(self) -> 'pa.Table':
+        """Arrow table of the reviews, with dictionary-encoded category columns."""
+        if pa is None:
+            raise ImportError("pyarrow is required to build an Arrow table")
+        arrays = []
+        for col in REVIEW_COLUMNS:
+            values = self._columns[col]
+            if col in self._codes:
+                codes = self._category_codes(col)
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    pa.array(codes, mask=codes < 0), pa.array(self._categories[col], type=pa.string())
+                ))
+            elif col in NUMERIC_COLUMNS:
+                arrays.append(pa.array(np.frombuffer(values, dtype=np.dtype(values.typecode))))
+            else:
+                arrays.append(pa.array(values, type=pa.string()))
+        return pa.Table.from_arrays(arrays, names=REVIEW_COLUMNS)
+
+    def __getstate__(self):
+        return (self._columns, self._categories)
+
+    def __setstate__(self, state):
+        self._columns, self._categories = state
+        self._codes = {col: {value: code for code, value in enumerate(values)}
+                       for col, values in self._categories.items()}
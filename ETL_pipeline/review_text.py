@@ -0,0 +1,29 @@
+import gzip
+import hashlib
+
+import pandas as pd
+
+# fact.ReviewText stores NVARCHAR text, so hashes and compressed bytes are over
+# its UTF-16 form: they match SQL Server's HASHBYTES('SHA1', ...) and COMPRESS()
+TEXT_ENCODING = 'utf-16-le'
+
+def text_hashes(texts: pd.Series) -> pd.Series:
+    """SHA-1 hex of each review text, the key fact.ReviewText is deduplicated on."""
+    return pd.Series(
+        [hashlib.sha1(text.encode(TEXT_ENCODING)).hexdigest() for text in texts.astype(str)],
+        index=texts.index, dtype=object
+    )
+
+def compress_texts(texts: pd.Series) -> pd.Series:
+    """gzip each text; T-SQL reads it back with CAST(DECOMPRESS(...) AS NVARCHAR(MAX))."""
+    return pd.Series(
+        [gzip.compress(text.encode(TEXT_ENCODING)) for text in texts.astype(str)],
+        index=texts.index, dtype=object
+    )
+
+def decompress_texts(data: pd.Series) -> pd.Series:
+    """Inverse of compress_texts."""
+    return pd.Series(
+        [gzip.decompress(bytes(value)).decode(TEXT_ENCODING) for value in data],
+        index=data.index, dtype=object
+    )
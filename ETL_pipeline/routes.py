@@ -0,0 +1,424 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+# Canonical places routes are resolved to: (IATA code, name, city). Cities with
+# several airports also have their metropolitan area code, which a bare city
+# name resolves to
+AIRPORTS = [
+    # United Kingdom and Ireland
+    ('LON', 'London', 'London'),
+    ('LHR', 'London Heathrow', 'London'),
+    ('LGW', 'London Gatwick', 'London'),
+    ('LCY', 'London City', 'London'),
+    ('STN', 'London Stansted', 'London'),
+    ('LTN', 'London Luton', 'London'),
+    ('MAN', 'Manchester', 'Manchester'),
+    ('BHX', 'Birmingham', 'Birmingham'),
+    ('BRS', 'Bristol', 'Bristol'),
+    ('NCL', 'Newcastle', 'Newcastle'),
+    ('EDI', 'Edinburgh', 'Edinburgh'),
+    ('GLA', 'Glasgow', 'Glasgow'),
+    ('ABZ', 'Aberdeen', 'Aberdeen'),
+    ('INV', 'Inverness', 'Inverness'),
+    ('BHD', 'Belfast City', 'Belfast'),
+    ('BFS', 'Belfast International', 'Belfast'),
+    ('JER', 'Jersey', 'Jersey'),
+    ('DUB', 'Dublin', 'Dublin'),
+    # Europe
+    ('AMS', 'Amsterdam', 'Amsterdam'),
+    ('BRU', 'Brussels', 'Brussels'),
+    ('PAR', 'Paris', 'Paris'),
+    ('CDG', 'Paris Charles de Gaulle', 'Paris'),
+    ('ORY', 'Paris Orly', 'Paris'),
+    ('NCE', 'Nice', 'Nice'),
+    ('LYS', 'Lyon', 'Lyon'),
+    ('MRS', 'Marseille', 'Marseille'),
+    ('FRA', 'Frankfurt', 'Frankfurt'),
+    ('MUC', 'Munich', 'Munich'),
+    ('BER', 'Berlin', 'Berlin'),
+    ('DUS', 'Dusseldorf', 'Dusseldorf'),
+    ('HAM', 'Hamburg', 'Hamburg'),
+    ('ZRH', 'Zurich', 'Zurich'),
+    ('GVA', 'Geneva', 'Geneva'),
+    ('BSL', 'Basel', 'Basel'),
+    ('VIE', 'Vienna', 'Vienna'),
+    ('PRG', 'Prague', 'Prague'),
+    ('BUD', 'Budapest', 'Budapest'),
+    ('WAW', 'Warsaw', 'Warsaw'),
+    ('CPH', 'Copenhagen', 'Copenhagen'),
+    ('OSL', 'Oslo', 'Oslo'),
+    ('ARN', 'Stockholm', 'Stockholm'),
+    ('HEL', 'Helsinki', 'Helsinki'),
+    ('KEF', 'Reykjavik', 'Reykjavik'),
+    ('MAD', 'Madrid', 'Madrid'),
+    ('BCN', 'Barcelona', 'Barcelona'),
+    ('AGP', 'Malaga', 'Malaga'),
+    ('PMI', 'Palma', 'Palma'),
+    ('LIS', 'Lisbon', 'Lisbon'),
+    ('OPO', 'Porto', 'Porto'),
+    ('FAO', 'Faro', 'Faro'),
+    ('FCO', 'Rome', 'Rome'),
+    ('MIL', 'Milan', 'Milan'),
+    ('LIN', 'Milan Linate', 'Milan'),
+    ('MXP', 'Milan Malpensa', 'Milan'),
+    ('VCE', 'Venice', 'Venice'),
+    ('NAP', 'Naples', 'Naples'),
+    ('ATH', 'Athens', 'Athens'),
+    ('LCA', 'Larnaca', 'Larnaca'),
+    ('MLA', 'Malta', 'Malta'),
+    ('IST', 'Istanbul', 'Istanbul'),
+    ('MOW', 'Moscow', 'Moscow'),
+    ('SVO', 'Moscow Sheremetyevo', 'Moscow'),
+    ('DME', 'Moscow Domodedovo', 'Moscow'),
+    # North America and the Caribbean
+    ('NYC', 'New York', 'New York'),
+    ('JFK', 'New York JFK', 'New York'),
+    ('EWR', 'New York Newark', 'New York'),
+    ('LGA', 'New York LaGuardia', 'New York'),
+    ('BOS', 'Boston', 'Boston'),
+    ('PHL', 'Philadelphia', 'Philadelphia'),
+    ('BWI', 'Baltimore', 'Baltimore'),
+    ('WAS', 'Washington', 'Washington'),
+    ('IAD', 'Washington Dulles', 'Washington'),
+    ('DCA', 'Washington Reagan', 'Washington'),
+    ('PIT', 'Pittsburgh', 'Pittsburgh'),
+    ('CLT', 'Charlotte', 'Charlotte'),
+    ('ATL', 'Atlanta', 'Atlanta'),
+    ('MIA', 'Miami', 'Miami'),
+    ('MCO', 'Orlando', 'Orlando'),
+    ('TPA', 'Tampa', 'Tampa'),
+    ('BNA', 'Nashville', 'Nashville'),
+    ('MSY', 'New Orleans', 'New Orleans'),
+    ('ORD', 'Chicago', 'Chicago'),
+    ('DFW', 'Dallas Fort Worth', 'Dallas'),
+    ('IAH', 'Houston', 'Houston'),
+    ('AUS', 'Austin', 'Austin'),
+    ('DEN', 'Denver', 'Denver'),
+    ('PHX', 'Phoenix', 'Phoenix'),
+    ('LAS', 'Las Vegas', 'Las Vegas'),
+    ('LAX', 'Los Angeles', 'Los Angeles'),
+    ('SAN', 'San Diego', 'San Diego'),
+    ('SFO', 'San Francisco', 'San Francisco'),
+    ('SJC', 'San Jose', 'San Jose'),
+    ('SEA', 'Seattle', 'Seattle'),
+    ('YYZ', 'Toronto', 'Toronto'),
+    ('YUL', 'Montreal', 'Montreal'),
+    ('YYC', 'Calgary', 'Calgary'),
+    ('YVR', 'Vancouver', 'Vancouver'),
+    ('MEX', 'Mexico City', 'Mexico City'),
+    ('CUN', 'Cancun', 'Cancun'),
+    ('BDA', 'Bermuda', 'Bermuda'),
+    ('NAS', 'Nassau', 'Nassau'),
+    ('BGI', 'Barbados', 'Bridgetown'),
+    ('ANU', 'Antigua', 'Antigua'),
+    ('UVF', 'St Lucia', 'St Lucia'),
+    ('MBJ', 'Montego Bay', 'Montego Bay'),
+    ('KIN', 'Kingston', 'Kingston'),
+    ('POS', 'Port of Spain', 'Port of Spain'),
+    # South America
+    ('GRU', 'Sao Paulo', 'Sao Paulo'),
+    ('GIG', 'Rio de Janeiro', 'Rio de Janeiro'),
+    ('EZE', 'Buenos Aires', 'Buenos Aires'),
+    ('SCL', 'Santiago', 'Santiago'),
+    ('LIM', 'Lima', 'Lima'),
+    ('BOG', 'Bogota', 'Bogota'),
+    # Middle East
+    ('DXB', 'Dubai', 'Dubai'),
+    ('AUH', 'Abu Dhabi', 'Abu Dhabi'),
+    ('DOH', 'Doha', 'Doha'),
+    ('BAH', 'Bahrain', 'Manama'),
+    ('KWI', 'Kuwait', 'Kuwait City'),
+    ('MCT', 'Muscat', 'Muscat'),
+    ('AMM', 'Amman', 'Amman'),
+    ('TLV', 'Tel Aviv', 'Tel Aviv'),
+    ('BEY', 'Beirut', 'Beirut'),
+    ('RUH', 'Riyadh', 'Riyadh'),
+    ('JED', 'Jeddah', 'Jeddah'),
+    # Africa
+    ('CAI', 'Cairo', 'Cairo'),
+    ('CMN', 'Casablanca', 'Casablanca'),
+    ('RAK', 'Marrakech', 'Marrakech'),
+    ('TUN', 'Tunis', 'Tunis'),
+    ('KRT', 'Khartoum', 'Khartoum'),
+    ('DSS', 'Dakar', 'Dakar'),
+    ('BKO', 'Bamako', 'Bamako'),
+    ('OUA', 'Ouagadougou', 'Ouagadougou'),
+    ('FNA', 'Freetown', 'Freetown'),
+    ('ROB', 'Monrovia', 'Monrovia'),
+    ('ABJ', 'Abidjan', 'Abidjan'),
+    ('ACC', 'Accra', 'Accra'),
+    ('LFW', 'Lome', 'Lome'),
+    ('COO', 'Cotonou', 'Cotonou'),
+    ('LOS', 'Lagos', 'Lagos'),
+    ('ABV', 'Abuja', 'Abuja'),
+    ('KAN', 'Kano', 'Kano'),
+    ('ENU', 'Enugu', 'Enugu'),
+    ('DLA', 'Douala', 'Douala'),
+    ('NSI', 'Yaounde', 'Yaounde'),
+    ('SSG', 'Malabo', 'Malabo'),
+    ('LBV', 'Libreville', 'Libreville'),
+    ('BZV', 'Brazzaville', 'Brazzaville'),
+    ('FIH', 'Kinshasa', 'Kinshasa'),
+    ('FBM', 'Lubumbashi', 'Lubumbashi'),
+    ('GOM', 'Goma', 'Goma'),
+    ('LAD', 'Luanda', 'Luanda'),
+    ('ADD', 'Addis Ababa', 'Addis Ababa'),
+    ('BJR', 'Bahir Dar', 'Bahir Dar'),
+    ('GDQ', 'Gondar', 'Gondar'),
+    ('LLI', 'Lalibela', 'Lalibela'),
+    ('AXU', 'Axum', 'Axum'),
+    ('MQX', 'Mekele', 'Mekele'),
+    ('DIR', 'Dire Dawa', 'Dire Dawa'),
+    ('AWA', 'Awasa', 'Awasa'),
+    ('ASM', 'Asmara', 'Asmara'),
+    ('JIB', 'Djibouti', 'Djibouti'),
+    ('HGA', 'Hargeisa', 'Hargeisa'),
+    ('MGQ', 'Mogadishu', 'Mogadishu'),
+    ('NBO', 'Nairobi', 'Nairobi'),
+    ('MBA', 'Mombasa', 'Mombasa'),
+    ('EBB', 'Entebbe', 'Entebbe'),
+    ('KGL', 'Kigali', 'Kigali'),
+    ('BJM', 'Bujumbura', 'Bujumbura'),
+    ('JUB', 'Juba', 'Juba'),
+    ('DAR', 'Dar es Salaam', 'Dar es Salaam'),
+    ('JRO', 'Kilimanjaro', 'Kilimanjaro'),
+    ('ZNZ', 'Zanzibar', 'Zanzibar'),
+    ('LUN', 'Lusaka', 'Lusaka'),
+    ('LLW', 'Lilongwe', 'Lilongwe'),
+    ('BLZ', 'Blantyre', 'Blantyre'),
+    ('HRE', 'Harare', 'Harare'),
+    ('BUQ', 'Bulawayo', 'Bulawayo'),
+    ('VFA', 'Victoria Falls', 'Victoria Falls'),
+    ('MPM', 'Maputo', 'Maputo'),
+    ('GBE', 'Gaborone', 'Gaborone'),
+    ('WDH', 'Windhoek', 'Windhoek'),
+    ('JNB', 'Johannesburg', 'Johannesburg'),
+    ('CPT', 'Cape Town', 'Cape Town'),
+    ('DUR', 'Durban', 'Durban'),
+    ('TNR', 'Antananarivo', 'Antananarivo'),
+    ('NOS', 'Nosy Be', 'Nosy Be'),
+    ('MRU', 'Mauritius', 'Mauritius'),
+    ('SEZ', 'Seychelles', 'Seychelles'),
+    # Asia and the Pacific
+    ('ISB', 'Islamabad', 'Islamabad'),
+    ('LHE', 'Lahore', 'Lahore'),
+    ('KHI', 'Karachi', 'Karachi'),
+    ('DEL', 'Delhi', 'Delhi'),
+    ('BOM', 'Mumbai', 'Mumbai'),
+    ('BLR', 'Bangalore', 'Bangalore'),
+    ('MAA', 'Chennai', 'Chennai'),
+    ('HYD', 'Hyderabad', 'Hyderabad'),
+    ('COK', 'Kochi', 'Kochi'),
+    ('DAC', 'Dhaka', 'Dhaka'),
+    ('CMB', 'Colombo', 'Colombo'),
+    ('MLE', 'Male', 'Male'),
+    ('BKK', 'Bangkok', 'Bangkok'),
+    ('KUL', 'Kuala Lumpur', 'Kuala Lumpur'),
+    ('SIN', 'Singapore', 'Singapore'),
+    ('CGK', 'Jakarta', 'Jakarta'),
+    ('MNL', 'Manila', 'Manila'),
+    ('PNH', 'Phnom Penh', 'Phnom Penh'),
+    ('HKG', 'Hong Kong', 'Hong Kong'),
+    ('TPE', 'Taipei', 'Taipei'),
+    ('BJS', 'Beijing', 'Beijing'),
+    ('PEK', 'Beijing Capital', 'Beijing'),
+    ('PKX', 'Beijing Daxing', 'Beijing'),
+    ('PVG', 'Shanghai', 'Shanghai'),
+    ('CAN', 'Guangzhou', 'Guangzhou'),
+    ('CTU', 'Chengdu', 'Chengdu'),
+    ('ICN', 'Seoul', 'Seoul'),
+    ('TYO', 'Tokyo', 'Tokyo'),
+    ('HND', 'Tokyo Haneda', 'Tokyo'),
+    ('NRT', 'Tokyo Narita', 'Tokyo'),
+    ('KIX', 'Osaka', 'Osaka'),
+    ('SYD', 'Sydney', 'Sydney'),
+    ('MEL', 'Melbourne', 'Melbourne'),
+    ('BNE', 'Brisbane', 'Brisbane'),
+    ('PER', 'Perth', 'Perth'),
+    ('AKL', 'Auckland', 'Auckland')
+]
+
+# Other spellings reviewers use -> IATA code
+AIRPORT_ALIASES = {
+    'heathrow': 'LHR', 'gatwick': 'LGW', 'stansted': 'STN', 'luton': 'LTN', 'belfast': 'BFS',
+    'charles de gaulle': 'CDG', 'orly': 'ORY', 'schiphol': 'AMS',
+    'fiumicino': 'FCO', 'linate': 'LIN', 'malpensa': 'MXP',
+    'newark': 'EWR', 'laguardia': 'LGA', 'dulles': 'IAD', 'washington dc': 'WAS', 'washington d c': 'WAS',
+    'o hare': 'ORD', 'chicago o hare': 'ORD', 'dallas': 'DFW', 'vegas': 'LAS', 'pearson': 'YYZ',
+    'saint lucia': 'UVF', 'bridgetown': 'BGI', 'guarulhos': 'GRU', 'sao paolo': 'GRU',
+    'milano': 'MIL', 'hamad': 'DOH',
+    'joburg': 'JNB', 'jo burg': 'JNB', 'johanesburg': 'JNB', 'marrakesh': 'RAK',
+    # Ethiopian Airlines' hub and network
+    'addis': 'ADD', 'bole': 'ADD', 'addis abeba': 'ADD', 'addis abba': 'ADD', 'addis abbaba': 'ADD',
+    'addis adaba': 'ADD', 'addis dabba': 'ADD', 'addis amababa': 'ADD', 'addas ababa': 'ADD', 'adis ababa': 'ADD',
+    'gonder': 'GDQ', 'aksum': 'AXU', 'mekelle': 'MQX', 'hawassa': 'AWA',
+    'diass': 'DSS', 'cccra': 'ACC', 'yaounde nsimalen': 'NSI', 'dar es salam': 'DAR', 'kiliminjaro': 'JRO',
+    'mahe': 'SEZ', 'antananaviro': 'TNR',
+    'new delhi': 'DEL', 'bombay': 'BOM', 'bengaluru': 'BLR', 'madras': 'MAA',
+    'changi': 'SIN', 'incheon': 'ICN', 'narita': 'NRT', 'haneda': 'HND', 'kansai': 'KIX'
+}
+
+# A country named on its own -> the airport its flights use, e.g. "London to Zambia"
+COUNTRY_AIRPORTS = {
+    'ethiopia': 'ADD', 'eritrea': 'ASM', 'somaliland': 'HGA', 'kenya': 'NBO', 'uganda': 'EBB', 'rwanda': 'KGL',
+    'burundi': 'BJM', 'south sudan': 'JUB', 'sudan': 'KRT', 'tanzania': 'DAR', 'zambia': 'LUN', 'malawi': 'LLW',
+    'zimbabwe': 'HRE', 'mozambique': 'MPM', 'botswana': 'GBE', 'namibia': 'WDH', 'madagascar': 'TNR',
+    'nigeria': 'LOS', 'ghana': 'ACC', 'senegal': 'DSS', 'liberia': 'ROB', 'sierra leone': 'FNA',
+    'togo': 'LFW', 'benin': 'COO', 'mali': 'BKO', 'burkina faso': 'OUA', 'ivory coast': 'ABJ',
+    'cote d ivoire': 'ABJ', 'cameroon': 'DLA', 'gabon': 'LBV', 'equatorial guinea': 'SSG', 'angola': 'LAD',
+    'drc': 'FIH', 'egypt': 'CAI', 'morocco': 'CMN'
+}
+
+# Countries and states reviewers append to a place: "Lusaka Zambia", "Atlanta GA", "Nosy Be, Madagascar"
+REGION_NAMES = {
+    *COUNTRY_AIRPORTS, 'south africa', 'congo', 'dr congo', 'uk', 'england', 'scotland', 'ireland', 'usa',
+    'us', 'united states', 'canada', 'brazil', 'india', 'china', 'france', 'germany', 'italy', 'spain',
+    'belgium', 'netherlands', 'switzerland', 'austria', 'sweden', 'israel', 'lebanon', 'uae', 'qatar',
+    'saudi arabia', 'japan', 'korea', 'thailand', 'cambodia', 'australia'
+}
+US_STATE = re.compile(
+    r'[\s,]+(?:A[KLRZ]|C[AOT]|D[CE]|FL|GA|HI|I[ADLN]|K[SY]|LA|M[ADEINOST]|N[CDEHJMVY]|O[HKR]|PA|RI|S[CD]|T[NX]|UT|'
+    r'V[AT]|W[AIVY])$'
+)
+# A trailing airport code: "Washington IAD", "Paris CDG"
+AIRPORT_CODE_SUFFIX = re.compile(r'[\s,]+([A-Z]{3})$')
+
+# Punctuation trimmed off each place name
+PLACE_PUNCTUATION = ' .,;:()[]"\''
+
+# Words dropped before a place is looked up, e.g. "Heathrow Airport"
+IGNORED_WORDS = {'airport', 'international', 'intl'}
+
+# Between origin, stops and destination: "A to B", "A - B", "A > B", "LHR-JNB"; a doubled "to to" is one
+STOP_SEPARATOR = re.compile(r'(?i:(?:\s+to)+\s+)|\s*(?:->|→|>|–|—)\s*|\s+-\s+|(?<=\b[A-Z]{3})-(?=[A-Z]{3}\b)')
+VIA_SEPARATOR = re.compile(r'\s+via\s+', re.I)
+# Between the stops of a via clause: "via Dubai and Doha", "via Dubai, Doha"
+VIAS_SEPARATOR = re.compile(r'\s*[,/&]\s*|\s+and\s+', re.I)
+
+def _lookup_key(place: str) -> str:
+    text = unicodedata.normalize('NFKD', place).encode('ascii', 'ignore').decode('ascii')
+    words = re.sub(r'[^0-9a-z]+', ' ', text.lower()).split()
+    return ' '.join(word for word in words if word not in IGNORED_WORDS)
+
+def _build_lookup() -> Dict[str, tuple]:
+    by_code = {airport[0]: airport for airport in AIRPORTS}
+    lookup = {}
+    city_airports = {}
+    for airport in AIRPORTS:
+        code, name, city = airport
+        lookup[code.lower()] = lookup[_lookup_key(name)] = airport
+        city_airports.setdefault(_lookup_key(city), []).append(airport)
+    # A city resolves to its only airport; cities with several have a metro code named after them
+    for key, airports in city_airports.items():
+        if key not in lookup and len(airports) == 1:
+            lookup[key] = airports[0]
+    for alias, code in {**COUNTRY_AIRPORTS, **AIRPORT_ALIASES}.items():
+        lookup[_lookup_key(alias)] = by_code[code]
+    return lookup
+
+AIRPORT_LOOKUP = _build_lookup()
+
+def _strip_region(place: str) -> Optional[str]:
+    """The place without a trailing country or US state, or None if it has neither."""
+    state = US_STATE.search(place)
+    if state is not None:
+        return place[:state.start()]
+    words = _lookup_key(place).split()
+    # Two-word regions first, e.g. "Cape Town South Africa"
+    for size in (2, 1):
+        if len(words) > size and ' '.join(words[-size:]) in REGION_NAMES:
+            return ' '.join(words[:-size])
+    return None
+
+@lru_cache(maxsize=None)
+def resolve_place(place: str) -> Tuple[Optional[str], str, Optional[str]]:
+    """(IATA code, canonical name, city) of a place named in a route.
+
+    When the full text is not known, a trailing airport code ("Washington
+    IAD"), country or state ("Lusaka Zambia", "Atlanta GA") or text after a
+    comma ("Heathrow, London") is dropped. Places missing from the lookup
+    table keep their own name, title-cased if it was all one case; a bare
+    three-letter code is kept as the code.
+    """
+    code = re.search(r'\(([A-Z]{3})\b', place)
+    place = place.strip(PLACE_PUNCTUATION)
+    airport = AIRPORT_LOOKUP.get(_lookup_key(place))
+    if airport is None:
+        suffix = AIRPORT_CODE_SUFFIX.search(place)
+        if suffix is not None:
+            airport = AIRPORT_LOOKUP.get(suffix.group(1).lower())
+    if airport is None:
+        for shorter in (_strip_region(place), place.split(',')[0] if ',' in place else None):
+            if shorter and airport is None:
+                airport = AIRPORT_LOOKUP.get(_lookup_key(shorter))
+    if airport is None:
+        code = code or re.fullmatch(r'([A-Z]{3})', place)
+        if code is not None:
+            airport = AIRPORT_LOOKUP.get(code.group(1).lower(), (code.group(1), code.group(1), None))
+    if airport is not None:
+        return airport
+    if place.islower() or place.isupper():
+        place = place.title()
+    return (None, place, None)
+
+@lru_cache(maxsize=None)
+def parse_route(route: str) -> Optional[Tuple[str, ...]]:
+    """Canonical names of a route's stops, origin first and destination last.
+
+    "Addis Ababa to Kigali via Juba" gives ('Addis Ababa', 'Juba', 'Kigali').
+    Returns None for text that does not name an origin and a destination.
+    Results are cached, since every review of a route repeats its text.
+    """
+    main, *vias = VIA_SEPARATOR.split(' '.join(route.split()), maxsplit=1)
+    places = [place for place in STOP_SEPARATOR.split(main) if place.strip(PLACE_PUNCTUATION)]
+    if len(places) < 2:
+        return None
+    for via in vias:
+        places[-1:-1] = [place for place in VIAS_SEPARATOR.split(via) if place.strip(PLACE_PUNCTUATION)]
+    stops = places
+    return tuple(resolve_place(place)[1] for place in stops)
+
+def route_name(stops: Tuple[str, ...]) -> str:
+    """Canonical route text of parsed stops, e.g. "Addis Ababa to Kigali via Juba"."""
+    name = f"{stops[0]} to {stops[-1]}"
+    if len(stops) > 2:
+        name += f" via {', '.join(stops[1:-1])}"
+    return name
+
+def canonical_routes(routes: pd.Series) -> pd.Series:
+    """Routes rewritten to their canonical text, so spellings of one route become one value.
+
+    Text that does not parse as a route is only whitespace-normalized.
+    Each distinct value is parsed once; a categorical series stays categorical.
+    """
+    canonical = {}
+    for route in routes.dropna().unique():
+        stops = parse_route(str(route))
+        canonical[route] = route_name(stops) if stops else ' '.join(str(route).split())
+    result = routes.astype(object).map(canonical)
+    if isinstance(routes.dtype, pd.CategoricalDtype):
+        result = result.astype('category')
+    return result
+
+def route_stops(routes: pd.Series) -> pd.DataFrame:
+    """One row per stop of each distinct parsed route, for dim.Airport, dim.Route and dim.RouteSegment.
+
+    Columns are RouteName, StopNumber (0 for the origin), AirportName,
+    AirportCode and City. Routes that do not parse are left out.
+    """
+    rows = []
+    for route in routes.dropna().unique():
+        stops = parse_route(str(route))
+        if stops is None:
+            continue
+        name = route_name(stops)
+        for number, place in enumerate(stops):
+            code, airport_name, city = resolve_place(place)
+            rows.append((name, number, airport_name, code, city))
+    return pd.DataFrame(
+        rows, columns=['RouteName', 'StopNumber', 'AirportName', 'AirportCode', 'City']
+    ).drop_duplicates(subset=['RouteName', 'StopNumber'])
@@ -0,0 +1,116 @@
+import os
+import re
+import logging
+from typing import Optional
+
+logger = logging.getLogger('Schema')
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Scripts')
+
+# (version, description, scripts under Scripts/, backends it applies to or None for all)
+MIGRATIONS = [
+    (1, 'Warehouse tables', ['DimensionTables.sql', 'FactTables.sql', 'AuditTables.sql'], None),
+    (2, 'Indexes on fact foreign keys and dimension business keys', ['WarehouseIndexes.sql'], None),
+    (3, 'Clustered columnstore fact.Reviews partitioned by ReviewDateKey', ['FactColumnstore.sql'], ('mssql',)),
+    (4, 'Airport, route and route segment dimensions', ['RouteDimensions.sql'], None),
+    # Upgrades of warehouses created before these features; no-ops on newer ones
+    (5, 'Review content hash on fact.Reviews', ['AddReviewHash.sql'], None),
+    (6, 'Review text moved to compressed fact.ReviewText', ['SplitReviewText.sql'], None),
+    (7, 'Route/month summary tables', ['AggregateTables.sql'], None)
+]
+
+# Columns added by a local engine's ALTER TABLE ADD statement
+_ADD_COLUMN = re.compile(r'^ALTER\s+TABLE\s+([\w.]+)\s+ADD\s+(\w+)', re.I)
+
+VERSION_TABLE_SQL = """
+CREATE TABLE audit.SchemaVersion (
+    Version INT PRIMARY KEY,
+    Description NVARCHAR(255) NOT NULL,
+    AppliedDate DATETIME NOT NULL DEFAULT GETDATE()
+)
+"""
+
+def read_script(script: str, scripts_dir: str = SCRIPTS_DIR) -> str:
+    with open(os.path.join(scripts_dir, script), encoding='utf-8') as f:
+        return f.read()
+
+def schema_version(connection, backend) -> int:
+    """Latest migration applied to the warehouse; 0 if it was never migrated."""
+    cursor = connection.cursor()
+    if not backend.table_exists(cursor, 'audit.SchemaVersion'):
+        return 0
+    cursor.execute("SELECT MAX(Version) FROM audit.SchemaVersion")
+    return cursor.fetchone()[0] or 0
+
+def script_tables(scripts) -> set:
+    """Names of the tables the scripts create, e.g. {'fact.Reviews'}."""
+    return {
+        table for script in scripts
+        for table in re.findall(r'CREATE\s+TABLE\s+([\w.]+)', read_script(script), flags=re.I)
+    }
+
+def adoptable(cursor, backend) -> bool:
+    """Whether an unversioned warehouse already has every table of migration 1.
+
+    Tables that a later migration also creates are left out; that migration
+    checks for them itself, as the column-adding ones check their columns.
+    """
+    later_tables = script_tables(script for _, _, scripts, _ in MIGRATIONS[1:] for script in scripts)
+    base_tables = script_tables(MIGRATIONS[0][2]) - later_tables
+    missing = sorted(table for table in base_tables if not backend.table_exists(cursor, table))
+    if missing and len(missing) < len(base_tables):
+        logger.warning(f"Existing warehouse lacks {', '.join(missing)}; creating the tables of version 1")
+    return not missing
+
+def _record(cursor, version: int, description: str):
+    cursor.execute("INSERT INTO audit.SchemaVersion (Version, Description) VALUES (?, ?)", (version, description))
+
+def migrate(connection, backend, target: Optional[int] = None) -> int:
+    """Apply the migrations above the warehouse's version, up to ``target``; return the new version.
+
+    Each migration runs and is recorded in audit.SchemaVersion in its own
+    transaction, which is rolled back if a statement fails. Migrations for
+    other engines are recorded without running. A warehouse created by hand
+    from the scripts, before versioning, is adopted at version 1 if it has
+    all of that version's tables; the later migrations then add what it
+    lacks, skipping the columns and tables it already has.
+    """
+    cursor = connection.cursor()
+    try:
+        if not backend.table_exists(cursor, 'audit.SchemaVersion'):
+            adopt = adoptable(cursor, backend)
+            for statement in backend.script_statements(VERSION_TABLE_SQL):
+                cursor.execute(statement)
+            if adopt:
+                _record(cursor, *MIGRATIONS[0][:2])
+                logger.info("Adopted the existing warehouse at schema version 1")
+            connection.commit()
+
+        version = schema_version(connection, backend)
+        for number, description, scripts, backends in MIGRATIONS:
+            if number <= version or (target is not None and number > target):
+                continue
+            if backends is None or backend.name in backends:
+                for script in scripts:
+                    for statement in backend.script_statements(read_script(script)):
+                        added = _ADD_COLUMN.match(statement)
+                        if added and backend.column_exists(cursor, *added.groups()):
+                            continue
+                        cursor.execute(statement)
+                logger.info(f"Applied schema migration {number}: {description}")
+            else:
+                logger.info(f"Schema migration {number} ({description}) does not apply to {backend.name}")
+            _record(cursor, number, description)
+            connection.commit()
+            version = number
+
+        if version >= 6 and backend.column_exists(cursor, 'fact.Reviews', 'ReviewText'):
+            # Only the T-SQL of migration 6 moves the texts; local engines just add the new table and columns
+            logger.warning(
+                "fact.Reviews still has its ReviewText column, which new loads cannot fill; "
+                "rebuild this local warehouse from the saved artifacts with --from-artifacts"
+            )
+        return version
+    except backend.errors:
+        connection.rollback()
+        raise
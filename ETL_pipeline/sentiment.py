@@ -0,0 +1,281 @@
+import os
+import re
+import logging
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('Sentiment')
+
+# Bump when the lexicon or the scoring rules change so reviews are re-scored
+MODEL_VERSION = 'lexicon-1.0'
+
+CACHE_DIR = os.path.join('cache', 'sentiment')
+
+SCORE_COLUMNS = ['PositiveScore', 'NegativeScore', 'NeutralScore', 'CompoundScore', 'KeyPhrases', 'Entities']
+
+TOKEN_PATTERN = r"[a-z]+(?:'[a-z]+)?"
+
+# Sentence punctuation; negations and boosters do not reach across it
+CLAUSE_BREAKS = ('.', '!', '?', ';')
+
+# Word valence on VADER's -4..4 scale, tuned to airline reviews
+LEXICON = {
+    'excellent': 3.2, 'outstanding': 3.3, 'superb': 3.1, 'fantastic': 3.0, 'amazing': 2.9, 'wonderful': 3.0,
+    'great': 3.1, 'brilliant': 2.9, 'perfect': 2.9, 'best': 3.0, 'love': 3.2, 'loved': 2.9, 'enjoyed': 2.2,
+    'good': 1.9, 'nice': 1.8, 'pleasant': 2.0, 'lovely': 2.8, 'friendly': 2.2, 'helpful': 1.9, 'attentive': 1.8,
+    'polite': 1.8, 'professional': 1.4, 'courteous': 1.9, 'kind': 2.0, 'welcoming': 2.0, 'smiling': 1.9,
+    'comfortable': 1.9, 'comfy': 1.8, 'spacious': 1.5, 'clean': 1.7, 'tasty': 2.0, 'delicious': 2.7,
+    'fresh': 1.3, 'efficient': 1.6, 'smooth': 1.5, 'quick': 1.0, 'fast': 1.0, 'punctual': 1.6, 'ontime': 1.6,
+    'recommend': 1.5, 'recommended': 1.5, 'happy': 2.7, 'pleased': 2.1, 'impressed': 2.3, 'thanks': 1.9,
+    'thank': 1.5, 'satisfied': 1.8, 'decent': 1.0, 'fine': 0.8, 'ok': 0.9, 'okay': 0.9, 'adequate': 0.9,
+    'reasonable': 1.0, 'improved': 1.9, 'generous': 2.3, 'seamless': 1.9, 'relaxing': 2.2, 'easy': 1.9,
+    'bad': -2.5, 'poor': -2.1, 'terrible': -3.1, 'horrible': -2.5, 'awful': -2.0, 'worst': -3.1, 'rude': -2.0,
+    'unfriendly': -1.5, 'unhelpful': -1.7, 'disappointing': -2.2, 'disappointed': -1.9, 'disappointment': -2.3,
+    'uncomfortable': -1.6, 'cramped': -1.5, 'dirty': -1.9, 'filthy': -2.7, 'broken': -1.8, 'smelly': -1.7,
+    'cold': -0.5, 'stale': -1.4, 'inedible': -2.4, 'bland': -1.2, 'tasteless': -1.6, 'late': -1.2,
+    'delay': -1.3, 'delayed': -1.6, 'delays': -1.3, 'cancelled': -1.8, 'canceled': -1.8, 'missed': -1.3,
+    'lost': -1.3, 'damaged': -1.9, 'chaos': -2.3, 'chaotic': -2.0, 'mess': -1.5, 'slow': -1.0,
+    'waiting': -0.6, 'waited': -0.6, 'stranded': -1.9, 'nightmare': -2.9, 'avoid': -1.6,
+    'complaint': -1.5, 'complain': -1.3, 'problem': -1.7, 'problems': -1.7, 'issue': -0.9, 'issues': -0.9,
+    'unacceptable': -2.2, 'useless': -1.8, 'incompetent': -2.3, 'ignored': -1.8, 'angry': -2.3,
+    'frustrated': -2.0, 'frustrating': -2.0, 'annoying': -1.7, 'overpriced': -1.6, 'expensive': -0.9,
+    'tired': -1.0, 'noisy': -1.0, 'worn': -1.0, 'old': -0.4, 'shabby': -1.6, 'sad': -2.1, 'unhappy': -1.8,
+    'hate': -2.7, 'scam': -2.6, 'shocking': -1.8, 'appalling': -2.6, 'dreadful': -2.7, 'abysmal': -2.9
+}
+
+# Previous-word intensifiers and dampeners; VADER's 0.293 scalar
+BOOSTERS = {word: 0.293 for word in (
+    'very', 'really', 'extremely', 'absolutely', 'incredibly', 'so', 'totally', 'truly', 'most',
+    'completely', 'exceptionally', 'especially', 'highly', 'super', 'utterly'
+)}
+BOOSTERS.update({word: -0.293 for word in (
+    'slightly', 'somewhat', 'barely', 'hardly', 'marginally', 'kinda', 'fairly', 'bit', 'little'
+)})
+
+NEGATIONS = {
+    'not', 'no', 'never', 'none', 'nothing', 'nowhere', 'neither', 'nor', 'without', 'cannot', 'cant',
+    "can't", "don't", 'dont', "didn't", 'didnt', "doesn't", 'doesnt', "isn't", 'isnt', "wasn't", 'wasnt',
+    "weren't", "aren't", "won't", "wouldn't", "couldn't", "shouldn't", "hasn't", "haven't", "hadn't"
+}
+
+# Service aspects recorded as the review's Entities
+ASPECTS = {
+    'food': ('food', 'meal', 'meals', 'breakfast', 'lunch', 'dinner', 'snack', 'snacks', 'drink', 'drinks',
+             'beverage', 'beverages', 'catering', 'menu', 'wine', 'coffee'),
+    'staff': ('staff', 'crew', 'attendant', 'attendants', 'stewardess', 'steward', 'pilot', 'captain',
+              'agent', 'agents'),
+    'seat': ('seat', 'seats', 'legroom', 'recline', 'bed', 'cabin'),
+    'delay': ('delay', 'delayed', 'delays', 'late', 'cancelled', 'canceled', 'cancellation', 'waiting',
+              'waited'),
+    'entertainment': ('entertainment', 'ife', 'movies', 'movie', 'screen', 'screens', 'wifi', 'headphones'),
+    'luggage': ('luggage', 'baggage', 'bag', 'bags', 'suitcase'),
+    'aircraft': ('aircraft', 'plane', 'airplane', 'dreamliner', 'boeing', 'airbus', 'a350', 'a380'),
+    'ground': ('check', 'boarding', 'gate', 'lounge', 'airport', 'transfer', 'connection', 'security'),
+    'value': ('price', 'value', 'money', 'fare', 'cost', 'cheap', 'expensive', 'overpriced')
+}
+ASPECT_WORDS = {word: aspect for aspect, words in ASPECTS.items() for word in words}
+
+STOPWORDS = frozenset((
+    'a an and are as at be been but by for from had has have he her his i if in into is it its me my '
+    'of on or our she so than that the their them then there these they this those to too us was we '
+    'were what when which while who will with would you your also just very really all any both each '
+    'after again against before being did do does doing during few more most other over same some such '
+    'only own off up down out about above below between through until again further here where why how '
+    'can could should one two flight flights airline airlines british airways ba review'
+).split()) | NEGATIONS
+
+_PHRASE_SPLIT = re.compile(r"[^a-z0-9' ]+")
+
+def _previous(values: np.ndarray, clauses: np.ndarray, distance: int, fill):
+    """``values`` shifted by ``distance`` tokens, with ``fill`` where the shift crosses a clause boundary."""
+    shifted = np.full(len(values), fill, dtype=values.dtype)
+    if distance < len(values):
+        shifted[distance:] = values[:-distance]
+        shifted[distance:][clauses[distance:] != clauses[:-distance]] = fill
+    return shifted
+
+def score_sentiment(texts: pd.Series) -> pd.DataFrame:
+    """VADER-style scores for each text, computed over all tokens at once.
+
+    Each lexicon word's valence is boosted or damped by an intensifier just
+    before it and flipped (x -0.74) by a negation up to three words before
+    in the same clause.
+    The compound score normalises the summed valence into -1..1; the
+    positive/negative/neutral scores are the shares of sentiment mass.
+    """
+    texts = texts.fillna('').astype(str)
+    tokens = texts.str.lower().str.findall(f"{TOKEN_PATTERN}|[{re.escape(''.join(CLAUSE_BREAKS))}]")
+    tokens = tokens.explode().dropna()
+    words = pd.Series(tokens.to_numpy(dtype=object))
+    is_break = words.isin(CLAUSE_BREAKS).to_numpy()
+    owners = pd.factorize(tokens.index)[0]
+    new_review = np.ones(len(words), dtype=bool)
+    new_review[1:] = owners[1:] != owners[:-1]
+    clauses = np.cumsum(new_review | is_break)
+
+    valence = words.map(LEXICON).fillna(0.0).to_numpy(dtype=float)
+    boost = words.map(BOOSTERS).fillna(0.0).to_numpy(dtype=float)
+    negation = words.isin(NEGATIONS).to_numpy()
+
+    negated = np.zeros(len(words), dtype=bool)
+    scalar = np.zeros(len(words), dtype=float)
+    for distance, decay in ((1, 1.0), (2, 0.95), (3, 0.9)):
+        negated |= _previous(negation, clauses, distance, False)
+        scalar += _previous(boost, clauses, distance, 0.0) * decay
+    valence = np.where(valence != 0, valence + np.sign(valence) * scalar, 0.0)
+    valence = np.where(negated, valence * -0.74, valence)
+
+    per_token = pd.DataFrame({
+        'total': valence,
+        'positive': np.where(valence > 0, valence + 1, 0.0),
+        'negative': np.where(valence < 0, valence - 1, 0.0),
+        'neutral': ((valence == 0) & ~is_break).astype(float)
+    }, index=tokens.index)
+    sums = per_token.groupby(level=0, sort=False).sum().reindex(texts.index, fill_value=0.0)
+
+    # Exclamation marks amplify whichever way the review leans
+    emphasis = texts.str.count('!').clip(upper=4).to_numpy() * 0.292
+    total = sums['total'].to_numpy()
+    total = total + np.sign(total) * emphasis
+    positive = sums['positive'].to_numpy()
+    negative = sums['negative'].to_numpy()
+    leans_positive = positive > np.abs(negative)
+    positive = np.where(leans_positive & (total != 0), positive + emphasis, positive)
+    negative = np.where(~leans_positive & (total != 0), negative - emphasis, negative)
+
+    mass = positive + np.abs(negative) + sums['neutral'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = pd.DataFrame({
+            'PositiveScore': np.where(mass > 0, positive / mass, 0.0),
+            'NegativeScore': np.where(mass > 0, np.abs(negative) / mass, 0.0),
+            'NeutralScore': np.where(mass > 0, sums['neutral'].to_numpy() / mass, 0.0),
+            'CompoundScore': total / np.sqrt(total * total + 15)
+        }, index=texts.index)
+    return scores.round(2)
+
+def key_phrases(text: str, top: int = 5, max_words: int = 3) -> str:
+    """RAKE-style key phrases: runs of up to ``max_words`` non-stopwords, ranked by word degree/frequency."""
+    phrases = []
+    for fragment in _PHRASE_SPLIT.split(text.lower()):
+        phrase = []
+        for word in fragment.split():
+            if word in STOPWORDS or len(word) < 3:
+                if phrase:
+                    phrases.append(tuple(phrase))
+                phrase = []
+            else:
+                phrase.append(word)
+                if len(phrase) == max_words:
+                    phrases.append(tuple(phrase))
+                    phrase = []
+        if phrase:
+            phrases.append(tuple(phrase))
+
+    frequency = Counter()
+    degree = Counter()
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word] += 1
+            degree[word] += len(phrase)
+    # Stable sort, so ties keep their order in the text
+    ranked = sorted(dict.fromkeys(phrases), key=lambda phrase: -sum(degree[w] / frequency[w] for w in phrase))
+    return '; '.join(' '.join(phrase) for phrase in ranked[:top])
+
+def aspect_entities(texts: pd.Series) -> pd.Series:
+    """Comma-separated service aspects (food, staff, delay, ...) each text mentions."""
+    tokens = texts.fillna('').astype(str).str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+    aspects = tokens.map(ASPECT_WORDS).dropna()
+    if aspects.empty:
+        return pd.Series('', index=texts.index, dtype=object)
+    found = aspects.groupby(level=0).agg(lambda values: ', '.join(sorted(set(values))))
+    return found.reindex(texts.index, fill_value='').astype(object)
+
+def analyze_reviews(texts: pd.Series) -> pd.DataFrame:
+    """Sentiment scores, key phrases and entities for one batch of review texts."""
+    scores = score_sentiment(texts)
+    scores['KeyPhrases'] = [key_phrases(text) for text in texts.fillna('').astype(str)]
+    scores['Entities'] = aspect_entities(texts)
+    # Empty text columns are stored as NULL
+    for column in ('KeyPhrases', 'Entities'):
+        scores[column] = scores[column].where(scores[column] != '', None)
+    return scores
+
+class SentimentCache:
+    """Scores of already analysed reviews, keyed by ReviewHash, one pickle per model version."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, model_version: str = MODEL_VERSION):
+        self.path = os.path.join(cache_dir, f'{model_version}.pkl')
+        self.scores = pd.read_pickle(self.path) if os.path.exists(self.path) else pd.DataFrame(
+            columns=SCORE_COLUMNS, index=pd.Index([], name='ReviewHash')
+        )
+
+    def get(self, hashes: Iterable[str]) -> pd.DataFrame:
+        """Cached scores of the given hashes, indexed by ReviewHash."""
+        return self.scores.loc[self.scores.index.intersection(pd.Index(hashes).dropna())]
+
+    def put(self, hashes: pd.Series, scores: pd.DataFrame):
+        """Add scores and write the cache back to disk."""
+        new = scores[SCORE_COLUMNS].set_axis(pd.Index(hashes.to_numpy(), name='ReviewHash'))
+        new = new[new.index.notna()]
+        if new.empty:
+            return
+        self.scores = pd.concat([self.scores[~self.scores.index.isin(new.index)], new])
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.scores.to_pickle(self.path)
+        logger.info(f"Cached sentiment for {len(new)} reviews ({len(self.scores)} total)")
+
+def enrich_reviews(reviews: pd.DataFrame, batch_size: int = 2000, max_workers: Optional[int] = None,
+                   cache: Optional[SentimentCache] = None) -> pd.DataFrame:
+    """Score ``reviews`` (ReviewID, ReviewHash, ReviewText); return ReviewID plus the score columns.
+
+    Reviews whose hash is in ``cache`` are not scored again. The rest are
+    split into batches of ``batch_size`` and analysed across a process pool.
+    """
+    reviews = reviews.reset_index(drop=True)
+    cached = cache.get(reviews['ReviewHash']) if cache is not None else pd.DataFrame(columns=SCORE_COLUMNS)
+    is_cached = reviews['ReviewHash'].isin(cached.index)
+    pending = reviews[~is_cached]
+
+    batches: List[pd.Series] = [
+        pending['ReviewText'].iloc[start:start + batch_size] for start in range(0, len(pending), batch_size)
+    ]
+    logger.info(f"Scoring {len(pending)} reviews in {len(batches)} batches ({is_cached.sum()} cached)")
+    if len(batches) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=min(len(batches), max_workers or os.cpu_count() or 1)) as executor:
+            results = list(executor.map(analyze_reviews, batches))
+    else:
+        results = [analyze_reviews(batch) for batch in batches]
+
+    scores = pd.concat(results) if results else pd.DataFrame(columns=SCORE_COLUMNS)
+    if cache is not None and not scores.empty:
+        cache.put(pending['ReviewHash'], scores)
+
+    scored = pd.concat([
+        scores.assign(ReviewID=pending['ReviewID']),
+        cached.loc[reviews.loc[is_cached, 'ReviewHash']].reset_index(drop=True).assign(
+            ReviewID=reviews.loc[is_cached, 'ReviewID'].to_numpy()
+        )
+    ], ignore_index=True)
+    return scored[['ReviewID', *SCORE_COLUMNS]]
+
+def enrich_sentiment(dw, model_version: str = MODEL_VERSION, batch_size: int = 2000,
+                     max_workers: Optional[int] = None, cache_dir: Optional[str] = CACHE_DIR):
+    """Score every review in fact.Reviews that has no ``model_version`` sentiment yet.
+
+    Runs on the caller's connection and transaction. Returns (sentiment rows
+    inserted, success) like the other loads.
+    """
+    reviews = dw.reviews_without_sentiment(model_version)
+    if reviews is None:
+        return (0, False)
+    if reviews.empty:
+        logger.info(f"All reviews already have {model_version} sentiment")
+        return (0, True)
+
+    cache = SentimentCache(cache_dir, model_version) if cache_dir else None
+    scores = enrich_reviews(reviews, batch_size, max_workers, cache)
+    return dw.load_review_sentiment(scores, model_version)
@@ -0,0 +1,71 @@
+import logging
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from ETL_pipeline.Transform import clean_review_data, prepare_dw_load_data
+from ETL_pipeline.review_buffer import ReviewBuffer
+
+logger = logging.getLogger('Streaming')
+
+def iter_review_chunks(pages: Iterable[ReviewBuffer], chunk_size: int = 500) -> Iterator[pd.DataFrame]:
+    """Regroup page-sized review buffers into raw DataFrames of ``chunk_size`` rows."""
+    buffer = ReviewBuffer()
+    for reviews_data in pages:
+        buffer.extend(reviews_data)
+        while len(buffer) >= chunk_size:
+            yield buffer[:chunk_size].to_frame()
+            buffer = buffer[chunk_size:]
+    if len(buffer):
+        yield buffer.to_frame()
+
+def iter_clean_chunks(raw_chunks: Iterable[pd.DataFrame],
+                      on_raw_chunk: Optional[Callable[[pd.DataFrame], None]] = None) -> Iterator[pd.DataFrame]:
+    """Clean each raw chunk; ``on_raw_chunk`` is called with every raw chunk before cleaning.
+
+    Duplicates are only dropped within a chunk, so memory stays flat however
+    long the stream runs. A review repeated in a later chunk is skipped by the
+    loader's ReviewHash check against fact.Reviews.
+    """
+    for raw_chunk in raw_chunks:
+        if on_raw_chunk is not None:
+            on_raw_chunk(raw_chunk)
+        cleaned = clean_review_data(raw_chunk)
+        if not cleaned.empty:
+            yield cleaned
+
+def _load_chunk(dw, batch_id: int, cleaned: pd.DataFrame) -> int:
+    """Load one cleaned chunk: dimensions first, then its facts; return the new fact count."""
+    dw_data = prepare_dw_load_data(cleaned)
+    _, _, author_success = dw.load_dimension('Author', dw_data['author_dim'], 'AuthorName')
+    _, _, flight_success = dw.load_dimension(
+        'FlightDetails', dw_data['flight_dim'], ['SeatType', 'Route', 'TypeOfTraveller']
+    )
+    _, route_success = dw.load_route_dimensions(dw_data['route_dim'])
+    if not all([author_success, flight_success, route_success]):
+        raise Exception("Dimension loading failed")
+
+    fact_count, fact_success = dw.load_fact_reviews(dw_data['review_fact'], batch_id)
+    if not fact_success:
+        raise Exception("Fact loading failed")
+    return fact_count
+
+def load_chunks(dw, batch_id: int, cleaned_chunks: Iterable[pd.DataFrame]) -> Tuple[int, bool]:
+    """Load cleaned chunks one at a time, each in its own transaction.
+
+    The open transaction never holds more than one chunk. If a chunk fails,
+    the chunks committed before it stay loaded; a rerun skips them by their
+    ReviewHash. An empty stream is not a failure.
+    """
+    fact_total = 0
+    for chunk_number, cleaned in enumerate(cleaned_chunks, 1):
+        try:
+            with dw.transaction():
+                fact_count = _load_chunk(dw, batch_id, cleaned)
+        except Exception as e:
+            logger.error(f"Loading failed for chunk {chunk_number}: {e}")
+            return (fact_total, False)
+        fact_total += fact_count
+        logger.info(f"Loaded chunk {chunk_number}: {fact_count} facts ({fact_total} so far)")
+
+    return (fact_total, True)
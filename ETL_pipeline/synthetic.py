@@ -0,0 +1,143 @@
+import html
+import logging
+from typing import Iterator, List
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('Synthetic')
+
+SEAT_TYPES = ['Economy Class', 'Premium Economy', 'Business Class', 'First Class']
+TRAVELLER_TYPES = ['Solo Leisure', 'Couple Leisure', 'Family Leisure', 'Business']
+CITIES = [
+    'Addis Ababa', 'London', 'Johannesburg', 'Lagos', 'Nairobi', 'Dubai', 'Frankfurt', 'Toronto',
+    'Washington', 'Bangkok', 'Mumbai', 'Kigali', 'Accra', 'Cairo', 'Rome', 'Beijing'
+]
+COUNTRIES = ['United Kingdom', 'United States', 'South Africa', 'Germany', 'Canada', 'Nigeria', 'India', 'Kenya']
+WORDS = (
+    'flight crew seat food delay staff service comfortable friendly rude late clean dirty '
+    'lounge boarding luggage entertainment legroom meal connection transfer excellent poor'
+).split()
+
+STAR_HEADERS = {
+    'SeatComfort': 'Seat Comfort',
+    'CabinStaffService': 'Cabin Staff Service',
+    'FoodBeverages': 'Food & Beverages',
+    'InflightEntertainment': 'Inflight Entertainment',
+    'GroundService': 'Ground Service',
+    'ValueForMoney': 'Value For Money'
+}
+
+def synthetic_reviews(n: int, seed: int = 0, authors: int = None, routes: int = 2000) -> pd.DataFrame:
+    """Raw reviews shaped like the scraper's output.
+
+    ``authors`` distinct reviewers (default 60% of ``n``) and ``routes``
+    distinct routes keep the dimension sizes realistic. Dates, ratings and
+    the text are random but reproducible for a given seed.
+    """
+    rng = np.random.default_rng(seed)
+    authors = authors or max(1, int(n * 0.6))
+
+    origins = rng.integers(0, len(CITIES), routes)
+    destinations = (origins + rng.integers(1, len(CITIES), routes)) % len(CITIES)
+    route_names = np.array([
+        f"{CITIES[origin]} to {CITIES[destination]}" for origin, destination in zip(origins, destinations)
+    ], dtype=object)
+
+    review_dates = pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3650, n), unit='D')
+    flown_dates = review_dates - pd.to_timedelta(rng.integers(0, 60, n), unit='D')
+    author_ids = rng.integers(0, authors, n)
+    words = np.array(WORDS, dtype=object)
+    text_words = words[rng.integers(0, len(WORDS), (n, 12))]
+
+    reviews = pd.DataFrame({
+        'AuthorName': [f"Reviewer {author_id}" for author_id in author_ids],
+        'AuthorLocation': np.array(COUNTRIES, dtype=object)[author_ids % len(COUNTRIES)],
+        'ReviewDate': review_dates.strftime('%Y-%m-%d'),
+        'ReviewTitle': [f'"{a} {b}"' for a, b in zip(text_words[:, 0], text_words[:, 1])],
+        'ReviewText': [f"Review {i}: {' '.join(row)}" for i, row in enumerate(text_words)],
+        'TypeOfTraveller': np.array(TRAVELLER_TYPES, dtype=object)[rng.integers(0, len(TRAVELLER_TYPES), n)],
+        'SeatType': np.array(SEAT_TYPES, dtype=object)[rng.integers(0, len(SEAT_TYPES), n)],
+        'Route': route_names[rng.integers(0, routes, n)],
+        'DateFlown': flown_dates.strftime('%B %Y'),
+        'Rating': rng.integers(1, 11, n).astype(float)
+    })
+    for column in STAR_HEADERS:
+        reviews[column] = rng.integers(0, 6, n)
+    reviews['RecommendedService'] = np.where(reviews['Rating'] >= 6, 'YES', 'NO')
+    return reviews
+
+def _stars(count: int) -> str:
+    return ''.join(
+        f'<span class="star fill">{star}</span>' if star <= count else f'<span class="star">{star}</span>'
+        for star in range(1, 6)
+    )
+
+def render_review(review: dict, index: int = 0) -> str:
+    """One review as an airlinequality.com review <article>."""
+    rows = [
+        ('type_of_traveller', 'Type Of Traveller', review['TypeOfTraveller']),
+        ('cabin_flown', 'Seat Type', review['SeatType']),
+        ('route', 'Route', review['Route']),
+        ('date_flown', 'Date Flown', review['DateFlown'])
+    ]
+    stats = ''.join(
+        f'<tr><td class="review-rating-header {css}">{header}</td>'
+        f'<td class="review-value ">{html.escape(str(value))}</td></tr>'
+        for css, header, value in rows
+    )
+    stats += ''.join(
+        f'<tr><td class="review-rating-header {column.lower()}">{html.escape(header)}</td>'
+        f'<td class="review-rating-stars stars">{_stars(review[column])}</td></tr>'
+        for column, header in STAR_HEADERS.items() if review[column]
+    )
+    recommended = 'yes' if review['RecommendedService'] == 'YES' else 'no'
+    stats += (
+        f'<tr><td class="review-rating-header recommended">Recommended</td>'
+        f'<td class="review-value rating-{recommended}">{recommended}</td></tr>'
+    )
+    return (
+        f'<article class="comp comp_media-review-rated list-item media position-content review-{index}" '
+        f'itemprop="review" itemscope itemtype="http://schema.org/Review">'
+        f'<meta itemprop="datePublished" content="{review["ReviewDate"]}">'
+        f'<div class="rating-10" itemprop="reviewRating" itemscope itemtype="http://schema.org/Rating">'
+        f'<span itemprop="ratingValue">{int(review["Rating"])}</span>/<span itemprop="bestRating">10</span></div>'
+        f'<div class="body" id="anchor{index}"><h2 class="text_header">{html.escape(review["ReviewTitle"])}</h2>'
+        f'<h3 class="text_sub_header userStatusWrapper"><span itemprop="author" itemscope '
+        f'itemtype="http://schema.org/Person"><span itemprop="name">{html.escape(review["AuthorName"])}</span>'
+        f'</span> ({html.escape(review["AuthorLocation"])}) '
+        f'<time itemprop="datePublished" datetime="{review["ReviewDate"]}">{review["ReviewDate"]}</time></h3>'
+        f'<div class="tc_mobile"><div class="text_content " itemprop="reviewBody">'
+        f'<strong><a href="https://www.airlinequality.com/verified-reviews/"><em>Trip Verified</em></a></strong> | '
+        f'{html.escape(review["ReviewText"])}</div>'
+        f'<div class="review-stats"><table class="review-ratings">{stats}</table></div></div></div></article>'
+    )
+
+def render_page(reviews: pd.DataFrame) -> str:
+    """A review listing page holding the given reviews."""
+    articles = '\n'.join(render_review(review, index) for index, review in enumerate(reviews.to_dict('records')))
+    return (
+        '<!DOCTYPE html><html><head><title>Airline Reviews</title></head><body>'
+        '<div class="site-header"><span itemprop="name">Skytrax</span></div>'
+        f'<section class="layout-section">{articles}</section></body></html>'
+    )
+
+def synthetic_pages(n: int, per_page: int = 100, distinct: int = 10, seed: int = 0) -> Iterator[str]:
+    """Yield listing pages totalling ``n`` reviews.
+
+    Only ``distinct`` pages are rendered and then repeated, so large scales
+    measure parsing rather than page generation.
+    """
+    reviews = synthetic_reviews(min(n, per_page * distinct), seed)
+    pages: List[str] = [
+        render_page(reviews.iloc[start:start + per_page]) for start in range(0, len(reviews), per_page)
+    ]
+    remaining = n
+    page_number = 0
+    while remaining > 0:
+        page = pages[page_number % len(pages)]
+        if remaining < per_page:
+            page = render_page(reviews.iloc[:remaining])
+        yield page
+        remaining -= per_page
+        page_number += 1
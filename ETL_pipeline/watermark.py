@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+import logging
+from typing import Iterable, Optional, Tuple
+
+from ETL_pipeline.review_buffer import ReviewBuffer
+
+logger = logging.getLogger('Watermark')
+
+WATERMARK_FILE = os.path.join('output', 'watermark.json')
+
+def review_identity(review: dict) -> str:
+    """Stable identity hash of a scraped review (author, date, title, text)."""
+    parts = [str(review.get(col, '')) for col in ('AuthorName', 'ReviewDate', 'ReviewTitle', 'ReviewText')]
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+class Watermark:
+    """High-watermark of already-loaded reviews for incremental extraction.
+
+    The site lists reviews newest first, so everything older than
+    ``review_date`` has been loaded. Reviews published on ``review_date``
+    itself are told apart by their identity hashes, because more reviews can
+    appear on that day after the previous run.
+    """
+
+    def __init__(self, review_date: Optional[str] = None, identities: Optional[Iterable[str]] = None):
+        self.review_date = review_date
+        self.identities = set(identities or ())
+
+    def is_new(self, review: dict) -> bool:
+        """Return True if the review is newer than the watermark."""
+        review_date = review.get('ReviewDate')
+        if self.review_date is None or review_date is None:
+            return True
+        if review_date != self.review_date:
+            return review_date > self.review_date
+        return review_identity(review) not in self.identities
+
+    def filter(self, reviews: ReviewBuffer) -> Tuple[ReviewBuffer, bool]:
+        """Split a page into its new reviews and whether the watermark was reached."""
+        is_new = [self.is_new(review) for review in reviews]
+        return reviews.select(is_new), not all(is_new)
+
+    def advance(self, reviews: Iterable[dict]):
+        """Move the watermark past a batch of successfully loaded reviews."""
+        for review in reviews:
+            review_date = review.get('ReviewDate')
+            if review_date is None:
+                continue
+            review_date = str(review_date)[:10]
+            if self.review_date is None or review_date > self.review_date:
+                self.review_date = review_date
+                self.identities = set()
+            if review_date == self.review_date:
+                self.identities.add(review_identity({**review, 'ReviewDate': review_date}))
+
+    @classmethod
+    def load(cls, path: str = WATERMARK_FILE) -> 'Watermark':
+        """Load the watermark from disk, or an empty one if none was saved."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        return cls(state.get('review_date'), state.get('identities'))
+
+    def save(self, path: str = WATERMARK_FILE):
+        """Persist the watermark to disk."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'review_date': self.review_date, 'identities': sorted(self.identities)}, f)
+        logger.info(f"Saved watermark {self.review_date} to {path}")
@@ -0,0 +1,12 @@
+USE BritishAirwaysDW;
+GO
+
+-- Add the review content hash to a warehouse created before it existed.
+-- Existing rows keep a NULL hash until backfilled with main.py --backfill-review-hashes
+IF COL_LENGTH('fact.Reviews', 'ReviewHash') IS NULL
+    ALTER TABLE fact.Reviews ADD ReviewHash CHAR(40) NULL;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_Reviews_ReviewHash')
+    CREATE UNIQUE INDEX UX_Reviews_ReviewHash ON fact.Reviews (ReviewHash) WHERE ReviewHash IS NOT NULL;
+GO
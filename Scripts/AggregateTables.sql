@@ -0,0 +1,70 @@
+USE BritishAirwaysDW;
+GO
+
+-- Every step is skipped if already applied, so the script also upgrades existing warehouses
+IF SCHEMA_ID('agg') IS NULL
+    EXEC(N'CREATE SCHEMA agg');
+GO
+
+-- Reviews per route, traveller type and review month. The sums are kept so
+-- each batch is added incrementally; the averages are derived from them.
+-- A rating or aspect score of 0 means not rated and is left out
+IF OBJECT_ID('agg.RouteMonthSummary') IS NULL
+    CREATE TABLE agg.RouteMonthSummary (
+        Route NVARCHAR(255) NULL,
+        TypeOfTraveller NVARCHAR(50) NULL,
+        MonthKey INT NOT NULL,
+        ReviewCount INT NOT NULL,
+        RecommendCount INT NOT NULL,
+        RatedCount INT NOT NULL,
+        RatingSum FLOAT NOT NULL,
+        AvgRating DECIMAL(4,2) NULL,
+        RecommendRate DECIMAL(5,4) NULL,
+        LastBatchID INT NOT NULL,
+        RefreshedDate DATETIME NOT NULL DEFAULT GETDATE()
+    );
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_RouteMonthSummary')
+    CREATE UNIQUE INDEX UX_RouteMonthSummary ON agg.RouteMonthSummary (MonthKey, Route, TypeOfTraveller);
+GO
+
+-- One row per service aspect (SeatComfort, FoodBeverages, ...) of each summary
+-- group, with the sums behind the aspect's mean and its correlation with Rating
+IF OBJECT_ID('agg.RouteMonthAspect') IS NULL
+    CREATE TABLE agg.RouteMonthAspect (
+        Route NVARCHAR(255) NULL,
+        TypeOfTraveller NVARCHAR(50) NULL,
+        MonthKey INT NOT NULL,
+        Aspect NVARCHAR(30) NOT NULL,
+        RatedCount INT NOT NULL,
+        AspectSum FLOAT NOT NULL,
+        AspectSqSum FLOAT NOT NULL,
+        RatingSum FLOAT NOT NULL,
+        RatingSqSum FLOAT NOT NULL,
+        RatingAspectSum FLOAT NOT NULL,
+        AvgAspect DECIMAL(4,2) NULL,
+        AvgRating DECIMAL(4,2) NULL,
+        RatingCorrelation DECIMAL(5,4) NULL,
+        LastBatchID INT NOT NULL,
+        RefreshedDate DATETIME NOT NULL DEFAULT GETDATE()
+    );
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_RouteMonthAspect')
+    CREATE UNIQUE INDEX UX_RouteMonthAspect ON agg.RouteMonthAspect (MonthKey, Route, TypeOfTraveller, Aspect);
+GO
+
+-- Batches already added to the summaries; each batch is added exactly once
+IF OBJECT_ID('agg.RefreshLog') IS NULL
+    CREATE TABLE agg.RefreshLog (
+        BatchID INT PRIMARY KEY,
+        RefreshDate DATETIME NOT NULL DEFAULT GETDATE(),
+        ReviewsAggregated INT NOT NULL
+    );
+GO
+
+-- Summary refreshes read only the reviews of new batches
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Reviews_BatchID')
+    CREATE INDEX IX_Reviews_BatchID ON fact.Reviews (BatchID);
+GO
@@ -1,5 +1,9 @@
+-- Failed runs no longer leave partial facts (each load stage is one transaction);
+-- resume them with main.py --resume instead of cleaning up by hand.
+
 -- Clean up any partial data from previous failed runs
 DELETE FROM fact.Reviews WHERE BatchID = 1;
+DELETE FROM fact.ReviewText WHERE TextID NOT IN (SELECT TextID FROM fact.Reviews);
 DELETE FROM dim.FlightDetails;
 DELETE FROM dim.Author;
 DELETE FROM audit.ETLBatch WHERE BatchID = 1;
@@ -7,6 +11,7 @@ DELETE FROM audit.ETLBatch WHERE BatchID = 1;
 
 -- Clean up any partial data
 DELETE FROM fact.Reviews WHERE BatchID = 3;
+DELETE FROM fact.ReviewText WHERE TextID NOT IN (SELECT TextID FROM fact.Reviews);
 DELETE FROM dim.FlightDetails;
 DELETE FROM dim.Author;
 DELETE FROM audit.ETLBatch WHERE BatchID = 3;
\ No newline at end of file
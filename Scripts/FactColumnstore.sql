@@ -0,0 +1,42 @@
+USE BritishAirwaysDW;
+GO
+
+-- Yearly partitions of fact.Reviews on ReviewDateKey (yyyymmdd), through five
+-- years ahead; add later years with ALTER PARTITION FUNCTION ... SPLIT RANGE
+DECLARE @boundaries NVARCHAR(MAX) = N'20010101';
+DECLARE @year INT = 2002;
+WHILE @year <= YEAR(GETDATE()) + 5
+BEGIN
+    SET @boundaries += N', ' + CAST(@year * 10000 + 101 AS NVARCHAR(8));
+    SET @year += 1;
+END
+EXEC(N'CREATE PARTITION FUNCTION PF_ReviewDateKey (INT) AS RANGE RIGHT FOR VALUES (' + @boundaries + N')');
+GO
+
+CREATE PARTITION SCHEME PS_ReviewDateKey AS PARTITION PF_ReviewDateKey ALL TO ([PRIMARY]);
+GO
+
+-- The clustered primary key on ReviewID gives way to the columnstore; drop it
+-- and the foreign keys that reference it
+DECLARE @sql NVARCHAR(MAX) = N'';
+SELECT @sql += N'ALTER TABLE ' + QUOTENAME(OBJECT_SCHEMA_NAME(parent_object_id)) + N'.'
+    + QUOTENAME(OBJECT_NAME(parent_object_id)) + N' DROP CONSTRAINT ' + QUOTENAME(name) + N';'
+FROM sys.foreign_keys
+WHERE referenced_object_id = OBJECT_ID('fact.Reviews');
+SELECT @sql += N'ALTER TABLE fact.Reviews DROP CONSTRAINT ' + QUOTENAME(name) + N';'
+FROM sys.key_constraints
+WHERE parent_object_id = OBJECT_ID('fact.Reviews') AND type = 'PK';
+EXEC sp_executesql @sql;
+GO
+
+-- Rating scans read only the columns and date partitions they need
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_Reviews ON fact.Reviews ON PS_ReviewDateKey (ReviewDateKey);
+GO
+
+-- ReviewID lookups stay B-tree seeks
+ALTER TABLE fact.Reviews ADD CONSTRAINT PK_Reviews PRIMARY KEY NONCLUSTERED (ReviewID) ON [PRIMARY];
+GO
+
+ALTER TABLE fact.ReviewSentiment ADD CONSTRAINT FK_ReviewSentiment_Reviews
+    FOREIGN KEY (ReviewID) REFERENCES fact.Reviews (ReviewID);
+GO
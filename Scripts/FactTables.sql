@@ -1,6 +1,20 @@
 USE BritishAirwaysDW;
 GO
 
+-- Review texts, gzip-compressed (SQL Server COMPRESS format) and stored once per distinct text
+CREATE TABLE fact.ReviewText (
+    TextID INT IDENTITY(1,1) PRIMARY KEY,
+    TextHash CHAR(40) NOT NULL,
+    TextLength INT NOT NULL,
+    CompressedText VARBINARY(MAX) NOT NULL,
+    LoadDate DATETIME NOT NULL DEFAULT GETDATE()
+);
+GO
+
+-- SHA-1 of the UTF-16 text, i.e. HASHBYTES('SHA1', text); loads reuse stored texts
+CREATE UNIQUE INDEX UX_ReviewText_TextHash ON fact.ReviewText (TextHash);
+GO
+
 -- Create Review Fact table
 CREATE TABLE fact.Reviews (
     ReviewID INT IDENTITY(1,1) PRIMARY KEY,
@@ -10,7 +24,8 @@ CREATE TABLE fact.Reviews (
     DateFlownKey INT NULL FOREIGN KEY REFERENCES dim.Date(DateKey),
     Rating DECIMAL(3,1) NOT NULL,
     ReviewTitle NVARCHAR(255) NOT NULL,
-    ReviewText NVARCHAR(MAX) NOT NULL,
+    TextID INT NOT NULL FOREIGN KEY REFERENCES fact.ReviewText(TextID),
+    IsVerified BIT NULL,
     SeatComfort TINYINT NULL,
     CabinStaffService TINYINT NULL,
     FoodBeverages TINYINT NULL,
@@ -20,10 +35,21 @@ CREATE TABLE fact.Reviews (
     RecommendedService NVARCHAR(10) NOT NULL,
     LoadDate DATETIME NOT NULL DEFAULT GETDATE(),
     SourceSystem NVARCHAR(50) NOT NULL DEFAULT 'WebScraper',
-    BatchID INT NOT NULL
+    BatchID INT NOT NULL,
+    ReviewHash CHAR(40) NULL
 );
 GO
 
+-- Content hash of (author, review date, title, text); reloads skip reviews already stored
+CREATE UNIQUE INDEX UX_Reviews_ReviewHash ON fact.Reviews (ReviewHash) WHERE ReviewHash IS NOT NULL;
+GO
+
+-- Review text readable in T-SQL
+CREATE VIEW fact.ReviewTextView AS
+SELECT TextID, TextHash, CAST(DECOMPRESS(CompressedText) AS NVARCHAR(MAX)) AS ReviewText
+FROM fact.ReviewText;
+GO
+
 -- Create Review Sentiment Analysis table
 CREATE TABLE fact.ReviewSentiment (
     SentimentID INT IDENTITY(1,1) PRIMARY KEY,
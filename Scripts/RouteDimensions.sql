@@ -0,0 +1,56 @@
+USE BritishAirwaysDW;
+GO
+
+-- Airports and cities named in routes, resolved to one canonical name each
+CREATE TABLE dim.Airport (
+    AirportID INT IDENTITY(1,1) PRIMARY KEY,
+    AirportName NVARCHAR(100) NOT NULL,
+    AirportCode CHAR(3) NULL,
+    City NVARCHAR(100) NULL,
+    CreatedDate DATETIME NOT NULL DEFAULT GETDATE(),
+    ModifiedDate DATETIME NULL
+);
+GO
+
+CREATE UNIQUE INDEX UX_Airport_AirportName ON dim.Airport (AirportName);
+GO
+
+-- One row per canonical route, e.g. 'Addis Ababa to Kigali via Juba'
+CREATE TABLE dim.Route (
+    RouteID INT IDENTITY(1,1) PRIMARY KEY,
+    RouteName NVARCHAR(255) NOT NULL,
+    OriginAirportID INT NOT NULL FOREIGN KEY REFERENCES dim.Airport(AirportID),
+    DestinationAirportID INT NOT NULL FOREIGN KEY REFERENCES dim.Airport(AirportID),
+    StopCount TINYINT NOT NULL,
+    CreatedDate DATETIME NOT NULL DEFAULT GETDATE(),
+    ModifiedDate DATETIME NULL
+);
+GO
+
+CREATE UNIQUE INDEX UX_Route_RouteName ON dim.Route (RouteName);
+GO
+
+CREATE INDEX IX_Route_Airports ON dim.Route (OriginAirportID, DestinationAirportID);
+GO
+
+-- Ordered legs of each route: origin -> via stops -> destination
+CREATE TABLE dim.RouteSegment (
+    RouteID INT NOT NULL FOREIGN KEY REFERENCES dim.Route(RouteID),
+    SegmentNumber TINYINT NOT NULL,
+    FromAirportID INT NOT NULL FOREIGN KEY REFERENCES dim.Airport(AirportID),
+    ToAirportID INT NOT NULL FOREIGN KEY REFERENCES dim.Airport(AirportID),
+    CreatedDate DATETIME NOT NULL DEFAULT GETDATE(),
+    ModifiedDate DATETIME NULL,
+    PRIMARY KEY (RouteID, SegmentNumber)
+);
+GO
+
+CREATE INDEX IX_RouteSegment_Airports ON dim.RouteSegment (FromAirportID, ToAirportID);
+GO
+
+-- Flight details of routes that parse point at their route; others stay NULL
+ALTER TABLE dim.FlightDetails ADD RouteID INT NULL FOREIGN KEY REFERENCES dim.Route(RouteID);
+GO
+
+CREATE INDEX IX_FlightDetails_RouteID ON dim.FlightDetails (RouteID);
+GO
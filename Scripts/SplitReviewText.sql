@@ -0,0 +1,105 @@
+USE BritishAirwaysDW;
+GO
+
+-- Move the review text of a warehouse created before fact.ReviewText existed
+-- into that table and split the verification marker ("✅ Trip Verified |")
+-- into IsVerified. ReviewHash now covers the text without the marker, so the
+-- hashes are reset: recompute them with main.py --backfill-review-hashes
+IF OBJECT_ID('fact.ReviewText') IS NULL
+    CREATE TABLE fact.ReviewText (
+        TextID INT IDENTITY(1,1) PRIMARY KEY,
+        TextHash CHAR(40) NOT NULL,
+        TextLength INT NOT NULL,
+        CompressedText VARBINARY(MAX) NOT NULL,
+        LoadDate DATETIME NOT NULL DEFAULT GETDATE()
+    );
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_ReviewText_TextHash')
+    CREATE UNIQUE INDEX UX_ReviewText_TextHash ON fact.ReviewText (TextHash);
+GO
+
+IF COL_LENGTH('fact.Reviews', 'TextID') IS NULL
+    ALTER TABLE fact.Reviews ADD TextID INT NULL;
+GO
+
+IF COL_LENGTH('fact.Reviews', 'IsVerified') IS NULL
+    ALTER TABLE fact.Reviews ADD IsVerified BIT NULL;
+GO
+
+IF COL_LENGTH('fact.Reviews', 'ReviewText') IS NOT NULL
+    EXEC(N'
+        -- Whitespace as stripped by Transform.VERIFICATION_PATTERN, NBSP included
+        DECLARE @NotSpace NVARCHAR(20) =
+            N''%[^ '' + NCHAR(9) + NCHAR(10) + NCHAR(11) + NCHAR(12) + NCHAR(13) + NCHAR(160) + N'']%'';
+
+        -- The same test as VERIFICATION_PATTERN: at the start, a marker phrase after
+        -- at most 3 symbols, one letter and 3 more symbols, then "|" and whitespace.
+        -- The x appended before PATINDEX points Bar and BodyStart past the end when
+        -- nothing but whitespace follows
+        WITH markers AS (
+            SELECT r.ReviewID, p.IsVerified, b.BodyStart
+            FROM fact.Reviews r
+            CROSS JOIN (VALUES
+                (N''trip verified'', 1), (N''verified review'', 1), (N''not verified'', 0), (N''unverified'', 0)
+            ) p (Phrase, IsVerified)
+            CROSS APPLY (SELECT CHARINDEX(p.Phrase, LOWER(r.ReviewText)) AS Start) s
+            CROSS APPLY (SELECT
+                LOWER(LEFT(r.ReviewText, IIF(s.Start BETWEEN 1 AND 8, s.Start - 1, 0))) AS Prefix,
+                s.Start + LEN(p.Phrase) - 1
+                    + PATINDEX(@NotSpace, SUBSTRING(r.ReviewText, s.Start + LEN(p.Phrase), DATALENGTH(r.ReviewText) / 2) + N''x'') AS Bar
+            ) m
+            CROSS APPLY (SELECT
+                PATINDEX(N''%[a-z0-9_]%'', m.Prefix) AS WordChar,
+                m.Bar + PATINDEX(@NotSpace, SUBSTRING(r.ReviewText, m.Bar + 1, DATALENGTH(r.ReviewText) / 2) + N''x'') AS BodyStart
+            ) b
+            WHERE s.Start BETWEEN 1 AND 8
+              AND SUBSTRING(r.ReviewText, m.Bar, 1) = N''|''
+              AND (   (b.WordChar = 0 AND s.Start - 1 <= 6)
+                   OR (b.WordChar BETWEEN 1 AND 4 AND s.Start - 1 - b.WordChar <= 3
+                       AND PATINDEX(N''%[a-z0-9_]%'', SUBSTRING(m.Prefix, b.WordChar + 1, 8)) = 0))
+        )
+        UPDATE r SET
+            IsVerified = m.IsVerified,
+            ReviewText = CASE
+                WHEN m.ReviewID IS NULL THEN r.ReviewText
+                ELSE SUBSTRING(r.ReviewText, m.BodyStart, DATALENGTH(r.ReviewText) / 2)
+            END,
+            ReviewHash = NULL
+        FROM fact.Reviews r
+        LEFT JOIN markers m ON m.ReviewID = r.ReviewID;
+
+        INSERT INTO fact.ReviewText (TextHash, TextLength, CompressedText)
+        SELECT h.TextHash, DATALENGTH(MAX(h.ReviewText)) / 2, COMPRESS(MAX(h.ReviewText))
+        FROM (
+            SELECT LOWER(CONVERT(CHAR(40), HASHBYTES(''SHA1'', ReviewText), 2)) AS TextHash, ReviewText
+            FROM fact.Reviews
+        ) h
+        WHERE NOT EXISTS (SELECT 1 FROM fact.ReviewText t WHERE t.TextHash = h.TextHash)
+        GROUP BY h.TextHash;
+
+        UPDATE r SET TextID = t.TextID
+        FROM fact.Reviews r
+        JOIN fact.ReviewText t
+          ON t.TextHash = LOWER(CONVERT(CHAR(40), HASHBYTES(''SHA1'', r.ReviewText), 2));
+    ');
+GO
+
+IF COL_LENGTH('fact.Reviews', 'ReviewText') IS NOT NULL
+BEGIN
+    ALTER TABLE fact.Reviews DROP COLUMN ReviewText;
+    ALTER TABLE fact.Reviews ALTER COLUMN TextID INT NOT NULL;
+    ALTER TABLE fact.Reviews ADD CONSTRAINT FK_Reviews_ReviewText
+        FOREIGN KEY (TextID) REFERENCES fact.ReviewText(TextID);
+    -- Reclaim the space of the dropped column
+    ALTER TABLE fact.Reviews REBUILD;
+END
+GO
+
+IF OBJECT_ID('fact.ReviewTextView') IS NULL
+    EXEC(N'
+        CREATE VIEW fact.ReviewTextView AS
+        SELECT TextID, TextHash, CAST(DECOMPRESS(CompressedText) AS NVARCHAR(MAX)) AS ReviewText
+        FROM fact.ReviewText
+    ');
+GO
@@ -0,0 +1,29 @@
+USE BritishAirwaysDW;
+GO
+
+-- Foreign keys of fact.Reviews, for dimension joins and filters on them
+CREATE INDEX IX_Reviews_AuthorID ON fact.Reviews (AuthorID);
+GO
+
+CREATE INDEX IX_Reviews_FlightDetailID ON fact.Reviews (FlightDetailID);
+GO
+
+CREATE INDEX IX_Reviews_ReviewDateKey ON fact.Reviews (ReviewDateKey);
+GO
+
+-- Sentiment enrichment looks up each review's row for a model version
+CREATE INDEX IX_ReviewSentiment_ReviewID ON fact.ReviewSentiment (ReviewID, ModelVersion);
+GO
+
+-- Business keys load_dimension matches staged rows on
+CREATE INDEX IX_Author_AuthorName ON dim.Author (AuthorName);
+GO
+
+CREATE INDEX IX_FlightDetails_BusinessKey ON dim.FlightDetails (SeatType, Route, TypeOfTraveller);
+GO
+
+CREATE INDEX IX_DataLoadLog_BatchID ON audit.DataLoadLog (BatchID);
+GO
+
+CREATE INDEX IX_DataQualityLog_BatchID ON audit.DataQualityLog (BatchID);
+GO
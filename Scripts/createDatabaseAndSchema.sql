@@ -25,4 +25,7 @@ CREATE SCHEMA fact;
 GO
 
 CREATE SCHEMA audit;
+GO
+
+CREATE SCHEMA agg;
 GO
\ No newline at end of file
@@ -0,0 +1,182 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from ETL_pipeline.Extract import PARSER_BACKENDS, parse_reviews
+from ETL_pipeline.Load import DWConnection
+from ETL_pipeline.Transform import clean_review_data, prepare_dw_load_data
+from ETL_pipeline.dw_backends import create_backend
+from ETL_pipeline.metrics import PipelineMetrics
+from ETL_pipeline.synthetic import synthetic_pages, synthetic_reviews
+
+# Configure logging; the pipeline modules' INFO output would swamp the summary
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    force=True
+)
+
+DEFAULT_SCALES = [1000, 100000, 1000000]
+STAGES = ['parse', 'clean', 'prepare', 'load']
+REPORT_DIR = os.path.join('output', 'benchmarks')
+
+# HTML parsing runs at a few thousand rows/s, so large scales parse a sample
+MAX_PARSE_ROWS = 100000
+
+def benchmark_scale(n: int, stages: List[str], parser: Optional[str], backend: str, database: str,
+                    trace_memory: bool, max_parse_rows: int = MAX_PARSE_ROWS, partitions: int = 1) -> List[dict]:
+    """Run the selected stages on ``n`` synthetic reviews; return the stage records.
+
+    Parsing covers at most ``max_parse_rows`` reviews. Loading needs the
+    cleaned and prepared frames, so it also runs (and reports) the clean and
+    prepare stages. Facts are loaded in ``partitions`` partitions, in the
+    dimensions' transaction like the pipeline's load; a failed load raises.
+    """
+    metrics = PipelineMetrics(report_dir=REPORT_DIR, trace_memory=trace_memory)
+
+    if 'parse' in stages:
+        pages = synthetic_pages(min(n, max_parse_rows))
+        with metrics.stage('parse', f'parse.{parser or "default"}') as record:
+            for html in pages:
+                record['rows'] += len(parse_reviews(html, parser))
+
+    if not {'clean', 'prepare', 'load'} & set(stages):
+        return metrics.records
+
+    raw_reviews = synthetic_reviews(n)
+    with metrics.stage('clean') as record:
+        cleaned_data = clean_review_data(raw_reviews)
+        record['rows'] = len(cleaned_data)
+    del raw_reviews
+
+    with metrics.stage('prepare') as record:
+        dw_data = prepare_dw_load_data(cleaned_data)
+        record['rows'] = len(dw_data['review_fact'])
+    del cleaned_data
+
+    if 'load' in stages:
+        # A separate key cache per scale; the stand-in starts empty every time
+        dw = DWConnection(f'benchmark-{n}', database, create_backend('local', database, backend))
+        if not dw.connect():
+            raise RuntimeError(f"Could not open the benchmark warehouse {database}")
+        try:
+            batch_id = dw.start_etl_batch('Benchmark')
+            with dw.transaction():
+                dimensions = [
+                    ('Author', 'author_dim', 'AuthorName'),
+                    ('FlightDetails', 'flight_dim', ['SeatType', 'Route', 'TypeOfTraveller'])
+                ]
+                for table_name, key, key_columns in dimensions:
+                    with metrics.stage(f'load_{key}', f'dim.{table_name}', 'Incremental') as record:
+                        inserted, updated, _ = dw.load_dimension(table_name, dw_data[key], key_columns)
+                        record['rows_inserted'], record['rows_updated'] = inserted, updated
+                with metrics.stage('load_route_dim', 'dim.Route', 'Incremental') as record:
+                    record['rows_inserted'], _ = dw.load_route_dimensions(dw_data['route_dim'])
+                with metrics.stage('load_review_fact', 'fact.Reviews', 'Insert') as record:
+                    fact_count, success = dw.load_fact_reviews(
+                        dw_data['review_fact'], batch_id, partitions=partitions
+                    )
+                    if not success:
+                        raise RuntimeError(f"Loading {n} facts into {database} failed")
+                    record['rows_inserted'] = fact_count
+                dw.complete_etl_batch(batch_id, 'Completed', fact_count)
+        finally:
+            dw.close()
+
+    return metrics.records
+
+def compare_to_baseline(results: Dict[str, List[dict]], baseline_path: str, tolerance: float) -> List[str]:
+    """Return a message for every stage whose rows/s fell more than ``tolerance`` below the baseline."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    for scale, records in results.items():
+        previous = {record['stage']: record for record in baseline.get(scale, [])}
+        for record in records:
+            before = previous.get(record['stage'], {}).get('rows_per_s')
+            after = record['rows_per_s']
+            if before and after is not None and after < before * (1 - tolerance):
+                regressions.append(
+                    f"{record['stage']} at {scale} rows: {after:,.0f} rows/s vs {before:,.0f} in baseline"
+                )
+    return regressions
+
+def print_summary(results: Dict[str, List[dict]]):
+    print(f"{'scale':>9}  {'stage':<18} {'seconds':>9} {'rows/s':>12} {'peak MB':>9}")
+    for scale, records in results.items():
+        for record in records:
+            peak = record['peak_memory_mb']
+            print(
+                f"{int(scale):>9,}  {record['stage']:<18} {record['duration_s']:>9.3f} "
+                f"{record['rows_per_s'] or 0:>12,.0f} {peak if peak is not None else '-':>9}"
+            )
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark parsing, cleaning and loading on synthetic reviews against a local warehouse"
+    )
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help="Numbers of reviews to benchmark")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES,
+                        help="Stages to report")
+    parser.add_argument('--parser', choices=sorted(PARSER_BACKENDS),
+                        help="HTML parser backend (default: the one fetch_reviews uses)")
+    parser.add_argument('--max-parse-rows', type=int, default=MAX_PARSE_ROWS,
+                        help="Most reviews to parse per scale")
+    parser.add_argument('--backend', choices=['sqlite', 'duckdb'], default='sqlite',
+                        help="Local engine standing in for the warehouse")
+    parser.add_argument('--database', default=':memory:',
+                        help="Database file of the local warehouse")
+    parser.add_argument('--load-partitions', type=int, default=1, metavar='N',
+                        help="Stage the facts in N partitions (needs a --database file on sqlite)")
+    parser.add_argument('--no-trace-memory', action='store_true',
+                        help="Skip tracemalloc; timings are faster but peak memory is not reported")
+    parser.add_argument('--output', help="Path of the JSON report")
+    parser.add_argument('--baseline', help="Earlier JSON report to compare rows/s against")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed rows/s drop against the baseline (fraction)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    results = {}
+    for n in args.scales:
+        print(f"Benchmarking {n:,} reviews")
+        results[str(n)] = benchmark_scale(
+            n, args.stages, args.parser, args.backend, args.database, not args.no_trace_memory, args.max_parse_rows,
+            args.load_partitions
+        )
+
+    print_summary(results)
+
+    output = args.output or os.path.join(REPORT_DIR, f"benchmark_{datetime.now():%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'backend': args.backend,
+            'load_partitions': args.load_partitions,
+            'trace_memory': not args.no_trace_memory,
+            'results': results
+        }, f, indent=2, default=str)
+    print(f"Wrote benchmark report to {output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance)
+        for message in regressions:
+            print(f"Regression: {message}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
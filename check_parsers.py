@@ -0,0 +1,62 @@
+import argparse
+import glob
+import os
+import sys
+from typing import List
+
+from ETL_pipeline.Extract import PARSER_BACKENDS
+from ETL_pipeline.synthetic import synthetic_pages
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', '*.html')
+
+def compare_backends(html: str, label: str) -> List[str]:
+    """Parse a page with every parser backend; return a message for each review field where they differ."""
+    parsed = {backend: list(parse(html)) for backend, parse in sorted(PARSER_BACKENDS.items())}
+    (reference, expected), *others = parsed.items()
+    if not expected:
+        return [f"{label}: {reference} found no reviews"]
+
+    differences = []
+    for backend, reviews in others:
+        if len(reviews) != len(expected):
+            differences.append(f"{label}: {reference} found {len(expected)} reviews, {backend} {len(reviews)}")
+            continue
+        for number, (review, other) in enumerate(zip(expected, reviews), 1):
+            for field, value in review.items():
+                if other[field] != value:
+                    differences.append(
+                        f"{label} review {number} {field}: {reference}={value!r} {backend}={other[field]!r}"
+                    )
+    return differences
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Check that the lxml and bs4 review parsers build identical reviews from the same pages"
+    )
+    parser.add_argument('pages', nargs='*', help="Saved review pages (default: fixtures/*.html)")
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help="Also compare this many synthetic reviews")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if len(PARSER_BACKENDS) < 2:
+        print(f"Only the {', '.join(PARSER_BACKENDS)} parser is available; install lxml to compare backends")
+        sys.exit(2)
+
+    differences = []
+    for path in args.pages or sorted(glob.glob(FIXTURES)):
+        with open(path, encoding='utf-8') as f:
+            differences.extend(compare_backends(f.read(), os.path.basename(path)))
+    if args.synthetic:
+        for number, page in enumerate(synthetic_pages(args.synthetic), 1):
+            differences.extend(compare_backends(page, f"synthetic page {number}"))
+
+    for message in differences:
+        print(message)
+    if differences:
+        sys.exit(1)
+    print(f"Parser backends {' and '.join(sorted(PARSER_BACKENDS))} agree")
+
+if __name__ == "__main__":
+    main()
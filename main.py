@@ -1,10 +1,25 @@
 import pandas as pd
-from typing import Dict
-from ETL_pipeline.Extract import check_connection, fetch_reviews
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from ETL_pipeline.Extract import (
+    DEFAULT_AIRLINE, airline_url, check_connection, configure_cache, fetch_pages, is_replay, iter_pages
+)
+from ETL_pipeline.page_cache import PageCache
+from ETL_pipeline.review_buffer import ReviewBuffer
+from ETL_pipeline.manifest import load_manifest, run_manifest
+from ETL_pipeline.streaming import iter_clean_chunks, iter_review_chunks, load_chunks
 from ETL_pipeline.Transform import clean_review_data, prepare_dw_load_data, save_intermediate_data
+from ETL_pipeline.intermediate_store import read_intermediate_data
 from ETL_pipeline.Load import DWConnection
-import time
+from ETL_pipeline.dimension_cache import get_dimension_cache, snapshot_path
+from ETL_pipeline.dw_backends import DW_BACKENDS, configure_backend
+from ETL_pipeline.metrics import PipelineMetrics
+from ETL_pipeline.sentiment import enrich_sentiment
+from ETL_pipeline.aggregates import refresh_summaries
+from ETL_pipeline.checkpoint import RUNS_DIR, RunManifest
+from ETL_pipeline.watermark import Watermark, WATERMARK_FILE
+import argparse
 import logging
+import os
 import sys
 
 
@@ -18,118 +33,554 @@ logging.basicConfig(
     ]
 )
 
-def scrape_reviews(pages: int = 7, offset: int = 100) -> pd.DataFrame:
-    """Scrape reviews from the website."""
-    url = 'https://www.airlinequality.com/airline-reviews/ethiopian-airlines/'
-    if not check_connection(url):
+# First day generated into an empty dim.Date; cleaning drops reviews before 2000
+DATE_DIM_START = '2000-01-01'
+
+def scrape_reviews(pages: int = 7, offset: int = 100, max_workers: int = 4,
+                   rate: float = 1.0, watermark: Optional[Watermark] = None,
+                   airline: str = DEFAULT_AIRLINE) -> pd.DataFrame:
+    """Scrape reviews from the website, fetching pages concurrently.
+
+    With a watermark only reviews newer than it are scraped. The numbers of
+    pages that could not be fetched are kept in the frame's
+    ``attrs['failed_pages']``.
+    """
+    url = airline_url(airline)
+    if not is_replay() and not check_connection(url):
         logging.error("Failed to connect to the URL. Please check your connection.")
         return pd.DataFrame()
 
-    all_reviews = []
-    for i in range(1, pages + 1):
-        reviews_data = fetch_reviews(i, offset)
-        all_reviews.extend(reviews_data)
-        time.sleep(2)
+    failed_pages = []
+    all_reviews = fetch_pages(pages, offset, max_workers=max_workers, rate=rate, watermark=watermark,
+                              airline=airline, failed_pages=failed_pages)
+    raw_reviews = all_reviews.to_frame()
+    raw_reviews.attrs['failed_pages'] = failed_pages
+    return raw_reviews
+
+def stream_reviews(pages: int = 7, offset: int = 100, max_workers: int = 4,
+                   rate: float = 1.0, watermark: Optional[Watermark] = None,
+                   airline: str = DEFAULT_AIRLINE, failed_pages: Optional[List[int]] = None) -> Iterator[ReviewBuffer]:
+    """Like scrape_reviews, but yield each page's reviews as the consumer asks for them.
+
+    Pages that could not be fetched are appended to ``failed_pages``.
+    """
+    url = airline_url(airline)
+    if not is_replay() and not check_connection(url):
+        logging.error("Failed to connect to the URL. Please check your connection.")
+        return iter(())
+    return iter_pages(pages, offset, max_workers=max_workers, rate=rate, watermark=watermark,
+                      airline=airline, failed_pages=failed_pages)
+
+def save_watermark(previous: Watermark, advanced: Watermark, failed_pages: List[int]):
+    """Save the advanced watermark, or the previous one again if a page failed.
+
+    Saving the previous watermark keeps the next run from falling back to
+    the DW's latest ReviewDate and skipping the failed pages' reviews.
+    """
+    if failed_pages:
+        logging.warning(f"Pages {failed_pages} could not be fetched; the watermark is left at "
+                        f"{previous.review_date} so the next run fetches them again")
+        previous.save(WATERMARK_FILE)
+    else:
+        advanced.save(WATERMARK_FILE)
+
+def load_watermark(server: str, database: str) -> Watermark:
+    """Load the extraction watermark, falling back to the latest ReviewDate in the DW if none was saved."""
+    watermark = Watermark.load(WATERMARK_FILE)
+    if os.path.exists(WATERMARK_FILE):
+        return watermark
 
-    return pd.DataFrame(all_reviews)
+    dw = DWConnection(server, database)
+    if dw.connect():
+        try:
+            watermark.review_date = dw.get_latest_review_date()
+        finally:
+            dw.close()
+    return watermark
 
 def verify_date_dimension(dw: DWConnection) -> bool:
-    """Verify date dimension is populated."""
+    """Verify date dimension is populated, generating it when empty."""
     try:
         cursor = dw.connection.cursor()
         cursor.execute("SELECT COUNT(*) FROM dim.Date")
         date_count = cursor.fetchone()[0]
         if date_count == 0:
-            logging.error("Date dimension is empty! Please run the SQL script to populate dim.Date")
-            return False
+            logging.warning("Date dimension is empty, generating dim.Date")
+            date_count = dw.populate_date_dimension(DATE_DIM_START, f"{pd.Timestamp.now().year + 1}-12-31")
+            if date_count == 0:
+                return False
+            dw.connection.commit()
         logging.info(f"Verified date dimension contains {date_count} records")
         return True
-    except pyodbc.Error as e:
+    except dw.backend.errors as e:
         logging.error(f"Error verifying date dimension: {e}")
         return False
 
-def load_to_dw(data_dict: Dict[str, pd.DataFrame], server: str, database: str) -> bool:
-    """Load data into DW with transaction support."""
+def enrich_loaded_reviews(dw: DWConnection, metrics: PipelineMetrics):
+    """Score the reviews that have no sentiment yet into fact.ReviewSentiment."""
+    with metrics.stage('enrich_sentiment', 'fact.ReviewSentiment', 'Insert') as record:
+        sentiment_count, success = enrich_sentiment(dw)
+        if not success:
+            raise Exception("Sentiment enrichment failed")
+        record['rows_inserted'] = sentiment_count
+
+def refresh_summary_tables(dw: DWConnection, batch_id: int, metrics: PipelineMetrics):
+    """Add the batch's reviews to the agg summary tables."""
+    with metrics.stage('refresh_summaries', 'agg.RouteMonthSummary', 'Incremental') as record:
+        review_count, success = refresh_summaries(dw, batch_id)
+        if not success:
+            raise Exception("Summary refresh failed")
+        record['rows'] = review_count
+
+LoadStage = Callable[[DWConnection, int, PipelineMetrics], int]
+
+def run_dw_load(load_stages: List[Tuple[str, LoadStage]], server: str, database: str,
+                key_snapshot: Optional[str] = None, metrics: Optional[PipelineMetrics] = None,
+                run: Optional[RunManifest] = None, source_system: str = 'WebScraper') -> bool:
+    """Run each ``(name, load(dw, batch_id, metrics))`` stage in its own transaction, in one ETL batch.
+
+    Each load returns the number of fact rows it loaded and raises on
+    failure. With ``key_snapshot`` the dimension key cache is warm-started
+    from that file and saved back to it after a successful load. The stage
+    metrics collected so far are written to audit.DataLoadLog for the batch.
+    With ``run`` the BatchID and every committed stage are checkpointed in
+    the run manifest; a resumed run reopens its failed batch and skips the
+    stages that already committed.
+    """
+    metrics = metrics or PipelineMetrics()
+    if key_snapshot:
+        get_dimension_cache(server, database).load_snapshot(key_snapshot)
+
     dw = DWConnection(server, database)
     if not dw.connect():
         return False
 
+    batch_id = None
+    stage_name = None
     try:
         # Verify date dimension first
         if not verify_date_dimension(dw):
             return False
 
-        # Start ETL batch
-        batch_id = dw.start_etl_batch('WebScraper')
-        if batch_id is None:
-            logging.error("Failed to start ETL batch")
-            return False
-        logging.info(f"Started ETL batch with ID: {batch_id}")
-
-        # Process in transaction
-        with dw.transaction():
-            # Load dimensions
-            author_count, author_success = dw.load_dimension('Author', data_dict['author_dim'], 'AuthorName')
-            flight_count, flight_success = dw.load_dimension('FlightDetails', data_dict['flight_dim'], 'Route')
-            
-            if not all([author_success, flight_success]):
-                raise Exception("Dimension loading failed")
-            
-            if author_count == 0 or flight_count == 0:
-                raise Exception("No dimension records loaded")
-            
-            # Load facts
-            fact_count, fact_success = dw.load_fact_reviews(data_dict['review_fact'], batch_id)
-            if not fact_success or fact_count == 0:
-                raise Exception("Fact loading failed")
-            
-            # Mark complete
-            dw.complete_etl_batch(batch_id, 'Completed', fact_count)
-            logging.info(f"Successfully loaded {fact_count} fact records")
-            return True
+        if run is not None and run.batch_id is not None:
+            batch_id = run.batch_id
+            if not dw.resume_etl_batch(batch_id):
+                return False
+            logging.info(f"Resuming ETL batch with ID: {batch_id}")
+        else:
+            batch_id = dw.start_etl_batch(source_system)
+            if batch_id is None:
+                logging.error("Failed to start ETL batch")
+                return False
+            logging.info(f"Started ETL batch with ID: {batch_id}")
+            if run is not None:
+                run.batch_id = batch_id
+
+        fact_count = 0
+        for stage_name, load in load_stages:
+            if run is not None and run.completed(stage_name):
+                logging.info(f"Skipping {stage_name}, committed in an earlier attempt")
+                fact_count = run.result(stage_name)
+                continue
+            if run is not None:
+                run.start(stage_name)
+            with dw.transaction():
+                fact_count = load(dw, batch_id, metrics)
+            if run is not None:
+                run.complete(stage_name, result=fact_count)
+
+        # Mark complete
+        dw.complete_etl_batch(batch_id, 'Completed', fact_count)
+        logging.info(f"Successfully loaded {fact_count} fact records")
+
+        if key_snapshot:
+            dw.dimension_cache.save_snapshot(key_snapshot)
+        return True
 
     except Exception as e:
         logging.error(f"Error during DW loading: {e}")
+        if run is not None and stage_name is not None:
+            run.fail(stage_name, e)
         try:
-            if 'batch_id' in locals():
+            if batch_id is not None:
                 dw.complete_etl_batch(batch_id, 'Failed', 0)
         except Exception as inner_e:
             logging.error(f"Error marking batch as failed: {inner_e}")
         return False
     finally:
+        if batch_id is not None:
+            metrics.write_to_dw(dw, batch_id)
         dw.close()
 
-def main():
+def load_to_dw(data_dict: Dict[str, pd.DataFrame], server: str, database: str,
+               key_snapshot: Optional[str] = None, metrics: Optional[PipelineMetrics] = None,
+               partitions: int = 1, partition_by: str = 'hash', sentiment: bool = True,
+               aggregates: bool = True, run: Optional[RunManifest] = None,
+               source_system: str = 'WebScraper') -> bool:
+    """Load data into DW with transaction support.
+
+    With ``partitions`` > 1 the facts are staged concurrently over pooled
+    connections and merged in the load's transaction. With ``sentiment``
+    the reviews are then scored into fact.ReviewSentiment, and with
+    ``aggregates`` the batch is added to the agg summary tables.
+    Dimensions and facts load in one transaction, or with ``run`` in one
+    checkpointed transaction each, so a resume only redoes the facts.
+    """
+    def load_dimensions(dw: DWConnection, batch_id: int, metrics: PipelineMetrics) -> int:
+        if data_dict['author_dim'].empty or data_dict['flight_dim'].empty:
+            raise Exception("No dimension records to load")
+
+        dimensions = [
+            ('Author', 'author_dim', 'AuthorName'),
+            ('FlightDetails', 'flight_dim', ['SeatType', 'Route', 'TypeOfTraveller'])
+        ]
+        for table_name, key, key_columns in dimensions:
+            with metrics.stage(f'load_{key}', f'dim.{table_name}', 'Incremental') as record:
+                inserted, updated, success = dw.load_dimension(table_name, data_dict[key], key_columns)
+                if not success:
+                    raise Exception("Dimension loading failed")
+                record['rows_inserted'], record['rows_updated'] = inserted, updated
+        with metrics.stage('load_route_dim', 'dim.Route', 'Incremental') as record:
+            inserted, success = dw.load_route_dimensions(data_dict['route_dim'])
+            if not success:
+                raise Exception("Route dimension loading failed")
+            record['rows_inserted'] = inserted
+        return 0
+
+    def load_facts(dw: DWConnection, batch_id: int, metrics: PipelineMetrics) -> int:
+        with metrics.stage('load_review_fact', 'fact.Reviews', 'Insert') as record:
+            fact_count, fact_success = dw.load_fact_reviews(
+                data_dict['review_fact'], batch_id, partitions=partitions, partition_by=partition_by,
+                source_system=source_system
+            )
+            if not fact_success:
+                raise Exception("Fact loading failed")
+            record['rows_inserted'] = fact_count
+        if fact_count == 0:
+            logging.info("No new reviews were loaded")
+        if sentiment:
+            enrich_loaded_reviews(dw, metrics)
+        if aggregates:
+            refresh_summary_tables(dw, batch_id, metrics)
+        return fact_count
+
+    if run is not None:
+        load_stages = [('load_dimensions', load_dimensions), ('load_facts', load_facts)]
+    else:
+        def load_batch(dw: DWConnection, batch_id: int, metrics: PipelineMetrics) -> int:
+            load_dimensions(dw, batch_id, metrics)
+            return load_facts(dw, batch_id, metrics)
+        load_stages = [('load', load_batch)]
+
+    return run_dw_load(load_stages, server, database, key_snapshot, metrics, run, source_system)
+
+def stream_to_dw(cleaned_chunks: Iterable[pd.DataFrame], server: str, database: str,
+                 key_snapshot: Optional[str] = None, metrics: Optional[PipelineMetrics] = None,
+                 sentiment: bool = True, aggregates: bool = True) -> bool:
+    """Load a stream of cleaned chunks into DW as one batch, committing chunk by chunk.
+
+    With ``sentiment`` the new reviews are scored and with ``aggregates``
+    the summary tables refreshed once the last chunk is in.
+    """
+    def load_batch(dw: DWConnection, batch_id: int, metrics: PipelineMetrics) -> int:
+        # Extract, clean and load interleave chunk by chunk, so they are timed as one stage
+        with metrics.stage('stream', 'fact.Reviews', 'Insert') as record:
+            fact_count, success = load_chunks(dw, batch_id, cleaned_chunks)
+            if not success:
+                raise Exception("Streaming load failed")
+            record['rows_inserted'] = fact_count
+        if fact_count == 0:
+            logging.info("No new reviews were loaded")
+        if sentiment:
+            enrich_loaded_reviews(dw, metrics)
+        if aggregates:
+            refresh_summary_tables(dw, batch_id, metrics)
+        return fact_count
+
+    return run_dw_load([('stream', load_batch)], server, database, key_snapshot, metrics)
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Airline reviews ETL pipeline")
+    parser.add_argument('--replay', action='store_true',
+                        help="Read pages from the local page cache instead of the website")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Do not keep raw pages in the local page cache")
+    parser.add_argument('--intermediate-format', choices=['parquet', 'csv'], default='parquet',
+                        help="Format of the saved intermediate artifacts")
+    parser.add_argument('--from-artifacts', nargs='?', const='latest', metavar='RUN_DATE',
+                        help="Load saved artifacts (latest run by default) instead of scraping")
+    parser.add_argument('--manifest', metavar='PATH',
+                        help="Scrape and load every airline listed in a JSON job manifest")
+    parser.add_argument('--stream', action='store_true',
+                        help="Run extract, clean and load as bounded-size chunks instead of whole frames")
+    parser.add_argument('--chunk-size', type=int, default=500,
+                        help="Reviews per chunk in --stream mode")
+    parser.add_argument('--backend', choices=sorted(DW_BACKENDS), default='mssql',
+                        help="Warehouse engine; sqlite and duckdb create the schema from Scripts/ locally")
+    parser.add_argument('--database', metavar='NAME_OR_PATH',
+                        help="SQL Server database, or the sqlite/duckdb file (default: <database>.<backend>)")
+    parser.add_argument('--odbc-driver', default='SQL Server',
+                        help="ODBC driver for SQL Server; DW_USERNAME/DW_PASSWORD switch to SQL authentication")
+    parser.add_argument('--load-partitions', type=int, default=1, metavar='N',
+                        help="Stage facts in N partitions over N pooled connections before one merge")
+    parser.add_argument('--partition-by', choices=['hash', 'date'], default='hash',
+                        help="How --load-partitions splits the facts")
+    parser.add_argument('--resume', nargs='?', const='latest', metavar='BATCH_ID',
+                        help="Resume the latest failed run (or the run of BATCH_ID), skipping its completed stages; "
+                             "with --manifest, each airline's latest failed run")
+    parser.add_argument('--no-sentiment', action='store_true',
+                        help="Skip scoring the loaded reviews into fact.ReviewSentiment")
+    parser.add_argument('--no-aggregates', action='store_true',
+                        help="Skip adding the batch to the agg summary tables")
+    parser.add_argument('--migrate', nargs='?', type=int, const=0, default=None, metavar='VERSION',
+                        help="Apply pending warehouse schema migrations (up to VERSION), then exit")
+    parser.add_argument('--backfill-review-hashes', action='store_true',
+                        help="Compute ReviewHash for facts loaded before it existed, then exit")
+    parser.add_argument('--profile', action='store_true',
+                        help="Run each stage under cProfile and save the stats with the metrics report")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Record each stage's peak Python memory with tracemalloc")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
     # Configuration
     SERVER = 'localhost'
     DATABASE = 'BritishAirwaysDW'
     PAGES_TO_SCRAPE = 7
     REVIEWS_PER_PAGE = 100
+    MAX_WORKERS = 4
+    REQUESTS_PER_SECOND = 1.0
+    INCREMENTAL = True
+    CACHE_DIR = 'cache/pages'
+    CACHE_TTL_DAYS = 30
+
+    if args.backend == 'mssql':
+        DATABASE = args.database or DATABASE
+        configure_backend(
+            'mssql', driver=args.odbc_driver,
+            username=os.environ.get('DW_USERNAME'), password=os.environ.get('DW_PASSWORD')
+        )
+    else:
+        DATABASE = args.database or f'{DATABASE}.{args.backend}'
+        configure_backend(args.backend)
+    DIMENSION_KEY_SNAPSHOT = snapshot_path(args.backend, SERVER, DATABASE)
+
+    if args.migrate is not None:
+        dw = DWConnection(SERVER, DATABASE)
+        if dw.connect():
+            try:
+                dw.migrate_schema(args.migrate or None)
+            finally:
+                dw.close()
+        return
+
+    if args.backfill_review_hashes:
+        dw = DWConnection(SERVER, DATABASE)
+        if dw.connect():
+            try:
+                dw.backfill_review_hashes()
+            finally:
+                dw.close()
+        return
+
+    metrics = PipelineMetrics(profile=args.profile, trace_memory=args.trace_memory)
+
+    if args.replay or not args.no_cache:
+        page_cache = PageCache(CACHE_DIR, ttl_days=CACHE_TTL_DAYS)
+        page_cache.evict()
+        configure_cache(page_cache, replay=args.replay)
+
+    if args.manifest:
+        manifest = load_manifest(args.manifest)
+        # The command line's cache options override the manifest's
+        manifest['replay'] = args.replay or manifest['replay']
+        if args.no_cache and not manifest['replay']:
+            manifest['cache_dir'] = None
+        elif not manifest['cache_dir']:
+            manifest['cache_dir'] = CACHE_DIR
+        if args.backend == 'mssql':
+            manifest_database = args.database or manifest['database']
+        else:
+            manifest_database = args.database or f"{manifest['database']}.{args.backend}"
+
+        def load_airline(slug: str, dw_data: Dict[str, pd.DataFrame], run: Optional[RunManifest] = None) -> bool:
+            # Each airline is its own checkpointed run and ETL batch with its own metrics
+            airline_metrics = PipelineMetrics(profile=args.profile, trace_memory=args.trace_memory)
+            if run is None:
+                run = RunManifest.create(RUNS_DIR, backend=args.backend, database=manifest_database, airline=slug)
+                # Checkpointed so --resume can load the airline again without scraping it
+                run.complete('prepare', artifact=dw_data)
+            success = load_to_dw(
+                dw_data, manifest['server'], manifest_database,
+                snapshot_path(args.backend, manifest['server'], manifest_database), airline_metrics,
+                args.load_partitions, args.partition_by, sentiment=not args.no_sentiment,
+                aggregates=not args.no_aggregates, run=run, source_system=f'WebScraper:{slug}'[:50]
+            )
+            airline_metrics.write_json(
+                os.path.join(airline_metrics.report_dir, f'run_{airline_metrics.run_id}_{slug}.json')
+            )
+            if success:
+                run.finish('Completed')
+            else:
+                logging.error(f"Loading {slug} failed; rerun with --manifest {args.manifest} "
+                              f"--resume {run.batch_id or ''} to continue from the failed stage")
+            return success
+
+        if args.resume:
+            # Resumes each airline's unfinished run from its checkpointed frames. The
+            # airline's watermark stays put; its next run skips these reviews as already loaded
+            batch_id = None if args.resume == 'latest' else int(args.resume)
+            results = {}
+            for airline in manifest['airlines']:
+                slug = airline['slug']
+                run = RunManifest.find(
+                    RUNS_DIR, batch_id, backend=args.backend, database=manifest_database, airline=slug
+                )
+                if run is None:
+                    continue
+                if not run.completed('prepare'):
+                    logging.warning(f"Run {run.run_id} of {slug} has no checkpointed frames to resume from")
+                    continue
+                logging.info(f"Resuming run {run.run_id} of {slug} (batch {run.batch_id})")
+                results[slug] = load_airline(slug, run.result('prepare'), run)
+            if not results:
+                logging.error(f"No unfinished run to resume ({args.resume}) on {manifest_database}")
+                return
+        else:
+            results = run_manifest(manifest, load_airline)
+        failed = [slug for slug, success in results.items() if not success]
+        if failed:
+            logging.error(f"ETL process failed for: {', '.join(failed)}")
+        else:
+            logging.info("ETL process completed successfully for all airlines")
+        return
+
+    if args.from_artifacts:
+        logging.info("Loading saved intermediate artifacts")
+        run_date = None if args.from_artifacts == 'latest' else args.from_artifacts
+        with metrics.stage('read_artifacts') as record:
+            dw_data = read_intermediate_data('output', run_date, args.intermediate_format)
+            record['rows'] = len(dw_data['review_fact'])
+        success = load_to_dw(
+            dw_data, SERVER, DATABASE, DIMENSION_KEY_SNAPSHOT, metrics, args.load_partitions, args.partition_by,
+            sentiment=not args.no_sentiment, aggregates=not args.no_aggregates
+        )
+        metrics.write_json()
+        if success:
+            logging.info("ETL process completed successfully")
+        else:
+            logging.error("ETL process failed")
+        return
 
     # Step 1: Scrape reviews
-    logging.info("Starting review scraping process")
-    raw_reviews = scrape_reviews(PAGES_TO_SCRAPE, REVIEWS_PER_PAGE)
+    # Replays re-process the cached pages in full rather than only new reviews
+    watermark = load_watermark(SERVER, DATABASE) if INCREMENTAL and not args.replay else None
+    if watermark is not None and watermark.review_date is not None:
+        logging.info(f"Starting incremental review scraping from watermark {watermark.review_date}")
+    else:
+        logging.info("Starting review scraping process")
+
+    if args.stream and not args.resume:
+        # The scrape filters on ``watermark``; advance a copy while chunks flow through
+        next_watermark = None
+        if watermark is not None:
+            next_watermark = Watermark(watermark.review_date, watermark.identities)
+        failed_pages = []
+        pages = stream_reviews(
+            PAGES_TO_SCRAPE, REVIEWS_PER_PAGE, MAX_WORKERS, REQUESTS_PER_SECOND, watermark, failed_pages=failed_pages
+        )
+        cleaned_chunks = iter_clean_chunks(
+            iter_review_chunks(pages, args.chunk_size),
+            (lambda raw: next_watermark.advance(raw.to_dict('records'))) if next_watermark else None
+        )
+        success = stream_to_dw(
+            cleaned_chunks, SERVER, DATABASE, DIMENSION_KEY_SNAPSHOT, metrics,
+            sentiment=not args.no_sentiment, aggregates=not args.no_aggregates
+        )
+        metrics.write_json()
+        if success:
+            if next_watermark is not None:
+                save_watermark(watermark, next_watermark, failed_pages)
+            logging.info("ETL process completed successfully")
+        else:
+            logging.error("ETL process failed")
+        return
+
+    # Every stage is checkpointed so a failed run can be resumed with --resume
+    if args.resume:
+        batch_id = None if args.resume == 'latest' else int(args.resume)
+        run = RunManifest.find(RUNS_DIR, batch_id, backend=args.backend, database=DATABASE)
+        if run is None:
+            logging.error(f"No unfinished run to resume ({args.resume}) on {DATABASE}")
+            return
+        logging.info(f"Resuming run {run.run_id} (batch {run.batch_id})")
+    else:
+        run = RunManifest.create(RUNS_DIR, backend=args.backend, database=DATABASE)
+
+    def extract() -> pd.DataFrame:
+        with metrics.stage('extract') as record:
+            raw_reviews = scrape_reviews(PAGES_TO_SCRAPE, REVIEWS_PER_PAGE, MAX_WORKERS, REQUESTS_PER_SECOND, watermark)
+            record['rows'] = len(raw_reviews)
+        return raw_reviews
+
+    raw_reviews = run.run_stage('extract', extract)
+    failed_pages = raw_reviews.attrs.get('failed_pages', [])
     
     if raw_reviews.empty:
-        logging.error("No reviews were scraped. Exiting.")
+        if failed_pages:
+            logging.error(f"No reviews were scraped; pages {failed_pages} could not be fetched. Exiting.")
+        elif watermark is not None and watermark.review_date is not None:
+            logging.info("No new reviews since the last run. Exiting.")
+        else:
+            logging.error("No reviews were scraped. Exiting.")
+        run.finish('Completed')
         return
 
+    # Raw records (uncleaned titles and dates) advance the watermark after the load
+    scraped_records = raw_reviews.to_dict('records')
+
     # Step 2: Clean and process data
     logging.info("Cleaning and processing scraped data")
-    cleaned_data = clean_review_data(raw_reviews)
-    dw_data = prepare_dw_load_data(cleaned_data)
-    
-    # Save intermediate files
-    save_intermediate_data(dw_data)
+    def clean() -> pd.DataFrame:
+        with metrics.stage('clean') as record:
+            cleaned_data = clean_review_data(raw_reviews)
+            record['rows'] = len(cleaned_data)
+        return cleaned_data
+
+    def prepare() -> Dict[str, pd.DataFrame]:
+        with metrics.stage('prepare') as record:
+            dw_data = prepare_dw_load_data(cleaned_data)
+            record['rows'] = len(dw_data['review_fact'])
+        
+        # Save intermediate files
+        with metrics.stage('save_intermediate') as record:
+            save_intermediate_data(dw_data, 'output', args.intermediate_format)
+            record['rows'] = sum(len(df) for df in dw_data.values())
+        return dw_data
+
+    cleaned_data = run.run_stage('clean', clean)
+    dw_data = run.run_stage('prepare', prepare)
+    del cleaned_data
     
     # Step 3: Load to data warehouse
     logging.info("Loading data into data warehouse")
-    success = load_to_dw(dw_data, SERVER, DATABASE)
+    success = load_to_dw(
+        dw_data, SERVER, DATABASE, DIMENSION_KEY_SNAPSHOT, metrics, args.load_partitions, args.partition_by,
+        sentiment=not args.no_sentiment, aggregates=not args.no_aggregates, run=run
+    )
+    metrics.write_json()
     
     if success:
+        if watermark is not None:
+            next_watermark = Watermark(watermark.review_date, watermark.identities)
+            next_watermark.advance(scraped_records)
+            save_watermark(watermark, next_watermark, failed_pages)
+        run.finish('Completed')
         logging.info("ETL process completed successfully")
     else:
-        logging.error("ETL process failed")
+        logging.error(f"ETL process failed; rerun with --resume {run.batch_id or ''} to continue from the failed stage")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file